@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Cache contention benchmark
+Compares a single-lock cache (shards=1) with the striped cache under a
+read-heavy multi-threaded workload, and checks that no operation fails
+
+Usage:
+    python benchmarks/cache_contention.py --threads 1 2 4 8 16 --shards 1 16
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.cache import SimpleCache
+from fake_client import make_synthetic_response
+from src.utils import parse_serp_news
+
+def run(cache: SimpleCache, threads: int, ops: int, keys: int, read_ratio: float, value) -> float:
+    """
+    Hammer a cache from several threads.
+
+    Returns:
+        Operations per second across all threads
+    """
+    for i in range(keys):
+        cache.set(f"key-{i}", value)
+
+    errors = []
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        barrier.wait()
+        try:
+            for _ in range(ops):
+                key = f"key-{rng.randrange(keys)}"
+                if rng.random() < read_ratio:
+                    cache.get(key)
+                else:
+                    cache.set(key, value)
+        except Exception as e:  # Any failure means the cache is not thread-safe
+            errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        raise RuntimeError(f"{len(errors)} cache operations failed, first: {errors[0]!r}")
+    return threads * ops / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="SimpleCache lock contention benchmark")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Thread counts to test")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 16], help="Shard counts to compare")
+    parser.add_argument("--ops", type=int, default=20000, help="Operations per thread (default: 20000)")
+    parser.add_argument("--keys", type=int, default=1000, help="Distinct keys (default: 1000)")
+    parser.add_argument("--read-ratio", type=float, default=0.95, help="Fraction of reads (default: 0.95)")
+    parser.add_argument("--compress-threshold", type=int, default=None,
+                        help="Enable compressed entries above this size (default: off)")
+    args = parser.parse_args()
+
+    logging.getLogger("GoogleNewsScraper").setLevel(logging.WARNING)
+    value = parse_serp_news(make_synthetic_response("contention", 20))
+
+    print(f"{'Threads':>8}" + "".join(f"{f'shards={n} ops/s':>20}" for n in args.shards))
+    for threads in args.threads:
+        row = []
+        for shards in args.shards:
+            cache = SimpleCache(default_ttl=300, compress_threshold=args.compress_threshold, shards=shards)
+            row.append(run(cache, threads, args.ops, args.keys, args.read_ratio, value))
+        print(f"{threads:>8}" + "".join(f"{ops:>20,.0f}" for ops in row))
+
+if __name__ == "__main__":
+    main()
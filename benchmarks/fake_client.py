@@ -0,0 +1,151 @@
+"""
+Fake Thordata client for offline benchmarks
+Replays recorded or synthetic SERP responses with configurable latency and errors
+"""
+import os
+import json
+import glob
+import random
+import threading
+import time
+import base64
+from typing import Dict, List, Optional
+
+# 1x1 PNG, repeated so synthetic thumbnails have a realistic size (~2 KB)
+_PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+class FakeAPIError(Exception):
+    """Error raised by the fake client to simulate API failures"""
+
+class LatencyModel:
+    """
+    Latency distribution for simulated API calls
+    """
+
+    def __init__(self, kind: str = "lognormal", median: float = 0.0, sigma: float = 0.5, seed: Optional[int] = None):
+        """
+        Initialize latency model.
+
+        Args:
+            kind: "fixed", "uniform" (0..2*median) or "lognormal"
+            median: Median latency in seconds (0 disables sleeping)
+            sigma: Shape parameter for the lognormal distribution
+            seed: Random seed for reproducible runs
+        """
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unsupported latency distribution: {kind}")
+        self.kind = kind
+        self.median = median
+        self.sigma = sigma
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """Draw a latency in seconds"""
+        if self.median <= 0:
+            return 0.0
+        with self._lock:
+            if self.kind == "fixed":
+                return self.median
+            if self.kind == "uniform":
+                return self._random.uniform(0, 2 * self.median)
+            return self._random.lognormvariate(0, self.sigma) * self.median
+
+def make_synthetic_response(query: str, num: int, thumbnail_size: int = 2048) -> Dict:
+    """
+    Build a SERP-like response with ``num`` news results.
+
+    Args:
+        query: Search query (used in titles and links)
+        num: Number of news results
+        thumbnail_size: Approximate size of each inline thumbnail in bytes
+
+    Returns:
+        Response dictionary with a ``news_results`` list
+    """
+    slug = "-".join(query.lower().split()) or "query"
+    results = []
+    for i in range(num):
+        # Vary the payload per article so thumbnails are not all identical
+        image = _PNG_BYTES + bytes(f"{slug}-{i}", "utf-8") * max(1, thumbnail_size // (len(slug) + 8))
+        results.append({
+            "title": f"{query.title()} update #{i}: analysts weigh in on latest developments",
+            "source": f"Source {i % 17}",
+            "date": f"{i % 24 + 1} hours ago",
+            "snippet": f"Coverage of {query} from multiple outlets, item {i}. " * 3,
+            "link": f"https://news.example.com/{slug}/{i}",
+            "thumbnail": "data:image/png;base64," + base64.b64encode(image).decode("ascii")
+        })
+    return {"search_metadata": {"status": "Success"}, "news_results": results}
+
+def load_recorded_responses(path: str) -> List[Dict]:
+    """
+    Load recorded raw SERP responses.
+
+    Args:
+        path: A JSON file (single response or list of responses) or a directory of JSON files
+
+    Returns:
+        List of response dictionaries
+    """
+    files = sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+    responses = []
+    for filepath in files:
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Record/replay files wrap the raw response in a "response" key
+        if isinstance(data, dict) and "response" in data:
+            data = data["response"]
+        responses.extend(data if isinstance(data, list) else [data])
+    return responses
+
+class FakeThordataClient:
+    """
+    Drop-in replacement for ThordataClient.serp_search_advanced
+    """
+
+    def __init__(
+        self,
+        responses: Optional[List[Dict]] = None,
+        latency: Optional[LatencyModel] = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize fake client.
+
+        Args:
+            responses: Recorded responses to replay round-robin (default: synthetic)
+            latency: Latency model (default: no latency)
+            error_rate: Probability that a call raises FakeAPIError
+            seed: Random seed for error injection
+        """
+        self.responses = responses or []
+        self.latency = latency or LatencyModel(median=0.0)
+        self.error_rate = error_rate
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def serp_search_advanced(self, req) -> Dict:
+        """Simulate a SERP call for a SerpRequest-like object"""
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+            fail = self._random.random() < self.error_rate
+
+        delay = self.latency.sample()
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise FakeAPIError("Simulated API failure")
+
+        if self.responses:
+            return self.responses[index % len(self.responses)]
+        return make_synthetic_response(getattr(req, "query", "news"), getattr(req, "num", None) or 20)
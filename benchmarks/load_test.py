@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Offline load test against recorded SERP responses
+Drives the full stack (retry, cache, parse, thumbnails, export) with a ReplayClient
+
+Usage:
+    # 1. Record some real responses once
+    python main.py "Bitcoin" --record recordings/
+    python main.py "Tesla" --record recordings/
+
+    # 2. Replay thousands of concurrent searches offline
+    python benchmarks/load_test.py recordings/ --requests 5000 --concurrency 64
+"""
+import os
+import sys
+import json
+import time
+import math
+import logging
+import argparse
+import tempfile
+import threading
+from contextlib import redirect_stdout, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.scraper import GoogleNewsScraper
+from src.replay import ReplayClient
+from src.utils import save_to_json
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+def percentile(samples, q):
+    """Nearest-rank percentile"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test with recorded SERP responses")
+    parser.add_argument("recordings", help="Directory written by --record")
+    parser.add_argument("--requests", type=int, default=1000, help="Total searches (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent threads (default: 32)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for recorded latencies (default: 1.0)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the response cache")
+    parser.add_argument("--export", action="store_true", help="Write each result set to JSON as well")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+
+    client = ReplayClient(args.recordings, latency_scale=args.latency_scale, seed=42)
+    scraper = GoogleNewsScraper(client=client)
+    requests = [record["request"] for record in client.recordings.values()]
+    export_dir = tempfile.mkdtemp(prefix="gnews_load_") if args.export else None
+
+    samples = []
+    failures = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal failures
+        req = requests[i % len(requests)]
+        start = time.perf_counter()
+        results = scraper.search(
+            query=req["query"],
+            num=req["num"] or 20,
+            country=req["country"] or "us",
+            language=req["language"],
+            device=req["device"],
+            no_cache=args.no_cache
+        )
+        if export_dir and results:
+            save_to_json(results, os.path.join(export_dir, f"load_{i}.json"))
+        with lock:
+            samples.append(time.perf_counter() - start)
+            if not results:
+                failures += 1
+
+    print(f"[LOAD] {args.requests} searches, concurrency {args.concurrency}, "
+          f"{len(requests)} recorded requests, latency x{args.latency_scale}")
+    # Exporters print one line per file; silence them for the whole run
+    quiet = redirect_stdout(open(os.devnull, "w")) if export_dir else nullcontext()
+    start = time.perf_counter()
+    with quiet, ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "elapsed_s": elapsed,
+        "ops_per_sec": args.requests / elapsed,
+        "empty_or_failed": failures,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000
+    }
+    for key, value in result.items():
+        print(f"  {key:<18}{value:.3f}" if isinstance(value, float) else f"  {key:<18}{value}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"[SAVED] Results written to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for Google News Scraper
+Runs against a fake ThordataClient, so no token or network access is needed
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --tolerance 0.2
+"""
+import io
+import os
+import sys
+import json
+import time
+import math
+import logging
+import argparse
+import platform
+import tempfile
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.scraper import GoogleNewsScraper
+from src.ai_news import AINewsBriefing
+from src.cache import clear_cache
+from src.budget import CreditLedger
+from src.negative_cache import NegativeCache
+from src.utils import parse_serp_news, save_to_json, save_to_csv
+from fake_client import FakeThordataClient, LatencyModel, make_synthetic_response, load_recorded_responses
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    """Summarize latencies in milliseconds"""
+    return {
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "mean_ms": (sum(samples) / len(samples) * 1000) if samples else 0.0
+    }
+
+@contextmanager
+def temporary_workdir():
+    """Run export benchmarks in a scratch directory (writers use ./output)"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+def make_scraper(args, latency_median: float = None) -> GoogleNewsScraper:
+    """
+    Build a scraper backed by a fake client.
+
+    Each benchmark gets its own negative cache and ledger, so injected
+    failures do not leak into the process-wide ones or later benchmarks.
+    """
+    responses = load_recorded_responses(args.responses) if args.responses else None
+    latency = LatencyModel(
+        kind=args.latency_dist,
+        median=args.latency_median if latency_median is None else latency_median,
+        seed=args.seed
+    )
+    client = FakeThordataClient(responses=responses, latency=latency, error_rate=args.error_rate, seed=args.seed)
+    return GoogleNewsScraper(client=client, negative_cache=NegativeCache(), ledger=CreditLedger("bench"))
+
+def bench_search_throughput(args) -> Dict:
+    """
+    Concurrent uncached searches through the full search pipeline.
+
+    With ``--error-rate``, failed calls go through the scraper's real retry
+    backoff (1s, 2s, 4s), so throughput and latencies include those sleeps;
+    billed retries and searches that failed after all attempts are reported
+    separately to tell them apart from pipeline cost.
+    """
+    scraper = make_scraper(args)
+    samples = []
+    failed = []
+
+    def one(i):
+        start = time.perf_counter()
+        results = scraper.search(f"benchmark query {i}", num=args.num, no_cache=True)
+        samples.append(time.perf_counter() - start)
+        if results.metadata["source"] == "error":
+            failed.append(i)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(one, range(args.iterations)))
+    elapsed = time.perf_counter() - start
+    return dict(
+        ops_per_sec=args.iterations / elapsed,
+        api_errors=scraper.client.errors,
+        retries=scraper.ledger.summary()["retries"],
+        failed_searches=len(failed),
+        **latency_stats(samples)
+    )
+
+def bench_cache_miss(args) -> Dict:
+    """Cost of a cache miss (lookup + fetch + parse + store) with zero network latency"""
+    scraper = make_scraper(args, latency_median=0.0)
+    clear_cache()
+    samples = []
+    for i in range(args.iterations):
+        start = time.perf_counter()
+        scraper.search(f"miss query {i}", num=args.num)
+        samples.append(time.perf_counter() - start)
+    return dict(ops_per_sec=len(samples) / sum(samples), **latency_stats(samples))
+
+def bench_cache_hit(args) -> Dict:
+    """Cost of serving a cached search"""
+    scraper = make_scraper(args, latency_median=0.0)
+    clear_cache()
+    scraper.search("hit query", num=args.num)
+    samples = []
+    for _ in range(args.iterations * 10):
+        start = time.perf_counter()
+        scraper.search("hit query", num=args.num)
+        samples.append(time.perf_counter() - start)
+    return dict(ops_per_sec=len(samples) / sum(samples), **latency_stats(samples))
+
+def bench_parse(args) -> Dict:
+    """parse_serp_news throughput"""
+    response = make_synthetic_response("parse benchmark", args.num)
+    rounds = args.iterations * 10
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parse_serp_news(response)
+    elapsed = time.perf_counter() - start
+    return {"items_per_sec": rounds * args.num / elapsed}
+
+def _bench_writer(args, writer: Callable) -> Dict:
+    """Time an export writer on parsed synthetic items"""
+    items = parse_serp_news(make_synthetic_response("export benchmark", args.num * 10))
+    rounds = max(1, args.iterations // 5)
+    with temporary_workdir(), redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i in range(rounds):
+            filepath = writer(items, f"bench_{i}")
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(filepath)
+    return {"items_per_sec": rounds * len(items) / elapsed, "file_bytes": size}
+
+def bench_export_json(args) -> Dict:
+    """save_to_json throughput"""
+    return _bench_writer(args, lambda items, name: save_to_json(items, f"{name}.json"))
+
+def bench_export_csv(args) -> Dict:
+    """save_to_csv throughput"""
+    return _bench_writer(args, lambda items, name: save_to_csv(items, f"{name}.csv"))
+
+def bench_ai_briefing(args) -> Dict:
+    """AINewsBriefing.get_latest_ai_news end to end"""
+    briefing = AINewsBriefing(scraper=make_scraper(args), request_delay=0)
+    samples = []
+    for _ in range(max(1, args.iterations // 20)):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):  # Silence progress output
+            briefing.get_latest_ai_news(num=args.num, no_cache=True)
+        samples.append(time.perf_counter() - start)
+    return dict(ops_per_sec=len(samples) / sum(samples), **latency_stats(samples))
+
+# name -> (function, primary metric, higher is better)
+BENCHMARKS = {
+    "search_throughput": (bench_search_throughput, "ops_per_sec", True),
+    "cache_miss": (bench_cache_miss, "p50_ms", False),
+    "cache_hit": (bench_cache_hit, "p50_ms", False),
+    "parse": (bench_parse, "items_per_sec", True),
+    "export_json": (bench_export_json, "items_per_sec", True),
+    "export_csv": (bench_export_csv, "items_per_sec", True),
+    "ai_briefing": (bench_ai_briefing, "p50_ms", False),
+}
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare primary metrics against a baseline.
+
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        metric, higher_is_better = result["primary"], result["higher_is_better"]
+        current, previous = result["metrics"][metric], base["metrics"].get(metric)
+        if not previous:
+            continue
+        change = (current - previous) / previous
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        status = "REGRESSION" if regressed else "ok"
+        print(f"  {name:<20}{metric:<15}{previous:>12.3f} -> {current:>12.3f} ({change:+.1%}) {status}")
+        if regressed:
+            regressions.append(f"{name}.{metric} changed {change:+.1%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks with a fake ThordataClient")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--iterations", type=int, default=200, help="Base iteration count (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads for throughput benchmarks (default: 8)")
+    parser.add_argument("--num", type=int, default=20, help="Results per search (default: 20)")
+    parser.add_argument("--latency-median", type=float, default=0.05, help="Median fake API latency in seconds (default: 0.05)")
+    parser.add_argument("--latency-dist", default="lognormal", choices=["fixed", "uniform", "lognormal"],
+                        help="Fake API latency distribution (default: lognormal)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of fake API calls that fail (default: 0); failures are retried with the real "
+                             "backoff, so search_throughput latencies include it (see its retries/failed_searches)")
+    parser.add_argument("--responses", type=str, default=None, help="Recorded response file or directory to replay")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this path")
+    parser.add_argument("--baseline", type=str, default=None, help="Compare against a previous results file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default: 0.2)")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args)
+        },
+        "results": {}
+    }
+
+    for name in args.only or list(BENCHMARKS):
+        func, primary, higher_is_better = BENCHMARKS[name]
+        metrics = func(args)
+        results["results"][name] = {"primary": primary, "higher_is_better": higher_is_better, "metrics": metrics}
+        summary = ", ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in metrics.items())
+        print(f"[BENCH] {name}: {summary}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[SAVED] Results written to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n[COMPARE] Against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"[FAIL] {len(regressions)} regression(s): {'; '.join(regressions)}")
+            sys.exit(1)
+        print("[PASS] No regressions")
+
+if __name__ == "__main__":
+    main()
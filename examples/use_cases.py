@@ -68,11 +68,14 @@ def example_3_market_intelligence():
     countries = ["us", "uk", "jp", "cn"]
     topic = "tech industry"
     
+    # All countries are searched concurrently and merged on canonical link
+    results = scraper.search_matrix([topic], countries, num=15)
+    save_to_json(results, "market_intelligence.json")
+    
     for country in countries:
-        results = scraper.search(topic, num=15, country=country)
-        filename = f"market_intelligence_{country}.json"
-        save_to_json(results, filename)
-        print(f"{country.upper()}: {len(results)} articles saved to {filename}")
+        count = sum(1 for item in results if any(o["country"] == country for o in item["found_by"]))
+        print(f"{country.upper()}: {count} articles")
+    print(f"{len(results)} unique articles saved to market_intelligence.json")
 
 def example_4_competitive_intelligence():
     """
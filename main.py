@@ -2,14 +2,193 @@
 Google News Scraper - Main Entry Point
 Command-line tool for scraping Google News via SERP API
 """
+import os
+import sys
+import time
 import argparse
+import cProfile
 from dotenv import load_dotenv
 from src.scraper import GoogleNewsScraper
-from src.ai_news import AINewsBriefing
-from src.utils import save_to_csv, save_to_json
+from src.ai_news import AINewsBriefing, AI_KEYWORDS
+from src.planner import KeywordPlanner
+from src.utils import save_to_csv, save_to_json, load_query_specs
+from src.compression import output_path
+from src.pipeline import Pipeline, JsonlSink, CsvSink, QueryFileSink
+from src.rate_limit import RateLimiter
+from src.cache import load_cache_snapshot, save_cache_snapshot, get_cache_entries
+from src.crawler import ShardedCrawler
+from src.jobs import BatchJob
+from src.server import run_server
+from src.metrics import save_metrics
+from src.hooks import hooks, StageProfiler
+from src.budget import CreditLedger, credits
+from src.archive import ArticleArchive
+from src.search_index import LocalIndex
+from src.snapshots import SnapshotStore
+from src.config import INDEX_CONFIG, ARCHIVE_CONFIG, CACHE_CONFIG, CONCURRENCY_CONFIG
 
 load_dotenv()
 
+def split_list(value):
+    """Split a comma-separated CLI value into a list"""
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+def build_scraper(args, ledger=None, archive=None, index=None) -> GoogleNewsScraper:
+    """Create a scraper configured from command-line arguments"""
+    return GoogleNewsScraper(
+        thumbnails=args.thumbnails,
+        record_dir=args.record,
+        replay_dir=args.replay,
+        replay_latency_scale=args.replay_latency_scale,
+        replay_strict=not args.replay_fallback,
+        ledger=ledger,
+        archive=archive,
+        index=index
+    )
+
+def run_crawl(args):
+    """Run a multi-process crawl over a query file"""
+    specs = load_query_specs(args.crawl)
+    print(f"\n{'='*60}")
+    print(f"Sharded Crawl")
+    print(f"{'='*60}")
+    print(f"[INFO] {len(specs)} queries from {args.crawl}")
+    crawler = ShardedCrawler(
+        workers=args.workers,
+        rate=args.rate,
+        output_dir=args.crawl_dir,
+        num=args.limit,
+        country=args.country,
+        scraper_kwargs={
+            "thumbnails": args.thumbnails,
+            "record_dir": args.record,
+            "replay_dir": args.replay,
+            "replay_latency_scale": args.replay_latency_scale,
+            "replay_strict": not args.replay_fallback
+        },
+        search_kwargs={"device": args.device, "no_cache": args.no_cache},
+        job_dir=args.job_dir
+    )
+    summary = crawler.run(specs)
+    merged = summary["merged"]
+    empty = sum(shard["empty"] for shard in summary["shards"])
+    print(f"\n[SUMMARY]")
+    print(f"  Workers: {summary['workers']}")
+    print(f"  Queries: {summary['queries']} ({empty} empty or failed"
+          + (f", {sum(shard['resumed'] for shard in summary['shards'])} resumed from {args.job_dir})" if args.job_dir else ")"))
+    print(f"  Items: {merged['records']} collected, {merged['unique']} unique")
+    print(f"  Elapsed: {summary['elapsed']:.1f}s")
+    print(f"[FILE] {merged['path']}")
+
+def run_batch(args, scraper, country, language):
+    """Run every query spec from a file or stdin through the streaming pipeline in this process"""
+    specs = load_query_specs(sys.stdin if args.stdin else args.queries_file)
+    print(f"\n{'='*60}")
+    print(f"Batch Search")
+    print(f"{'='*60}")
+    if not specs:
+        print(f"[INFO] No queries given")
+        return
+    if args.rate:
+        scraper.rate_limiter = RateLimiter(args.rate)
+    workers = min(len(specs), args.concurrency or CONCURRENCY_CONFIG["max_workers"])
+    print(f"[INFO] {len(specs)} queries from {'stdin' if args.stdin else args.queries_file}, {workers} concurrent")
+    
+    if args.combined:
+        extension = "jsonl" if args.format == "json" else "csv"
+        os.makedirs("output", exist_ok=True)
+        path = output_path(os.path.join("output", f"batch_{time.strftime('%Y%m%d_%H%M%S')}.{extension}"), args.compress)
+        sink = JsonlSink(path, args.compress) if args.format == "json" else CsvSink(path, args.compress)
+    else:
+        sink = QueryFileSink(args.format, args.compress)
+    
+    rows = []
+    
+    def report(spec, results, latency):
+        # Runs on the pipeline's writer thread, after the sink wrote the results
+        metadata = results.metadata
+        source = metadata["source"]
+        error = {"error": metadata.get("failure"), "refused": "budget"}.get(source)
+        if source == "negative" and metadata.get("negative") != "empty":
+            # A remembered failure; remembered empty results are just empty
+            error = metadata.get("negative")
+        rows.append({"query": spec["query"], "country": spec["country"], "language": spec["language"],
+                     "items": len(results), "source": source, "latency": round(latency, 3), "error": error})
+        status = "FAIL" if error else ("OK" if results else "EMPTY")
+        print(f"[{status}] {spec['query']!r} ({spec['country']}): {len(results)} items "
+              f"in {latency:.2f}s ({source})")
+    
+    job = None
+    if args.job_dir:
+        job = BatchJob(args.job_dir, name="batch", params={"limit": args.limit, "country": country, "language": language})
+    
+    pipeline = Pipeline(
+        scraper,
+        [sink],
+        fetch_workers=workers,
+        default_num=args.limit,
+        default_country=country,
+        no_cache=args.no_cache,
+        max_age=args.max_age,
+        on_result=report,
+        job=job
+    )
+    summary = pipeline.run(dict(spec, language=spec["language"] or language, device=args.device) for spec in specs)
+    
+    latencies = sorted(row["latency"] for row in rows)
+    failed = [row for row in rows if row["error"]]
+    empty = [row for row in rows if not row["items"] and not row["error"]]
+    print(f"\n[SUMMARY]")
+    skipped = sum(1 for row in empty if row["source"] == "negative")
+    print(f"  Queries: {len(rows)} ({len(failed)} failed, {len(empty)} empty"
+          + (f", {skipped} of them remembered by the negative cache)" if skipped else ")"))
+    print(f"  Items: {summary['items']} ({summary['stored']} queries answered from cache/archive"
+          + (f", {summary['resumed']} resumed from {args.job_dir})" if job is not None else ")"))
+    if latencies:
+        print(f"  Latency: p50 {latencies[len(latencies) // 2]:.2f}s, "
+              f"p95 {latencies[int(0.95 * (len(latencies) - 1))]:.2f}s, max {latencies[-1]:.2f}s")
+    print(f"  Elapsed: {summary['elapsed']:.1f}s")
+    for row in sorted(rows, key=lambda r: -r["latency"])[:5]:
+        print(f"  slow: {row['latency']:.2f}s {row['query']!r} ({row['country']})")
+    for row in failed:
+        print(f"  failed: {row['query']!r} ({row['country']}): {row['source']} ({row['error']})")
+    if args.combined:
+        print(f"[FILE] {sink.path}")
+    save_to_json(sorted(rows, key=lambda r: r["query"]), "batch_summary.json")
+
+def run_diff(args, scraper, countries, languages):
+    """Poll each query, snapshot its results and print what changed since the last poll"""
+    store = SnapshotStore()
+    diffs = []
+    print(f"\n{'='*60}")
+    print(f"Result Diff")
+    print(f"{'='*60}")
+    for query in args.query:
+        for country in countries:
+            for language in languages:
+                diff = store.poll(scraper, query, num=args.limit, country=country,
+                                  language=language, device=args.device)
+                label = f"{query!r} ({country}/{language or 'auto'})"
+                if diff is None:
+                    print(f"\n[DIFF] {label}: search failed, snapshot not recorded")
+                    continue
+                diffs.append(diff)
+                if diff["first_snapshot"]:
+                    print(f"\n[DIFF] {label}: first snapshot, {len(diff['added'])} items recorded")
+                    continue
+                ago = diff["current_at"] - diff["previous_at"]
+                print(f"\n[DIFF] {label}: +{len(diff['added'])} added, -{len(diff['removed'])} removed, "
+                      f"{len(diff['moved'])} moved, {diff['unchanged']} unchanged (previous poll {ago / 60:.0f}m ago)")
+                for entry in diff["added"]:
+                    print(f"  + #{entry['rank']} {(entry.get('title') or 'N/A')[:70]}")
+                for entry in diff["removed"]:
+                    print(f"  - #{entry['rank']} {(entry.get('title') or 'N/A')[:70]}")
+                for entry in diff["moved"]:
+                    print(f"  ~ #{entry['previous_rank']} -> #{entry['rank']} {(entry.get('title') or 'N/A')[:60]}")
+    if diffs:
+        safe_query = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in "_".join(args.query))
+        save_to_json(diffs, f"diff_{safe_query.replace(' ', '_')[:50]}.json", compression=args.compress)
+
 def main():
     parser = argparse.ArgumentParser(
         description="Google News Scraper (SERP API)",
@@ -34,37 +213,258 @@ Examples:
   
   # Export to CSV
   python main.py "Elon Musk" --format csv --no-cache
+  
+  # Store thumbnails on disk instead of inline base64
+  python main.py "Bitcoin" --thumbnails store
+  
+  # Gzip-compressed output (output/news_Bitcoin.json.gz)
+  python main.py "Bitcoin" --compress gz
+  
+  # Dump metrics (latency percentiles, cache, retries) as JSON or Prometheus text
+  python main.py "Bitcoin" --metrics-out output/metrics.json
+  python main.py --ai-brief --metrics-out output/metrics.prom
+  
+  # Record raw API responses, then replay them offline (no credits used)
+  python main.py "Bitcoin" --record recordings/
+  python main.py "Bitcoin" --replay recordings/
+  
+  # Multi-process crawl over a query file (query<TAB>country<TAB>language<TAB>limit per line)
+  python main.py --crawl keywords.tsv --workers 8 --rate 20
+  
+  # Resumable AI briefing: re-running after a crash skips completed keywords
+  python main.py --ai-brief --job-dir output/jobs/brief-today
+  
+  # Matrix search: every query x country x language concurrently, merged on canonical link
+  python main.py "tech industry" --country us,uk,jp,de --language en
+  python main.py "OpenAI" "Anthropic" --country us,uk
+  
+  # Local HTTP/JSON service shared by many clients (one cache, rate limit, client pool)
+  python main.py --serve --port 8080 --rate 20
+  curl "http://127.0.0.1:8080/search?query=Bitcoin&num=10"
+  
+  # Per-stage time breakdown (network, parsing, export, ...) and cProfile dump
+  python main.py "Bitcoin" --profile
+  python main.py --ai-brief --profile-output output/brief.prof
         """
     )
     
-    parser.add_argument("query", nargs="?", help="Search topic (e.g. 'Artificial Intelligence'). Use --ai-brief for AI news briefing")
+    parser.add_argument("query", nargs="*", help="Search topic(s) (e.g. 'Artificial Intelligence'). Use --ai-brief for AI news briefing")
     parser.add_argument("--ai-brief", action="store_true", help="Get latest AI industry news and breakthroughs (one-command feature)")
     parser.add_argument("--ai-breakthroughs", action="store_true", help="Get latest AI breakthroughs and major announcements")
     parser.add_argument("--limit", type=int, default=20, help="Max results (default: 20)")
-    parser.add_argument("--country", type=str, default="us", help="Country code (us, uk, jp, cn, etc.)")
-    parser.add_argument("--language", type=str, default=None, help="Language code (en, zh, ja, etc.). If not specified, uses default")
+    parser.add_argument("--country", type=str, default="us",
+                       help="Country code (us, uk, jp, cn, etc.), or a comma-separated list for a matrix search")
+    parser.add_argument("--language", type=str, default=None,
+                       help="Language code (en, zh, ja, etc.), or a comma-separated list. If not specified, uses default")
+    parser.add_argument("--concurrency", type=int, default=None,
+                       help="Concurrent searches for matrix mode (default: 16)")
     parser.add_argument("--device", type=str, default=None, choices=["desktop", "mobile", "tablet"], 
                        help="Device type (default: auto)")
     parser.add_argument("--format", type=str, default="json", choices=["json", "csv"], help="Output format (default: json)")
     parser.add_argument("--no-cache", action="store_true", help="Bypass cache for fresh results")
+    parser.add_argument("--thumbnails", type=str, default="inline", choices=["inline", "store", "drop"],
+                       help="Thumbnail handling: keep inline, store in output/thumbnails, or drop (default: inline)")
+    parser.add_argument("--compress", type=str, default=None, choices=["gz", "zst"],
+                       help="Compress the output file (zst requires the zstandard package)")
+    parser.add_argument("--metrics-out", type=str, default=None, metavar="PATH",
+                       help="Write metrics at exit (.prom/.txt for Prometheus text, otherwise JSON)")
+    parser.add_argument("--record", type=str, default=None, metavar="DIR",
+                       help="Save raw SERP responses to DIR for later replay")
+    parser.add_argument("--replay", type=str, default=None, metavar="DIR",
+                       help="Serve responses recorded in DIR instead of calling the API")
+    parser.add_argument("--replay-latency-scale", type=float, default=1.0,
+                       help="Multiplier for recorded latencies in replay mode (default: 1.0, 0 = no delay)")
+    parser.add_argument("--replay-fallback", action="store_true",
+                       help="In replay mode, serve a random recording (with a warning) for unrecorded requests instead of failing")
+    parser.add_argument("--crawl", type=str, default=None, metavar="FILE",
+                       help="Crawl all query specs in FILE with a process pool (see --workers, --rate)")
+    parser.add_argument("--workers", type=int, default=None, help="Crawl worker processes (default: CPU count)")
+    parser.add_argument("--rate", type=float, default=None,
+                       help="Global API request rate limit in requests/second (default: unlimited)")
+    parser.add_argument("--crawl-dir", type=str, default="output/crawl",
+                       help="Directory for crawl partitions and merged output (default: output/crawl)")
+    parser.add_argument("--job-dir", type=str, default=None, metavar="DIR",
+                       help="Checkpoint multi-query runs (--ai-brief, --ai-breakthroughs, --crawl, --queries-file/--stdin) in DIR; re-run to resume")
+    parser.add_argument("--target", type=int, default=None, metavar="N",
+                       help="Matrix search: stop once N unique items are collected and skip the remaining searches")
+    parser.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                       help="Multi-query runs (matrix, --ai-brief, --ai-breakthroughs): return what was found after SECONDS")
+    parser.add_argument("--budget", type=int, default=None, metavar="CALLS",
+                       help="Hard limit on billed API calls (including retries); further calls are refused")
+    parser.add_argument("--soft-budget", type=int, default=None, metavar="CALLS",
+                       help="After this many billed calls, serve cached results even with --no-cache")
+    parser.add_argument("--archive", type=str, default=None, metavar="DIR",
+                       help="Record every fetched article in an append-only archive in DIR")
+    parser.add_argument("--max-age", type=float, default=None, metavar="SECONDS",
+                       help="Serve stored results fetched at most SECONDS ago instead of calling the API "
+                            "(uses --archive, default output/archive)")
+    parser.add_argument("--export-archive", action="store_true",
+                       help="Export articles from the --archive instead of searching (see --since)")
+    parser.add_argument("--since", type=float, default=None, metavar="HOURS",
+                       help="With --export-archive or --local-search: only articles first seen in the last HOURS")
+    parser.add_argument("--index", type=str, nargs="?", const=INDEX_CONFIG["path"], default=None, metavar="PATH",
+                       help=f"Add every fetched article to a local full-text index (default PATH: {INDEX_CONFIG['path']})")
+    parser.add_argument("--local-search", action="store_true",
+                       help="Search the local index for the query instead of calling the API (see --source, --since)")
+    parser.add_argument("--source", type=str, default=None,
+                       help="With --local-search: only articles whose source contains this text")
+    parser.add_argument("--diff", action="store_true",
+                       help="Snapshot fresh results per query and print items added, removed and re-ranked since the last --diff run")
+    parser.add_argument("--queries-file", type=str, default=None, metavar="FILE",
+                       help="Run every query spec in FILE (query[<TAB>country[<TAB>language[<TAB>limit]]] or JSON lines) concurrently in this process")
+    parser.add_argument("--stdin", action="store_true",
+                       help="Like --queries-file, reading query specs from standard input")
+    parser.add_argument("--combined", action="store_true",
+                       help="With --queries-file/--stdin: stream all results to one JSONL/CSV file instead of one file per query")
+    parser.add_argument("--cache-load", nargs="?", const=CACHE_CONFIG["snapshot_path"], default=None, metavar="PATH",
+                       help=f"Preload the response cache from a snapshot (default path: {CACHE_CONFIG['snapshot_path']})")
+    parser.add_argument("--cache-save", nargs="?", const=CACHE_CONFIG["snapshot_path"], default=None, metavar="PATH",
+                       help="Save the response cache (with remaining TTLs) to a snapshot on exit")
+    parser.add_argument("--warm", type=str, default=None, metavar="FILE",
+                       help="Fill the cache from a query list (same format as --crawl) before anything else; runs alone if no other mode is given")
+    parser.add_argument("--cache-stats", action="store_true",
+                       help="Print the 10 hottest cache entries (hits, age, TTL) on exit")
+    parser.add_argument("--serve", action="store_true",
+                       help="Run a local HTTP/JSON service sharing one cache, rate limit and client pool")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Service interface (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Service port (default: 8080)")
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage time breakdown at exit")
+    parser.add_argument("--profile-output", type=str, default=None, metavar="PATH",
+                       help="Run under cProfile and dump stats to PATH (view with python -m pstats); implies --profile")
 
     args = parser.parse_args()
+    countries = split_list(args.country) or ["us"]
+    languages = split_list(args.language) or [None]
+    batch = args.queries_file or args.stdin
+    if args.queries_file and args.stdin:
+        parser.error("Use either --queries-file or --stdin")
+    if batch and args.query:
+        parser.error("Positional queries cannot be combined with --queries-file/--stdin")
+    if (args.ai_brief or args.ai_breakthroughs or args.crawl or args.serve or batch) and (len(countries) > 1 or len(languages) > 1):
+        parser.error("Country/language lists are only supported for regular (matrix) searches")
+    if args.export_archive and not args.archive:
+        parser.error("--export-archive requires --archive DIR")
+    if args.crawl and args.archive:
+        parser.error("--archive is not supported with --crawl (crawl output is already persisted)")
+    if args.crawl and (args.budget or args.soft_budget):
+        parser.error("--budget/--soft-budget are not supported with --crawl (each worker process has its own ledger)")
+    if args.crawl and (args.index or args.max_age is not None or args.cache_load or args.cache_save or args.warm):
+        parser.error("--index, --max-age, --cache-load/--cache-save and --warm are not supported with --crawl "
+                     "(worker processes do not share this process's index, archive or cache)")
+    
+    # Run ledger (persisted with --job-dir so a resumed job keeps its budget); also bills the process ledger
+    ledger = CreditLedger(
+        name="job" if args.job_dir else "run",
+        hard_limit=args.budget,
+        soft_limit=args.soft_budget,
+        parent=credits,
+        path=os.path.join(args.job_dir, "credits.json") if args.job_dir else None
+    )
+    if args.job_dir:
+        os.makedirs(args.job_dir, exist_ok=True)
+    
+    index = None
+    if args.index or args.local_search:
+        index = LocalIndex(args.index or INDEX_CONFIG["path"])
+    
+    if args.max_age is not None and not args.archive:
+        args.archive = ARCHIVE_CONFIG["root"]
+    archive = None
+    if args.archive:
+        archive = ArticleArchive(args.archive)
+        archive.start_compaction()
+    
+    stage_profiler = None
+    if args.profile or args.profile_output:
+        stage_profiler = hooks.register(StageProfiler())
+    cprofile = None
+    if args.profile_output:
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    
+    if args.cache_load:
+        if os.path.exists(args.cache_load):
+            try:
+                print(f"[CACHE] Loaded {load_cache_snapshot(args.cache_load)} entries from {args.cache_load}")
+            except Exception as e:  # Wrong version, truncated or not a snapshot at all
+                print(f"[CACHE] Could not load snapshot: {e}; starting cold")
+        else:
+            print(f"[CACHE] No snapshot at {args.cache_load}, starting cold")
     
     try:
-        # Handle AI news briefing feature
-        if args.ai_brief or args.ai_breakthroughs:
+        if args.warm:
+            warm = build_scraper(args, ledger, archive, index).warm_up(
+                load_query_specs(args.warm), num=args.limit, country=countries[0], max_workers=args.concurrency
+            )
+            print(f"[CACHE] Warm-up: {warm['fetched']} fetched, {warm['cached']} already cached, "
+                  f"{len(warm['failed'])} failed of {warm['queries']} queries in {warm['elapsed']:.1f}s")
+            if not (args.query or batch or args.serve or args.ai_brief or args.ai_breakthroughs or args.export_archive):
+                return
+        
+        if args.serve:
+            print(f"[INFO] Serving on http://{args.host}:{args.port} (Ctrl+C to stop)")
+            try:
+                run_server(build_scraper(args, ledger, archive, index), host=args.host, port=args.port,
+                           max_workers=args.concurrency, rate=args.rate)
+            except KeyboardInterrupt:
+                print("\n[INFO] Server stopped")
+            return
+
+        if args.crawl:
+            run_crawl(args)
+            return
+        
+        if batch:
+            run_batch(args, build_scraper(args, ledger, archive, index), countries[0], languages[0])
+            return
+        
+        if args.diff:
+            if not args.query:
+                parser.error("--diff requires at least one query")
+            run_diff(args, build_scraper(args, ledger, archive, index), countries, languages)
+            return
+        
+        if args.export_archive:
+            start = time.time() - args.since * 3600 if args.since else None
+            results = archive.items(start=start)
+            query_label = "archive"
+            print(f"[ARCHIVE] {len(results)} articles from {args.archive}"
+                  + (f" first seen in the last {args.since:g}h" if args.since else ""))
+        elif args.local_search:
+            if not args.query:
+                parser.error("--local-search requires a query")
+            text = " ".join(args.query)
+            start = time.time()
+            results = index.search(
+                text,
+                limit=args.limit,
+                source=args.source,
+                language=args.language,
+                since=time.time() - args.since * 3600 if args.since else None
+            )
+            query_label = f"local_{text}"
+            print(f"[LOCAL] {len(results)} matches for {text!r} in {(time.time() - start) * 1000:.1f}ms "
+                  f"({index.stats()['articles']} indexed articles, no API calls)")
+        elif args.ai_brief or args.ai_breakthroughs:
+            # Handle AI news briefing feature
             print(f"\n{'='*60}")
             print(f"AI News Briefing")
             print(f"{'='*60}")
             print(f"[INFO] Fetching latest AI industry news...")
             
-            ai_briefing = AINewsBriefing()
+            ai_briefing = AINewsBriefing(
+                scraper=build_scraper(args, ledger, archive, index),
+                planner=KeywordPlanner(AI_KEYWORDS, stats_path=os.path.join("output", "keyword_stats.json"))
+            )
             
             if args.ai_breakthroughs:
                 print(f"[MODE] AI Breakthroughs & Major Announcements")
                 results = ai_briefing.get_ai_breakthroughs(
                     num=args.limit,
-                    country=args.country
+                    country=args.country,
+                    job_dir=args.job_dir,
+                    deadline=args.deadline,
+                    max_age=args.max_age
                 )
                 query_label = "AI_Breakthroughs"
             else:
@@ -73,7 +473,10 @@ Examples:
                     num=args.limit,
                     country=args.country,
                     language=args.language or "en",
-                    no_cache=True
+                    no_cache=True,
+                    job_dir=args.job_dir,
+                    deadline=args.deadline,
+                    max_age=args.max_age
                 )
                 results = briefing_data["latest_news"]
                 query_label = "AI_News_Briefing"
@@ -83,54 +486,95 @@ Examples:
                 print(f"\n[SUMMARY]")
                 print(f"  Total Articles: {summary.get('total_articles', 0)}")
                 print(f"  Topics Covered: {summary.get('topics_covered', 0)}")
+                print(f"  Stories: {summary.get('stories', 0)}")
                 print(f"  Keywords: {', '.join(summary.get('keywords_searched', []))}")
+                print(f"  API Calls: {summary.get('api_calls', 0)}")
+                stored = [k for k, f in summary.get("freshness", {}).items() if f["source"] in ("cache", "archive")]
+                if stored:
+                    print(f"  From stored results: {', '.join(stored)}")
+                if summary.get("stopped") and summary.get("keywords_skipped"):
+                    print(f"  Stopped early ({summary['stopped']}), skipped: {', '.join(summary['keywords_skipped'])}")
+                
+                top_stories = [s for s in briefing_data.get("stories", []) if s["source_count"] > 1][:5]
+                if top_stories:
+                    print(f"\n[TOP STORIES]")
+                    for story in top_stories:
+                        print(f"  {story['source_count']} sources: {(story['headline'] or 'N/A')[:70]}")
         else:
             # Regular search
             if not args.query:
-                parser.error("Query is required unless using --ai-brief or --ai-breakthroughs")
+                parser.error("Query is required unless using --ai-brief, --ai-breakthroughs or --crawl")
             
             print(f"\n{'='*60}")
             print(f"Google News Scraper")
             print(f"{'='*60}")
             print(f"[INFO] Initializing...")
-            scraper = GoogleNewsScraper()
+            scraper = build_scraper(args, ledger, archive, index)
             
-            print(f"\n[SEARCH] Query: '{args.query}'")
+            matrix = len(args.query) > 1 or len(countries) > 1 or len(languages) > 1
+            print(f"\n[SEARCH] Query: {', '.join(repr(q) for q in args.query)}")
             params = []
-            if args.country != "us":
-                params.append(f"Country: {args.country}")
+            if countries != ["us"]:
+                params.append(f"Country: {', '.join(countries)}")
             if args.language:
-                params.append(f"Language: {args.language}")
+                params.append(f"Language: {', '.join(languages)}")
             if args.device:
                 params.append(f"Device: {args.device}")
             if args.no_cache:
                 params.append("Cache: Disabled")
             if params:
                 print(f"[PARAMS] {', '.join(params)}")
-            print(f"[LIMIT] Max results: {args.limit}")
+            if matrix:
+                combos = len(args.query) * len(countries) * len(languages)
+                print(f"[MATRIX] {combos} searches run concurrently, merged and deduplicated")
+            print(f"[LIMIT] Max results: {args.limit}" + (" per search" if matrix else ""))
             print(f"\n[STATUS] Searching... Please wait...")
             
-            results = scraper.search(
-                query=args.query,
-                num=args.limit,
-                country=args.country,
-                language=args.language,
-                device=args.device,
-                no_cache=args.no_cache
-            )
-            query_label = args.query
+            if matrix:
+                results, outcome = scraper.search_matrix_with_report(
+                    queries=args.query,
+                    countries=countries,
+                    languages=languages,
+                    num=args.limit,
+                    device=args.device,
+                    no_cache=args.no_cache,
+                    max_workers=args.concurrency,
+                    target=args.target,
+                    deadline=args.deadline,
+                    max_age=args.max_age
+                )
+                if outcome.reason:
+                    stopped = [f"{q}/{c}/{l or 'auto'}" for q, c, l in outcome.skipped + outcome.abandoned]
+                    print(f"[STOPPED] Early stop ({outcome.reason}); skipped {len(stopped)} searches: {', '.join(stopped)}")
+            else:
+                results = scraper.search(
+                    query=args.query[0],
+                    num=args.limit,
+                    country=countries[0],
+                    language=languages[0],
+                    device=args.device,
+                    no_cache=args.no_cache,
+                    max_age=args.max_age
+                )
+                metadata = results.metadata
+                if metadata["source"] in ("cache", "archive"):
+                    print(f"[FRESHNESS] Served from {metadata['source']}, fetched {metadata['age']:.0f}s ago (no API call)")
+                elif metadata["source"] == "negative":
+                    print(f"[NEGATIVE] Skipped: this request recently returned {metadata['negative']} "
+                          f"({metadata['reason']}); retry in {metadata['retry_at'] - time.time():.0f}s")
+            query_label = "_".join(args.query)
         
         if results:
             # Sanitize filename for safe file system usage
             safe_query = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in query_label)
             filename = f"news_{safe_query.replace(' ', '_')[:50]}.{args.format}"
             if args.format == "csv":
-                save_to_csv(results, filename)
+                filepath = save_to_csv(results, filename, compression=args.compress)
             else:
-                save_to_json(results, filename)
+                filepath = save_to_json(results, filename, compression=args.compress)
             print(f"\n{'='*60}")
             print(f"[SUCCESS] Successfully saved {len(results)} news items")
-            print(f"[FILE] output/{filename}")
+            print(f"[FILE] {filepath}")
             print(f"{'='*60}")
             
             # Display preview of top 3 results
@@ -145,11 +589,14 @@ Examples:
                 print(f"\n{i}. {title}")
                 print(f"   Source: {source}")
                 print(f"   Date: {date}")
+                if item.get('found_by'):
+                    locales = ", ".join(f"{o['country']}/{o['language'] or 'auto'}" for o in item['found_by'])
+                    print(f"   Locales: {locales}")
                 if item.get('snippet'):
                     snippet = item['snippet'][:100] + '...' if len(item['snippet']) > 100 else item['snippet']
                     print(f"   {snippet}")
             print(f"\n{'-'*60}")
-            print(f"[TIP] View full results in: output/{filename}")
+            print(f"[TIP] View full results in: {filepath}")
         else:
             print("\n[WARNING] No results found.")
             print("[TIP] Try:")
@@ -165,6 +612,31 @@ Examples:
     except Exception as e:
         print(f"\n[ERROR] Unexpected error: {e}")
         print("[TIP] Check your internet connection and API token validity")
+    finally:
+        if archive is not None:
+            archive.close()
+        if index is not None:
+            index.close()
+        if not args.crawl:
+            ledger.save()
+            print(f"\n[CREDITS] {ledger.format_summary()}")
+        if cprofile:
+            cprofile.disable()
+            cprofile.dump_stats(args.profile_output)
+            print(f"[PROFILE] Saved cProfile stats to: {args.profile_output}")
+        if stage_profiler:
+            print(f"\n[PROFILE] Time by stage:")
+            print(stage_profiler.format_report())
+        if args.metrics_out:
+            save_metrics(args.metrics_out)
+            print(f"[METRICS] Saved metrics to: {args.metrics_out}")
+        if args.cache_stats:
+            print(f"\n[CACHE] Hottest entries:")
+            for entry in get_cache_entries(limit=10):
+                print(f"  {entry['hits']:>4} hits  age {entry['age']:>5.0f}s  ttl {entry['ttl']:>4.0f}s  "
+                      f"{entry['label'] or entry['key']}")
+        if args.cache_save:
+            print(f"[CACHE] Saved {save_cache_snapshot(args.cache_save)} entries to {args.cache_save}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,11 +2,15 @@
 AI News Briefing Module
 One-command feature to get the latest AI industry news and breakthroughs
 """
-import time
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from .scraper import GoogleNewsScraper
 from .progress import show_progress
+from .jobs import BatchJob
+from .planner import KeywordPlanner
+from .utils import canonicalize_link
+from .stories import cluster_stories
+from .cancellation import CancelToken, OperationCancelled, gather
 
 logger = logging.getLogger("GoogleNewsScraper")
 
@@ -33,100 +37,231 @@ class AINewsBriefing:
     AI News Briefing - Get the latest AI industry news with one command
     """
     
-    def __init__(self):
-        self.scraper = GoogleNewsScraper()
+    def __init__(
+        self,
+        thumbnails: Optional[str] = None,
+        scraper: Optional[GoogleNewsScraper] = None,
+        request_delay: float = 0.5,
+        planner: Optional[KeywordPlanner] = None,
+        progress: bool = True
+    ):
+        """
+        Initialize the briefing with its own scraper.
+        
+        Args:
+            thumbnails: Thumbnail handling mode passed to the scraper
+            scraper: Existing scraper to use instead of creating one
+            request_delay: Pause between keyword searches in seconds (default: 0.5)
+            planner: Keyword planner for get_latest_ai_news (default: one over
+                     AI_KEYWORDS with statistics persisted per PLANNER_CONFIG)
+            progress: Print a progress bar to stdout while searching keywords
+                      (disable for services and other non-interactive use)
+        """
+        self.scraper = scraper or GoogleNewsScraper(thumbnails=thumbnails)
+        self.request_delay = request_delay
+        self.planner = planner or KeywordPlanner(AI_KEYWORDS)
+        self.progress = progress
+    
+    def _search_keyword(
+        self,
+        job: Optional[BatchJob],
+        **params
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Run one keyword search, reusing checkpointed results when resuming a job.
+        
+        Args:
+            job: Batch job for checkpointing (None to always search)
+            **params: Arguments for GoogleNewsScraper.search
+        
+        Returns:
+            Tuple of (results, whether the API was called)
+        """
+        # num may be planned differently per run and max_age is only a lookup
+        # tolerance, so checkpoints are keyed without them
+        spec = {k: v for k, v in params.items() if k not in ("num", "max_age")}
+        if job is not None:
+            stored = job.get(spec)
+            if stored is not None:
+                logger.debug(f"Resumed '{params['query']}' from checkpoint")
+                return stored, False
+        results = self.scraper.search(**params)
+        if job is not None:
+            job.complete(spec, results)
+        return results, True
     
     def get_latest_ai_news(
         self,
         num: int = 20,
         country: str = "us",
         language: str = "en",
-        no_cache: bool = True
+        no_cache: bool = True,
+        job_dir: Optional[str] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancelToken] = None,
+        max_age: Optional[float] = None
     ) -> Dict[str, any]:
         """
         Get the latest AI news from multiple relevant queries.
         
+        Keywords are searched in the planner's order (highest historical
+        unique yield first), each sized to fill the remaining target, and
+        searching stops once num unique articles have been collected.
+        
         Args:
-            num: Number of results per query (default: 20)
+            num: Number of unique articles to collect (default: 20)
             country: Country code (default: "us")
             language: Language code (default: "en")
             no_cache: Whether to bypass cache (default: True for fresh news)
+            job_dir: Checkpoint directory; re-running with the same directory
+                     skips keywords completed by an interrupted run
+            deadline: Stop searching after this many seconds
+            cancel_token: Token to stop the briefing from another thread
+            max_age: Serve keywords from stored results fetched at most this
+                     many seconds ago (see GoogleNewsScraper.search)
         
         Returns:
             Dictionary containing:
             - latest_news: Combined list of all AI news
             - by_topic: News grouped by topic/keyword
-            - summary: Brief summary statistics
+            - stories: Articles grouped by event (see stories.cluster_stories),
+              most widely covered first
+            - summary: Brief summary statistics, including the keywords
+              skipped, why the briefing stopped early ("target",
+              "deadline", "cancelled", "budget" or None), the number of
+              keywords answered by the API and the source and age of
+              each keyword's results (``freshness``)
         """
-        all_news = []
+        unique_news = []
+        seen_links = set()
         news_by_topic = {}
+        keywords_searched = []
+        freshness = {}
+        api_calls = 0
+        job = BatchJob(job_dir, name="ai_news", params={"num": num, "country": country, "language": language}) if job_dir else None
+        
+        token = cancel_token or CancelToken()
+        if deadline is not None:
+            token.set_deadline(deadline)
         
-        # Search for each AI-related keyword
-        primary_keywords = AI_KEYWORDS[:5]  # Use top 5 keywords to avoid too many requests
-        total_keywords = len(primary_keywords)
+        keywords = self.planner.order()
+        total_keywords = len(keywords)
         
-        logger.info(f"Searching {total_keywords} AI-related topics...")
+        logger.info(f"Searching up to {total_keywords} AI-related topics for {num} unique articles...")
         
-        for idx, keyword in enumerate(primary_keywords, 1):
+        called_api = False
+        stopped = None
+        for idx, keyword in enumerate(keywords, 1):
+            if len(unique_news) >= num:
+                stopped = "target"
+                break
+            if token.cancelled:
+                stopped = token.reason
+                break
             try:
-                show_progress(idx, total_keywords, f"Searching AI topics")
-                results = self.scraper.search(
-                    query=keyword,
-                    num=num // len(primary_keywords) + 1,  # Distribute results across keywords
-                    country=country,
-                    language=language,
-                    no_cache=no_cache
-                )
+                # Small delay to avoid rate limiting
+                if self.request_delay and called_api:
+                    token.sleep(self.request_delay)
+                
+                if self.progress:
+                    show_progress(idx, total_keywords, f"Searching AI topics")
+                requested = self.planner.allocate(keyword, num - len(unique_news))
+                with token.bind():
+                    results, called_api = self._search_keyword(
+                        job,
+                        query=keyword,
+                        num=requested,
+                        country=country,
+                        language=language,
+                        no_cache=no_cache,
+                        max_age=max_age
+                    )
+                keywords_searched.append(keyword)
+                metadata = getattr(results, "metadata", {"source": "job"})
+                freshness[keyword] = {"source": metadata["source"], "age": round(metadata.get("age", 0), 1)}
+                # Pause before the next search only if this one reached the API
+                called_api = called_api and metadata["source"] in ("api", "error")
+                if metadata["source"] == "refused":
+                    # The budget refuses every further call
+                    stopped = "budget"
+                    break
+                
+                new_items = 0
+                for item in results:
+                    link = canonicalize_link(item.get("link", ""))
+                    if link and link not in seen_links:
+                        seen_links.add(link)
+                        unique_news.append(item)
+                        new_items += 1
+                if metadata["source"] == "api":
+                    api_calls += 1
+                    self.planner.record(keyword, requested, len(results), new_items)
                 
                 if results:
                     news_by_topic[keyword] = results
-                    all_news.extend(results)
-                    logger.debug(f"Found {len(results)} articles for '{keyword}'")
-                
-                # Small delay to avoid rate limiting
-                if idx < total_keywords:
-                    time.sleep(0.5)
+                    logger.debug(f"Found {len(results)} articles for '{keyword}' ({new_items} new)")
                     
+            except OperationCancelled:
+                stopped = token.reason
+                break
             except Exception as e:
                 logger.warning(f"Failed to fetch news for '{keyword}': {e}")
                 continue
         
-        print()  # New line after progress
+        if self.progress:
+            print()  # New line after progress
+        skipped_keywords = [k for k in keywords if k not in keywords_searched]
+        if stopped and skipped_keywords:
+            logger.info(f"Stopped early ({stopped}); skipped {len(skipped_keywords)} keywords")
         
-        # Remove duplicates based on link
-        seen_links = set()
-        unique_news = []
-        for item in all_news:
-            link = item.get("link", "")
-            if link and link not in seen_links:
-                seen_links.add(link)
-                unique_news.append(item)
+        try:
+            self.planner.save()
+        except OSError as e:
+            logger.warning(f"Could not save keyword stats: {e}")
         
         # Sort by date (most recent first) - approximate sorting
         # Note: Date parsing would be needed for accurate sorting
         
+        stories = cluster_stories(unique_news)
+        
         return {
             "latest_news": unique_news[:num],  # Limit to requested number
             "by_topic": news_by_topic,
+            "stories": stories,
             "summary": {
                 "total_articles": len(unique_news),
                 "topics_covered": len(news_by_topic),
-                "keywords_searched": primary_keywords
+                "stories": len(stories),
+                "keywords_searched": keywords_searched,
+                "keywords_skipped": skipped_keywords,
+                "stopped": stopped,
+                "api_calls": api_calls,
+                "freshness": freshness
             }
         }
     
     def get_ai_breakthroughs(
         self,
         num: int = 10,
-        country: str = "us"
+        country: str = "us",
+        job_dir: Optional[str] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancelToken] = None,
+        max_age: Optional[float] = None
     ) -> List[Dict]:
         """
         Get the latest AI breakthroughs and major announcements.
-        Focuses on breakthrough-related keywords.
+        Focuses on breakthrough-related keywords, in order, and stops
+        issuing searches once num unique items are collected.
         
         Args:
             num: Number of results (default: 10)
             country: Country code (default: "us")
+            job_dir: Checkpoint directory for resuming an interrupted run
+            deadline: Stop searching after this many seconds
+            cancel_token: Token to stop the search from another thread
+            max_age: Serve keywords from stored results fetched at most this
+                     many seconds ago
         
         Returns:
             List of breakthrough news items
@@ -139,29 +274,50 @@ class AINewsBriefing:
             "AI advancement"
         ]
         
-        all_breakthroughs = []
+        job = BatchJob(job_dir, name="ai_breakthroughs", params={"num": num, "country": country}) if job_dir else None
+        seen_links = set()
         
-        for keyword in breakthrough_keywords:
-            try:
-                results = self.scraper.search(
-                    query=keyword,
-                    num=num // len(breakthrough_keywords) + 1,
-                    country=country,
-                    language="en",
-                    no_cache=True
-                )
-                if results:
-                    all_breakthroughs.extend(results)
-            except Exception:
-                continue
+        def search_keyword(keyword):
+            def run():
+                try:
+                    results, _ = self._search_keyword(
+                        job,
+                        query=keyword,
+                        num=num // len(breakthrough_keywords) + 1,
+                        country=country,
+                        language="en",
+                        no_cache=True,
+                        max_age=max_age
+                    )
+                    return results
+                except OperationCancelled:
+                    raise
+                except Exception:
+                    return []
+            return run
+        
+        def accept(keyword, results):
+            seen_links.update(canonicalize_link(item.get("link", "")) for item in results if item.get("link"))
+            return len(seen_links) >= num
+        
+        outcome = gather(
+            [(keyword, search_keyword(keyword)) for keyword in breakthrough_keywords],
+            accept=accept,
+            deadline=deadline,
+            token=cancel_token
+        )
+        if outcome.skipped or outcome.abandoned:
+            logger.info(f"Breakthroughs stopped early ({outcome.reason}); skipped: "
+                        f"{', '.join(outcome.skipped + outcome.abandoned)}")
         
         # Remove duplicates
-        seen_links = set()
+        unique_links = set()
         unique_breakthroughs = []
-        for item in all_breakthroughs:
-            link = item.get("link", "")
-            if link and link not in seen_links:
-                seen_links.add(link)
-                unique_breakthroughs.append(item)
+        for _, results in outcome.completed:
+            for item in results:
+                link = canonicalize_link(item.get("link", ""))
+                if link and link not in unique_links:
+                    unique_links.add(link)
+                    unique_breakthroughs.append(item)
         
         return unique_breakthroughs[:num]
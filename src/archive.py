@@ -0,0 +1,492 @@
+"""
+Article archive
+Append-only, time-segmented store of parsed items keyed by canonical link
+"""
+import os
+import glob
+import json
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Any, Union
+from .config import ARCHIVE_CONFIG
+from .utils import canonicalize_link
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+Timestamp = Union[float, int, datetime]
+
+def _epoch(value: Optional[Timestamp]) -> Optional[float]:
+    """Convert a datetime (naive = UTC) or epoch seconds to epoch seconds"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+def _day(ts: float) -> str:
+    """UTC day of a timestamp, used as segment name"""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+class ArticleArchive:
+    """
+    Append-only article archive.
+
+    Layout:
+        <root>/log/*.jsonl          Raw observations, one file per writer, append-only
+        <root>/segments/<day>.jsonl One record per article, grouped by first-seen UTC day
+        <root>/index.json           Canonical link -> segment, and logs already applied
+        <root>/results/ab/<key>.json Latest result list of each canonical request
+
+    ``append`` only writes to the writer's own log file. ``compact`` folds
+    closed logs into the segments: each article keeps one record with
+    ``first_seen``, ``last_seen``, ``seen_count``, the latest item and a
+    ``found_by`` list of (query, country, language). Segments are rewritten
+    atomically and logs are recorded as applied before they are deleted, so
+    an interrupted compaction can simply run again (at worst re-counting
+    ``seen_count`` for the logs it was applying; the other fields are
+    idempotent).
+    """
+
+    def __init__(
+        self,
+        root: str = ARCHIVE_CONFIG["root"],
+        log_max_bytes: int = ARCHIVE_CONFIG["log_max_bytes"],
+        settle_seconds: float = ARCHIVE_CONFIG["settle_seconds"]
+    ):
+        """
+        Open or create an archive.
+
+        Args:
+            root: Archive directory
+            log_max_bytes: Size at which the writer starts a new log file
+            settle_seconds: Other writers' logs are compacted only once they
+                            have not been modified for this long
+        """
+        self.root = root
+        self.log_dir = os.path.join(root, "log")
+        self.segment_dir = os.path.join(root, "segments")
+        self.index_path = os.path.join(root, "index.json")
+        self.lock_path = os.path.join(root, "compact.lock")
+        self.results_dir = os.path.join(root, "results")
+        self.log_max_bytes = log_max_bytes
+        self.settle_seconds = settle_seconds
+        os.makedirs(self.log_dir, exist_ok=True)
+        os.makedirs(self.segment_dir, exist_ok=True)
+
+        self._write_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._writer_id = f"{int(time.time())}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._log_seq = 0
+        self._log_file = None
+        self._own_logs: set = set()
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+
+    # --- writing -------------------------------------------------------------
+
+    def _open_log(self):
+        """Start a new log file for this writer (caller holds the write lock)"""
+        self._log_seq += 1
+        path = os.path.join(self.log_dir, f"{self._writer_id}-{self._log_seq:05d}.jsonl")
+        self._log_file = open(path, "a", encoding="utf-8")
+        self._own_logs.add(os.path.basename(path))
+
+    def _roll_log(self):
+        """Close the current log so it can be compacted (caller holds the write lock)"""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def append(
+        self,
+        items: List[Dict],
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        language: Optional[str] = None,
+        seen_at: Optional[Timestamp] = None
+    ) -> int:
+        """
+        Record that items were seen.
+
+        Args:
+            items: Parsed news items
+            query: Query that returned them
+            country: Country of the search
+            language: Language of the search
+            seen_at: Observation time (default: now)
+
+        Returns:
+            Number of items recorded (items without a link are skipped)
+        """
+        seen_at = _epoch(seen_at) or time.time()
+        lines = []
+        for item in items:
+            key = canonicalize_link(item.get("link") or "")
+            if not key:
+                continue
+            observation = {"key": key, "seen_at": seen_at, "query": query,
+                           "country": country, "language": language, "item": item}
+            lines.append(json.dumps(observation, ensure_ascii=False, default=str) + "\n")
+        if not lines:
+            return 0
+        with self._write_lock:
+            if self._log_file is None:
+                self._open_log()
+            self._log_file.write("".join(lines))
+            self._log_file.flush()
+            if self._log_file.tell() >= self.log_max_bytes:
+                self._roll_log()
+        return len(lines)
+
+    def put_results(self, request_key: str, request: Dict[str, Any], items: List[Dict],
+                    fetched_at: Optional[float] = None):
+        """
+        Store the result list of a request (replacing the previous one).
+
+        Args:
+            request_key: Canonical request fingerprint
+            request: Request parameters, stored for reference
+            items: Returned items, in order
+            fetched_at: Fetch time (default: now)
+        """
+        path = os.path.join(self.results_dir, request_key[:2], f"{request_key}.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"request": request, "fetched_at": fetched_at or time.time(), "items": items}
+        self._write_json_atomic(path, [json.dumps(entry, ensure_ascii=False, default=str)])
+
+    def get_results(self, request_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored result list of a request.
+
+        Returns:
+            Dict with request, fetched_at and items, or None if never stored
+        """
+        path = os.path.join(self.results_dir, request_key[:2], f"{request_key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            logger.warning(f"Ignoring unreadable stored results {path}")
+            return None
+
+    # --- compaction ----------------------------------------------------------
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Read the index"""
+        if not os.path.exists(self.index_path):
+            return {"articles": {}, "applied": []}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json_atomic(self, path: str, lines: List[str]):
+        """Replace a file with the given lines"""
+        tmp_path = f"{path}.{self._writer_id}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _read_segment(self, day: str) -> Dict[str, Dict]:
+        """Load one segment as key -> record"""
+        records = {}
+        path = os.path.join(self.segment_dir, f"{day}.jsonl")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        records[record["key"]] = record
+        return records
+
+    @staticmethod
+    def _read_log(path: str) -> Iterator[Dict]:
+        """Read observations, ignoring a torn last line"""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.debug(f"Skipping incomplete archive line in {path}")
+
+    @staticmethod
+    def _fold(record: Optional[Dict], observation: Dict) -> Dict:
+        """Merge one observation into an article record"""
+        seen_at = observation["seen_at"]
+        origin = {k: observation.get(k) for k in ("query", "country", "language")}
+        if record is None:
+            return {
+                "key": observation["key"],
+                "first_seen": seen_at,
+                "last_seen": seen_at,
+                "seen_count": 1,
+                "found_by": [origin] if origin["query"] is not None else [],
+                "item": observation["item"]
+            }
+        record["first_seen"] = min(record["first_seen"], seen_at)
+        if seen_at >= record["last_seen"]:
+            record["last_seen"] = seen_at
+            record["item"] = observation["item"]
+        record["seen_count"] += 1
+        if origin["query"] is not None and origin not in record["found_by"]:
+            record["found_by"].append(origin)
+        return record
+
+    def _closed_logs(self) -> List[str]:
+        """Log files that no writer is appending to"""
+        active = os.path.basename(self._log_file.name) if self._log_file is not None else None
+        now = time.time()
+        logs = []
+        for path in sorted(glob.glob(os.path.join(self.log_dir, "*.jsonl"))):
+            name = os.path.basename(path)
+            if name == active:
+                continue
+            if name in self._own_logs or now - os.path.getmtime(path) >= self.settle_seconds:
+                logs.append(path)
+        return logs
+
+    def _acquire_file_lock(self, stale_after: float = 600) -> bool:
+        """Take the cross-process compaction lock (stale locks are broken)"""
+        try:
+            fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(self.lock_path) < stale_after:
+                    return False
+                os.remove(self.lock_path)
+            except FileNotFoundError:
+                pass
+            return self._acquire_file_lock(stale_after)
+        os.write(fd, self._writer_id.encode())
+        os.close(fd)
+        return True
+
+    def compact(self, roll: bool = True) -> Dict[str, int]:
+        """
+        Fold closed logs into the segments and drop duplicate observations.
+
+        Args:
+            roll: Close this writer's current log first so it is included
+
+        Returns:
+            Summary with logs applied, observations read and segments rewritten
+            (all zero if another process is compacting)
+        """
+        with self._compact_lock:
+            if not self._acquire_file_lock():
+                logger.debug("Archive compaction already running in another process")
+                return {"logs": 0, "observations": 0, "segments": 0}
+            try:
+                return self._compact(roll)
+            finally:
+                os.remove(self.lock_path)
+
+    def _compact(self, roll: bool) -> Dict[str, int]:
+        """Compaction body (caller holds both compaction locks)"""
+        if roll:
+            with self._write_lock:
+                self._roll_log()
+        index = self._load_index()
+        applied = set(index["applied"])
+        logs = [p for p in self._closed_logs() if os.path.basename(p) not in applied]
+
+        # Group observations by the segment that owns each article
+        pending: Dict[str, List[Dict]] = {}
+        observations = 0
+        for path in logs:
+            for observation in self._read_log(path):
+                observations += 1
+                key = observation["key"]
+                day = index["articles"].get(key)
+                if day is None:
+                    day = index["articles"][key] = _day(observation["seen_at"])
+                pending.setdefault(day, []).append(observation)
+
+        for day, day_observations in sorted(pending.items()):
+            records = self._read_segment(day)
+            for observation in day_observations:
+                key = observation["key"]
+                records[key] = self._fold(records.get(key), observation)
+            ordered = sorted(records.values(), key=lambda r: r["first_seen"])
+            self._write_json_atomic(
+                os.path.join(self.segment_dir, f"{day}.jsonl"),
+                [json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in ordered]
+            )
+
+        # Record the logs as applied before deleting them, so a crash in
+        # between does not apply them again
+        index["applied"] = sorted(applied | {os.path.basename(p) for p in logs})
+        self._write_json_atomic(self.index_path, [json.dumps(index, ensure_ascii=False)])
+        for path in logs:
+            os.remove(path)
+            self._own_logs.discard(os.path.basename(path))
+        existing = {os.path.basename(p) for p in glob.glob(os.path.join(self.log_dir, "*.jsonl"))}
+        index["applied"] = sorted(name for name in index["applied"] if name in existing)
+        self._write_json_atomic(self.index_path, [json.dumps(index, ensure_ascii=False)])
+
+        if logs:
+            logger.info(f"Archive compaction: {len(logs)} logs, {observations} observations, "
+                        f"{sum(len(v) for v in pending.values())} merged into {len(pending)} segments")
+        return {"logs": len(logs), "observations": observations, "segments": len(pending)}
+
+    def start_compaction(self, interval: float = ARCHIVE_CONFIG["compact_interval"]):
+        """
+        Compact in a daemon thread every interval seconds.
+
+        Args:
+            interval: Seconds between compactions
+        """
+        if self._compactor is not None:
+            return
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.compact()
+                except Exception as e:
+                    logger.warning(f"Archive compaction failed: {e}")
+
+        self._compactor = threading.Thread(target=loop, name="archive-compactor", daemon=True)
+        self._compactor.start()
+
+    def close(self, compact: bool = True):
+        """
+        Stop background compaction and close the log.
+
+        Args:
+            compact: Run a final compaction
+        """
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        if compact:
+            self.compact()
+        with self._write_lock:
+            self._roll_log()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --- reading -------------------------------------------------------------
+
+    def _pending_records(self) -> Dict[str, Dict]:
+        """Fold logs not yet compacted into records (key -> record)"""
+        with self._write_lock:
+            if self._log_file is not None:
+                self._log_file.flush()
+        applied = set(self._load_index()["applied"])
+        records: Dict[str, Dict] = {}
+        for path in sorted(glob.glob(os.path.join(self.log_dir, "*.jsonl"))):
+            if os.path.basename(path) in applied:
+                continue
+            for observation in self._read_log(path):
+                key = observation["key"]
+                records[key] = self._fold(records.get(key), observation)
+        return records
+
+    @staticmethod
+    def _merge(record: Dict, pending: Dict) -> Dict:
+        """Merge a pending record into a compacted one"""
+        merged = dict(record)
+        merged["first_seen"] = min(record["first_seen"], pending["first_seen"])
+        if pending["last_seen"] >= record["last_seen"]:
+            merged["last_seen"] = pending["last_seen"]
+            merged["item"] = pending["item"]
+        merged["seen_count"] = record["seen_count"] + pending["seen_count"]
+        merged["found_by"] = record["found_by"] + [o for o in pending["found_by"] if o not in record["found_by"]]
+        return merged
+
+    def iter_range(
+        self,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        include_pending: bool = True
+    ) -> Iterator[Dict]:
+        """
+        Iterate over articles first seen in [start, end).
+
+        Only segments whose day overlaps the range are opened, and they are
+        streamed line by line in day order.
+
+        Args:
+            start: Earliest first-seen time (datetime or epoch seconds)
+            end: Latest first-seen time, exclusive
+            include_pending: Also include observations not yet compacted
+
+        Yields:
+            Article records (key, first_seen, last_seen, seen_count, found_by, item)
+        """
+        start, end = _epoch(start), _epoch(end)
+        pending = self._pending_records() if include_pending else {}
+
+        def in_range(record):
+            return (start is None or record["first_seen"] >= start) and (end is None or record["first_seen"] < end)
+
+        first_day = _day(start) if start is not None else None
+        last_day = _day(end) if end is not None else None
+        for path in sorted(glob.glob(os.path.join(self.segment_dir, "*.jsonl"))):
+            day = os.path.basename(path)[:-len(".jsonl")]
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record["key"] in pending:
+                        record = self._merge(record, pending.pop(record["key"]))
+                    if in_range(record):
+                        yield record
+
+        # Articles only seen since the last compaction (or in skipped segments)
+        index = self._load_index()["articles"] if pending else {}
+        for record in sorted(pending.values(), key=lambda r: r["first_seen"]):
+            if record["key"] not in index and in_range(record):
+                yield record
+
+    def items(self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> List[Dict]:
+        """
+        Get the latest item of every article first seen in [start, end), for exports.
+
+        Returns:
+            Items with ``first_seen``/``last_seen`` added
+        """
+        return [
+            dict(record["item"], first_seen=record["first_seen"], last_seen=record["last_seen"])
+            for record in self.iter_range(start, end)
+        ]
+
+    def get(self, link: str) -> Optional[Dict]:
+        """
+        Look up one article by link (any tracking variant of it).
+
+        Returns:
+            Article record, or None if it was never seen
+        """
+        key = canonicalize_link(link)
+        record = None
+        day = self._load_index()["articles"].get(key)
+        if day is not None:
+            record = self._read_segment(day).get(key)
+        pending = self._pending_records().get(key)
+        if record is not None and pending is not None:
+            return self._merge(record, pending)
+        return record or pending
+
+    def stats(self) -> Dict[str, int]:
+        """Get compacted article, segment and pending log counts"""
+        index = self._load_index()
+        return {
+            "articles": len(index["articles"]),
+            "segments": len(glob.glob(os.path.join(self.segment_dir, "*.jsonl"))),
+            "pending_logs": len(glob.glob(os.path.join(self.log_dir, "*.jsonl")))
+        }
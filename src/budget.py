@@ -0,0 +1,167 @@
+"""
+API credit accounting
+Counts billed SERP calls per process and per job, and enforces soft and hard spend budgets
+"""
+import os
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Any
+from .metrics import metrics
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+CREDITS = metrics.counter("api_credits_total", "SERP credit events by kind (billed, avoided, refused)")
+
+# One lock for every ledger so a charge is checked and applied atomically up the chain
+_lock = threading.Lock()
+
+class BudgetExceeded(Exception):
+    """Raised instead of making a SERP call that would exceed a hard budget"""
+
+class CreditLedger:
+    """
+    Counter of SERP credits spent and saved.
+
+    Every API attempt is billed, including retries and ``no_cache=True``
+    calls. Ledgers form a chain: a job ledger created with
+    ``parent=credits`` also charges the process-wide ledger, and a charge
+    is refused if any ledger in the chain is at its hard limit.
+
+    Counters:
+        requests: Searches that needed the API (one per fetch)
+        api_calls: Billed API attempts, including retries
+        retries: Billed attempts after the first of a request
+        cache_avoided: Searches answered from cache instead of a billed call
+        refused: Calls refused by a hard limit
+    """
+
+    def __init__(
+        self,
+        name: str = "process",
+        hard_limit: Optional[int] = None,
+        soft_limit: Optional[int] = None,
+        parent: Optional["CreditLedger"] = None,
+        path: Optional[str] = None
+    ):
+        """
+        Initialize ledger.
+
+        Args:
+            name: Ledger name shown in summaries
+            hard_limit: Billed calls after which new calls are refused
+            soft_limit: Billed calls after which searches prefer cached results,
+                        even when called with no_cache=True
+            parent: Ledger also charged for everything charged here
+            path: JSON file to persist counts in (e.g. inside a job directory),
+                  so a resumed job keeps counting against the same budget
+        """
+        self.name = name
+        self.hard_limit = hard_limit
+        self.soft_limit = soft_limit
+        self.parent = parent
+        self.path = path
+        self.counts = {"requests": 0, "api_calls": 0, "retries": 0, "cache_avoided": 0, "refused": 0}
+        self._local = threading.local()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            for key in self.counts:
+                self.counts[key] = int(stored.get(key, 0))
+            logger.info(f"Ledger '{name}' resumed with {self.counts['api_calls']} billed calls")
+
+    def _chain(self) -> List["CreditLedger"]:
+        """This ledger and its ancestors"""
+        ledgers = []
+        ledger = self
+        while ledger is not None:
+            ledgers.append(ledger)
+            ledger = ledger.parent
+        return ledgers
+
+    def _add(self, key: str, n: int = 1):
+        """Increment a counter on the whole chain (caller holds the lock)"""
+        for ledger in self._chain():
+            ledger.counts[key] += n
+
+    def charge(self):
+        """
+        Bill one API attempt of the calling thread's current request.
+
+        Raises:
+            BudgetExceeded: If any ledger in the chain has reached its hard limit
+        """
+        with _lock:
+            for ledger in self._chain():
+                if ledger.hard_limit is not None and ledger.counts["api_calls"] >= ledger.hard_limit:
+                    self._add("refused")
+                    CREDITS.inc(kind="refused")
+                    raise BudgetExceeded(
+                        f"Budget '{ledger.name}' exhausted ({ledger.counts['api_calls']}/{ledger.hard_limit} calls)"
+                    )
+            self._add("api_calls")
+            attempts = getattr(self._local, "attempts", 0)
+            if attempts:
+                self._add("retries")
+            self._local.attempts = attempts + 1
+        CREDITS.inc(kind="billed")
+
+    def record_request(self):
+        """Count a search that goes to the API; later charges on this thread are its attempts"""
+        with _lock:
+            self._add("requests")
+        self._local.attempts = 0
+
+    def record_cache_hit(self):
+        """Count a search answered from cache"""
+        with _lock:
+            self._add("cache_avoided")
+        CREDITS.inc(kind="avoided")
+
+    def over_soft_limit(self) -> bool:
+        """Whether any ledger in the chain has reached its soft limit"""
+        with _lock:
+            return any(
+                ledger.soft_limit is not None and ledger.counts["api_calls"] >= ledger.soft_limit
+                for ledger in self._chain()
+            )
+
+    def remaining(self) -> Optional[int]:
+        """Billed calls left before the tightest hard limit in the chain (None if unlimited)"""
+        with _lock:
+            limits = [
+                ledger.hard_limit - ledger.counts["api_calls"]
+                for ledger in self._chain() if ledger.hard_limit is not None
+            ]
+        return max(0, min(limits)) if limits else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Get counters and limits"""
+        with _lock:
+            counts = dict(self.counts)
+        return dict(counts, name=self.name, hard_limit=self.hard_limit, soft_limit=self.soft_limit)
+
+    def format_summary(self) -> str:
+        """Human-readable one-line summary"""
+        s = self.summary()
+        text = (f"{s['api_calls']} billed calls for {s['requests']} requests ({s['retries']} retries), "
+                f"{s['cache_avoided']} avoided via cache")
+        if s["refused"]:
+            text += f", {s['refused']} refused"
+        if s["hard_limit"] is not None:
+            text += f", budget {s['api_calls']}/{s['hard_limit']}"
+        return text
+
+    def save(self):
+        """Persist counts to the ledger's path, if it has one"""
+        if not self.path:
+            return
+        with _lock:
+            data = json.dumps(self.counts, indent=2)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+# Process-wide ledger charged by every scraper (directly or through a job ledger)
+credits = CreditLedger(name="process")
@@ -2,26 +2,115 @@
 Simple in-memory cache for API responses
 Reduces redundant API calls and improves performance
 """
+import os
 import time
+import gzip
 import hashlib
 import json
-from typing import Dict, Optional, Any
+import pickle
+import logging
+import threading
+from typing import Dict, List, Optional, Any
 from functools import wraps
+from .config import CACHE_CONFIG
+from .compression import compress, decompress, resolve_codec
+from .metrics import metrics
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Format version written by save_snapshot and accepted by load_snapshot
+SNAPSHOT_VERSION = 1
 
 class SimpleCache:
     """
     Simple in-memory cache with TTL (Time To Live) support
+    
+    Without ``compress_threshold``, values are kept as live objects. With
+    it, every value is stored pickled (so ``get`` always returns a copy,
+    whatever its size), and pickles reaching ``compress_threshold`` bytes
+    are also compressed; both are transparently restored on ``get``.
+    
+    The cache is safe for concurrent use: keys are spread over ``shards``
+    independent dictionaries, each guarded by its own lock, so threads
+    touching different keys rarely contend. Serialization and compression
+    run outside the locks, and hit/miss counts are kept per shard under the
+    shard lock and only summed when metrics are exported.
+    
+    Entries record their creation time, hit count and an optional label,
+    for introspection (``entries``). The live entries can be written to a
+    file with ``save_snapshot`` and preloaded into another process with
+    ``load_snapshot``, keeping their remaining TTL.
     """
     
-    def __init__(self, default_ttl: int = 300):
+    def __init__(
+        self,
+        default_ttl: int = 300,
+        compress_threshold: Optional[int] = None,
+        codec: str = "auto",
+        name: str = "default",
+        shards: int = 16
+    ):
         """
         Initialize cache with default TTL in seconds.
         
         Args:
             default_ttl: Default time-to-live in seconds (default: 5 minutes)
+            compress_threshold: Minimum serialized size in bytes for compression
+                                (default: None, compression disabled)
+            codec: Compression codec ("auto", "zlib", "zstd")
+            name: Cache name used as the metrics label
+            shards: Number of lock stripes (default: 16)
         """
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self._shards: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        # Per-shard [hits, misses], guarded by the shard's lock
+        self._counts = [[0, 0] for _ in range(shards)]
         self.default_ttl = default_ttl
+        self.compress_threshold = compress_threshold
+        self.codec = resolve_codec(codec) if compress_threshold is not None else None
+        self.name = name
+        metrics.counter("cache_hits_total", "Cache lookups served from cache").add_collector(self._collect_hits)
+        metrics.counter("cache_misses_total", "Cache lookups not found or expired").add_collector(self._collect_misses)
+        self._evictions = metrics.counter("cache_evictions_total", "Cache entries removed before being served")
+    
+    def _collect(self, column: int) -> Dict[tuple, int]:
+        """Sum one per-shard count for the metrics registry"""
+        total = 0
+        for counts, lock in zip(self._counts, self._locks):
+            with lock:
+                total += counts[column]
+        return {(("cache", self.name),): total}
+    
+    def _collect_hits(self) -> Dict[tuple, int]:
+        """Hits across all shards"""
+        return self._collect(0)
+    
+    def _collect_misses(self) -> Dict[tuple, int]:
+        """Misses across all shards"""
+        return self._collect(1)
+    
+    def _encode(self, value: Any) -> Dict[str, Any]:
+        """Build a cache entry: pickled when compression is enabled, compressed if large enough"""
+        if self.compress_threshold is None:
+            return {"value": value, "codec": None, "pickled": False}
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.debug(f"Value not serializable, caching as a live object: {e}")
+            return {"value": value, "codec": None, "pickled": False}
+        if len(payload) < self.compress_threshold:
+            return {"value": payload, "codec": None, "pickled": True}
+        return {"value": compress(payload, self.codec), "codec": self.codec, "pickled": True}
+    
+    @staticmethod
+    def _decode(entry: Dict[str, Any]) -> Any:
+        """Restore the value stored in a cache entry"""
+        if not entry["pickled"]:
+            return entry["value"]
+        payload = entry["value"] if entry["codec"] is None else decompress(entry["value"], entry["codec"])
+        return pickle.loads(payload)
     
     def _make_key(self, *args, **kwargs) -> str:
         """Create a cache key from function arguments"""
@@ -29,6 +118,10 @@ class SimpleCache:
         key_data = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True)
         return hashlib.md5(key_data.encode()).hexdigest()
     
+    def _stripe(self, key: str) -> int:
+        """Index of the shard holding a key"""
+        return hash(key) % len(self._shards)
+    
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache if not expired.
@@ -39,18 +132,28 @@ class SimpleCache:
         Returns:
             Cached value or None if not found/expired
         """
-        if key not in self.cache:
-            return None
+        index = self._stripe(key)
+        shard = self._shards[index]
+        expired = False
+        with self._locks[index]:
+            entry = shard.get(key)
+            if entry is not None and time.time() > entry["expires_at"]:
+                # Expired, remove it
+                del shard[key]
+                entry = None
+                expired = True
+            elif entry is not None:
+                entry["hits"] += 1
+            self._counts[index][entry is None] += 1
         
-        entry = self.cache[key]
-        if time.time() > entry["expires_at"]:
-            # Expired, remove it
-            del self.cache[key]
+        if entry is None:
+            if expired:
+                self._evictions.inc(cache=self.name, reason="expired")
             return None
         
-        return entry["value"]
+        return self._decode(entry)
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, label: Optional[str] = None):
         """
         Store value in cache with TTL.
         
@@ -58,23 +161,196 @@ class SimpleCache:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (uses default if None)
+            label: Human-readable description of the entry (shown by ``entries``)
         """
         ttl = ttl or self.default_ttl
-        self.cache[key] = {
-            "value": value,
-            "expires_at": time.time() + ttl
-        }
+        entry = self._encode(value)
+        now = time.time()
+        entry.update(expires_at=now + ttl, created_at=now, hits=0, label=label)
+        index = self._stripe(key)
+        with self._locks[index]:
+            self._shards[index][key] = entry
+    
+    def delete(self, key: str) -> bool:
+        """
+        Remove a key from the cache.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            True if the key was present
+        """
+        index = self._stripe(key)
+        with self._locks[index]:
+            return self._shards[index].pop(key, None) is not None
     
     def clear(self):
         """Clear all cached entries"""
-        self.cache.clear()
+        removed = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                removed += len(shard)
+                shard.clear()
+        if removed:
+            self._evictions.inc(removed, cache=self.name, reason="clear")
     
     def size(self) -> int:
         """Get number of cached entries"""
-        return len(self.cache)
+        return sum(len(shard) for shard in self._shards)
+    
+    def _live_entries(self) -> List[tuple]:
+        """Copy (key, entry) pairs of all unexpired entries"""
+        now = time.time()
+        live = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                live.extend((key, dict(entry)) for key, entry in shard.items() if entry["expires_at"] > now)
+        return live
+    
+    def entries(self, limit: Optional[int] = None, sort: str = "hits") -> List[Dict[str, Any]]:
+        """
+        Describe live entries.
+        
+        Args:
+            limit: Maximum entries to return
+            sort: "hits" (hottest first), "age" (oldest first) or "ttl"
+                  (expiring soonest first)
+        
+        Returns:
+            Dicts with key, label, hits, age and ttl (seconds) and compressed
+        
+        Raises:
+            ValueError: If the sort order is unknown
+        """
+        orders = {
+            "hits": lambda e: -e["hits"],
+            "age": lambda e: -e["age"],
+            "ttl": lambda e: e["ttl"]
+        }
+        if sort not in orders:
+            raise ValueError(f"Unknown sort order: {sort}. Use one of {list(orders)}")
+        now = time.time()
+        described = [
+            {
+                "key": key,
+                "label": entry.get("label"),
+                "hits": entry.get("hits", 0),
+                "age": now - entry.get("created_at", now),
+                "ttl": entry["expires_at"] - now,
+                "compressed": entry["codec"] is not None
+            }
+            for key, entry in self._live_entries()
+        ]
+        described.sort(key=orders[sort])
+        return described[:limit] if limit is not None else described
+    
+    def save_snapshot(self, path: str) -> int:
+        """
+        Write all live entries (key, value, remaining TTL, hits, label) to a file.
+        
+        Entries are stored pickled, so a snapshot must only be loaded from a
+        trusted location. Values that cannot be pickled are skipped.
+        
+        Args:
+            path: Snapshot file (gzip-compressed)
+        
+        Returns:
+            Number of entries written
+        """
+        now = time.time()
+        records = []
+        for key, entry in self._live_entries():
+            try:
+                value = pickle.dumps(self._decode(entry), protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                logger.debug(f"Skipping unpicklable cache entry {key}: {e}")
+                continue
+            records.append({
+                "key": key,
+                "value": value,
+                "ttl": entry["expires_at"] - now,
+                "age": now - entry.get("created_at", now),
+                "hits": entry.get("hits", 0),
+                "label": entry.get("label")
+            })
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "saved_at": now, "entries": records}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {len(records)} cache entries to {path}")
+        return len(records)
+    
+    def load_snapshot(self, path: str, overwrite: bool = False) -> int:
+        """
+        Preload entries from a snapshot written by ``save_snapshot``.
+        
+        Each entry keeps the TTL it had left when the snapshot was saved,
+        minus the time since; entries that have expired meanwhile are skipped.
+        Malformed records, or values that can no longer be unpickled, are
+        skipped with a warning.
+        
+        Args:
+            path: Snapshot file
+            overwrite: Replace entries already in this cache
+        
+        Returns:
+            Number of entries loaded
+        
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        with gzip.open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            version = snapshot.get("version") if isinstance(snapshot, dict) else None
+            raise ValueError(f"Unsupported cache snapshot version in {path}: {version!r} "
+                             f"(expected {SNAPSHOT_VERSION})")
+        now = time.time()
+        elapsed = max(0.0, now - snapshot["saved_at"])
+        loaded = 0
+        skipped = 0
+        for record in snapshot["entries"]:
+            try:
+                key = record["key"]
+                ttl = record["ttl"] - elapsed
+                if ttl <= 0:
+                    continue
+                index = self._stripe(key)
+                with self._locks[index]:
+                    present = key in self._shards[index]
+                if present and not overwrite:
+                    continue
+                entry = self._encode(pickle.loads(record["value"]))
+                entry.update(
+                    expires_at=now + ttl,
+                    created_at=now - record["age"] - elapsed,
+                    hits=record["hits"],
+                    label=record.get("label")
+                )
+            except Exception as e:  # Unpickling can raise almost anything
+                skipped += 1
+                logger.warning(f"Skipping unreadable cache snapshot record: {e!r}")
+                continue
+            with self._locks[index]:
+                self._shards[index][key] = entry
+            loaded += 1
+        logger.info(f"Loaded {loaded} of {len(snapshot['entries'])} cache entries from {path}"
+                    + (f" ({skipped} unreadable)" if skipped else ""))
+        return loaded
 
 # Global cache instance
-_cache = SimpleCache(default_ttl=300)  # 5 minutes default
+_cache = SimpleCache(
+    default_ttl=CACHE_CONFIG["default_ttl"],  # 5 minutes default
+    compress_threshold=CACHE_CONFIG["compress_threshold"],
+    codec=CACHE_CONFIG["codec"],
+    name="global",
+    shards=CACHE_CONFIG["shards"]
+)
 
 def cached(ttl: Optional[int] = None):
     """
@@ -115,3 +391,15 @@ def clear_cache():
 def get_cache_size() -> int:
     """Get the number of cached entries"""
     return _cache.size()
+
+def get_cache_entries(limit: Optional[int] = None, sort: str = "hits") -> List[Dict[str, Any]]:
+    """Describe entries of the global cache (see SimpleCache.entries)"""
+    return _cache.entries(limit=limit, sort=sort)
+
+def save_cache_snapshot(path: str) -> int:
+    """Write the global cache to a snapshot file"""
+    return _cache.save_snapshot(path)
+
+def load_cache_snapshot(path: str) -> int:
+    """Preload the global cache from a snapshot file"""
+    return _cache.load_snapshot(path)
@@ -0,0 +1,206 @@
+"""
+Cooperative cancellation
+Cancel tokens and a gather helper that stops multi-query operations at a target or deadline
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+_current = threading.local()
+
+class OperationCancelled(Exception):
+    """Raised inside a search when its operation has been cancelled"""
+
+class CancelToken:
+    """
+    Cancellation flag shared by every request of one operation.
+
+    Searches check the token bound to their thread (see ``bind``) before
+    calling the API, while waiting for the rate limiter and between retries,
+    so in-flight requests stop at their next checkpoint. A request already
+    waiting on the network cannot be interrupted and finishes normally.
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        """
+        Initialize token.
+
+        Args:
+            deadline: Seconds from now after which the token counts as cancelled
+        """
+        self._event = threading.Event()
+        self._deadline = None if deadline is None else time.monotonic() + deadline
+        self.reason: Optional[str] = None
+
+    def set_deadline(self, seconds: float):
+        """Set a deadline seconds from now, keeping an earlier existing one"""
+        deadline = time.monotonic() + seconds
+        if self._deadline is None or deadline < self._deadline:
+            self._deadline = deadline
+
+    def cancel(self, reason: str = "cancelled"):
+        """Cancel the operation (the first reason is kept)"""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the operation was cancelled or its deadline has passed"""
+        if not self._event.is_set() and self._deadline is not None and time.monotonic() >= self._deadline:
+            self.cancel("deadline")
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline (None without a deadline)"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def raise_if_cancelled(self):
+        """
+        Raises:
+            OperationCancelled: If the token is cancelled
+        """
+        if self.cancelled:
+            raise OperationCancelled(self.reason)
+
+    def sleep(self, seconds: float):
+        """
+        Sleep, waking up early on cancellation.
+
+        Raises:
+            OperationCancelled: If the token is cancelled before or during the sleep
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining < seconds:
+            self._event.wait(remaining)
+        else:
+            self._event.wait(seconds)
+        self.raise_if_cancelled()
+
+    @contextmanager
+    def bind(self):
+        """Make this the current token of the calling thread"""
+        previous = getattr(_current, "token", None)
+        _current.token = self
+        try:
+            yield self
+        finally:
+            _current.token = previous
+
+def current_token() -> Optional[CancelToken]:
+    """Get the token bound to the calling thread, if any"""
+    return getattr(_current, "token", None)
+
+def check_cancelled():
+    """
+    Raise if the calling thread's operation has been cancelled.
+
+    Raises:
+        OperationCancelled: If the bound token is cancelled
+    """
+    token = current_token()
+    if token is not None:
+        token.raise_if_cancelled()
+
+class GatherResult:
+    """
+    Outcome of ``gather``.
+
+    Attributes:
+        completed: (key, result) pairs of finished calls, in submission order
+        skipped: Keys of calls that never started
+        abandoned: Keys of calls still in flight when the operation stopped
+        reason: Why the operation stopped early ("target", "deadline",
+                "cancelled"), or None if every call completed
+    """
+
+    def __init__(self):
+        self.completed: List[Tuple[Any, Any]] = []
+        self.skipped: List[Any] = []
+        self.abandoned: List[Any] = []
+        self.reason: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Get a JSON-serializable summary"""
+        return {
+            "completed": len(self.completed),
+            "skipped": [str(k) for k in self.skipped],
+            "abandoned": [str(k) for k in self.abandoned],
+            "reason": self.reason
+        }
+
+def gather(
+    calls: List[Tuple[Any, Callable[[], Any]]],
+    accept: Optional[Callable[[Any, Any], bool]] = None,
+    deadline: Optional[float] = None,
+    token: Optional[CancelToken] = None,
+    max_workers: int = 1
+) -> GatherResult:
+    """
+    Run calls on a thread pool until all finish, a target is reached or time runs out.
+
+    Args:
+        calls: (key, function) pairs; functions run with the token bound
+        accept: Called with (key, result) in completion order; returning True
+                means the target is reached and the remaining calls are cancelled
+        deadline: Seconds until the operation gives up on outstanding calls
+        token: Token to cancel from outside (default: a new one)
+        max_workers: Concurrent calls (1 runs them in order)
+
+    Returns:
+        GatherResult. Returns as soon as the operation stops; abandoned calls
+        finish in the background and their results are discarded.
+    """
+    token = token or CancelToken()
+    if deadline is not None:
+        token.set_deadline(deadline)
+    outcome = GatherResult()
+    if not calls:
+        return outcome
+
+    def run(func):
+        with token.bind():
+            token.raise_if_cancelled()
+            return func()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls))))
+    futures = {executor.submit(run, func): key for key, func in calls}
+    order = {key: i for i, (key, _) in enumerate(calls)}
+    pending = set(futures)
+    try:
+        while pending and not token.cancelled:
+            done, pending = wait(pending, timeout=token.remaining(), return_when=FIRST_COMPLETED)
+            for future in done:
+                key = futures[future]
+                try:
+                    result = future.result()
+                except OperationCancelled:
+                    outcome.abandoned.append(key)
+                    continue
+                outcome.completed.append((key, result))
+                if accept is not None and accept(key, result):
+                    token.cancel("target")
+        if pending:
+            for future in pending:
+                if future.cancel():
+                    outcome.skipped.append(futures[future])
+                else:
+                    outcome.abandoned.append(futures[future])
+            outcome.reason = token.reason or "cancelled"
+    finally:
+        executor.shutdown(wait=False)
+
+    outcome.completed.sort(key=lambda pair: order[pair[0]])
+    outcome.skipped.sort(key=order.get)
+    outcome.abandoned.sort(key=order.get)
+    if outcome.reason:
+        logger.info(f"Stopped early ({outcome.reason}): {len(outcome.completed)} completed, "
+                    f"{len(outcome.skipped)} skipped, {len(outcome.abandoned)} abandoned")
+    return outcome
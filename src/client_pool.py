@@ -0,0 +1,180 @@
+"""
+Shared client pool
+Process-wide pool of ThordataClient instances reused across scrapers and threads
+"""
+import os
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Iterator
+from thordata import ThordataClient
+from .config import CLIENT_POOL_CONFIG
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+class ClientPool:
+    """
+    Pool of ThordataClient instances, keyed by scraper token.
+
+    Each client keeps its own HTTP session, so returning it to the pool keeps
+    its keep-alive connections and TLS sessions warm for the next request.
+    A client is used by one thread at a time; ``pool_size`` bounds the
+    number of clients (and concurrent requests) per token.
+
+    Usage:
+        with ClientPool(pool_size=8) as pool:
+            scraper = GoogleNewsScraper(pool=pool)
+            ...
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, client_factory: Optional[Callable] = None):
+        """
+        Initialize pool.
+
+        Args:
+            pool_size: Maximum clients per token (default: from CLIENT_POOL_CONFIG)
+            client_factory: Callable taking a token and returning a client
+                            (default: ThordataClient)
+        """
+        self.pool_size = pool_size or CLIENT_POOL_CONFIG["pool_size"]
+        if self.pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.client_factory = client_factory or (lambda token: ThordataClient(scraper_token=token))
+        self._idle: Dict[str, List] = {}
+        self._created: Dict[str, int] = {}
+        self._all: List = []
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @contextmanager
+    def acquire(self, token: str, timeout: Optional[float] = None) -> Iterator:
+        """
+        Borrow a client for a token, creating one if the pool is not full.
+
+        Args:
+            token: Scraper token
+            timeout: Seconds to wait for a free client (None waits forever)
+
+        Yields:
+            A client exposing ``serp_search_advanced``
+
+        Raises:
+            RuntimeError: If the pool is closed
+            TimeoutError: If no client became free within the timeout
+        """
+        client = None
+        with self._condition:
+            while client is None:
+                if self._closed:
+                    raise RuntimeError("Client pool is closed")
+                idle = self._idle.setdefault(token, [])
+                if idle:
+                    client = idle.pop()
+                elif self._created.get(token, 0) < self.pool_size:
+                    self._created[token] = self._created.get(token, 0) + 1
+                    break
+                elif not self._condition.wait(timeout):
+                    raise TimeoutError(f"No pooled client available within {timeout}s")
+
+        if client is None:
+            try:
+                client = self.client_factory(token)
+            except Exception:
+                with self._condition:
+                    self._created[token] -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._all.append(client)
+            logger.debug(f"Created pooled client ({self._created[token]}/{self.pool_size})")
+
+        try:
+            yield client
+        finally:
+            with self._condition:
+                if self._closed:
+                    _close_client(client)
+                else:
+                    self._idle.setdefault(token, []).append(client)
+                    self._condition.notify()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get created/idle client counts per token (tokens are masked)"""
+        with self._condition:
+            return {
+                f"{token[:4]}...": {"created": created, "idle": len(self._idle.get(token, []))}
+                for token, created in self._created.items()
+            }
+
+    def close(self):
+        """Close all idle clients; borrowed clients are closed when returned"""
+        with self._condition:
+            self._closed = True
+            idle = [client for clients in self._idle.values() for client in clients]
+            self._idle.clear()
+            self._condition.notify_all()
+        for client in idle:
+            _close_client(client)
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class PooledClient:
+    """
+    Client facade that borrows a pooled client for each call
+    """
+
+    def __init__(self, pool: ClientPool, token: str):
+        """
+        Initialize facade.
+
+        Args:
+            pool: Pool to borrow from
+            token: Scraper token
+        """
+        self.pool = pool
+        self.token = token
+
+    def serp_search_advanced(self, req):
+        """Run a SERP request on a borrowed client"""
+        with self.pool.acquire(self.token) as client:
+            return client.serp_search_advanced(req)
+
+def _close_client(client):
+    """Close a client's HTTP resources if it supports it"""
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Error closing client: {e}")
+
+_default_pool: Optional[ClientPool] = None
+_default_pool_lock = threading.Lock()
+
+def get_client_pool() -> ClientPool:
+    """
+    Get the process-wide client pool, creating it on first use.
+
+    The pool size can be overridden with the THORDATA_POOL_SIZE environment variable.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool._closed:
+            size = os.getenv("THORDATA_POOL_SIZE")
+            _default_pool = ClientPool(pool_size=int(size) if size else None)
+        return _default_pool
+
+def close_client_pool():
+    """Close the process-wide client pool (called automatically at exit)"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+            _default_pool = None
+
+atexit.register(close_client_pool)
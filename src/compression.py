@@ -0,0 +1,123 @@
+"""
+Compression helpers
+Shared codecs for compressed cache entries and compressed output files
+"""
+import gzip
+import zlib
+import logging
+from typing import Optional, IO
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# In-memory codecs for cache entries
+CODECS = ["zlib", "zstd"]
+
+# Output file compressions (used as file name suffixes)
+OUTPUT_COMPRESSIONS = ["gz", "zst"]
+
+def zstd_available() -> bool:
+    """Check whether the optional zstandard package is installed"""
+    return zstandard is not None
+
+def resolve_codec(codec: str = "auto") -> str:
+    """
+    Resolve a codec name, picking zstd when available for "auto".
+
+    Args:
+        codec: "auto", "zlib" or "zstd"
+
+    Returns:
+        Concrete codec name
+
+    Raises:
+        ValueError: If the codec is unknown or zstd is requested but not installed
+    """
+    if codec == "auto":
+        return "zstd" if zstd_available() else "zlib"
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported codec: {codec}. Use one of {CODECS} or 'auto'")
+    if codec == "zstd" and not zstd_available():
+        raise ValueError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+    return codec
+
+def compress(data: bytes, codec: str) -> bytes:
+    """
+    Compress bytes with the given codec.
+
+    Args:
+        data: Raw bytes
+        codec: "zlib" or "zstd"
+
+    Returns:
+        Compressed bytes
+    """
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """
+    Decompress bytes produced by ``compress``.
+
+    Args:
+        data: Compressed bytes
+        codec: "zlib" or "zstd"
+
+    Returns:
+        Raw bytes
+    """
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+def output_path(filepath: str, compression: Optional[str]) -> str:
+    """
+    Append the compression suffix to an output path.
+
+    Args:
+        filepath: Uncompressed file path
+        compression: None, "gz" or "zst"
+
+    Returns:
+        File path with suffix (e.g. ``news_ai.json.gz``)
+    """
+    if not compression:
+        return filepath
+    if compression not in OUTPUT_COMPRESSIONS:
+        raise ValueError(f"Unsupported output compression: {compression}. Use one of {OUTPUT_COMPRESSIONS}")
+    return f"{filepath}.{compression}"
+
+def open_output(
+    filepath: str,
+    compression: Optional[str] = None,
+    mode: str = "wt",
+    encoding: str = "utf-8",
+    newline: Optional[str] = None
+) -> IO:
+    """
+    Open an output file, transparently compressing it.
+
+    Args:
+        filepath: Path to open (already including any suffix)
+        compression: None, "gz" or "zst"
+        mode: Text mode ("wt", "at" or "rt")
+        encoding: Text encoding
+        newline: Newline handling passed to the text wrapper
+
+    Returns:
+        File object
+    """
+    if not compression:
+        return open(filepath, mode.replace("t", ""), encoding=encoding, newline=newline)
+    if compression == "gz":
+        return gzip.open(filepath, mode, encoding=encoding, newline=newline)
+    if compression == "zst":
+        if not zstd_available():
+            raise ValueError("zst output requires the 'zstandard' package (pip install zstandard)")
+        return zstandard.open(filepath, mode, encoding=encoding, newline=newline)
+    raise ValueError(f"Unsupported output compression: {compression}. Use one of {OUTPUT_COMPRESSIONS}")
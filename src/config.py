@@ -13,9 +13,127 @@ ENGINE_CONFIG = {
     "default_device": None  # None = auto, or "desktop", "mobile", "tablet"
 }
 
+# Response cache configuration
+# With compress_threshold set, entries are stored pickled (reads return copies)
+# and those whose pickled size reaches compress_threshold bytes are compressed
+# ("auto" uses zstd when the zstandard package is installed, else zlib)
+# Keys are spread over "shards" lock stripes for concurrent access
+CACHE_CONFIG = {
+    "default_ttl": 300,
+    "compress_threshold": 2048,
+    "codec": "auto",
+    "shards": 16,
+    "snapshot_path": "output/cache_snapshot.pkl.gz"
+}
+
+# Negative caching of empty results and failed searches. Base TTLs in
+# seconds, multiplied by backoff_factor for each consecutive repeat (up to
+# max_ttl); failure classes are assigned by negative_cache.classify_failure
+NEGATIVE_CACHE_CONFIG = {
+    "empty_ttl": 120,
+    "failure_ttls": {
+        "auth": 600,
+        "quota": 900,
+        "rate_limited": 60,
+        "bad_request": 3600,
+        "server": 30,
+        "network": 15,
+        "other": 60
+    },
+    "backoff_factor": 2,
+    "max_ttl": 6 * 3600,
+    "max_entries": 10000
+}
+
+# Thread concurrency for multi-search operations (matrix, batch)
+CONCURRENCY_CONFIG = {
+    "max_workers": 16
+}
+
+# Shared client pool
+# Maximum ThordataClient instances (and concurrent requests) per token;
+# override with the THORDATA_POOL_SIZE environment variable. Sized to
+# max_workers so concurrent searches do not queue for a client
+CLIENT_POOL_CONFIG = {
+    "pool_size": CONCURRENCY_CONFIG["max_workers"]
+}
+
+# Multi-token dispatch (THORDATA_SCRAPER_TOKENS). rate is requests per second
+# per token (None: unlimited), concurrency is simultaneous calls per token;
+# quarantine gives the seconds a token sits out after each failure class
+TOKEN_POOL_CONFIG = {
+    "strategy": "least_loaded",
+    "rate": None,
+    "concurrency": 8,
+    "quarantine": {
+        "auth": 3600,
+        "quota": 1800,
+        "rate_limited": 30
+    }
+}
+
+# AI briefing keyword planner
+# Per-keyword unique-yield statistics persist in stats_path (None: in memory
+# only; the CLI passes output/keyword_stats.json); keywords without
+# history start at prior_yield (new unique articles per requested result),
+# weighted as prior_weight requested results
+PLANNER_CONFIG = {
+    "stats_path": None,
+    "prior_yield": 0.5,
+    "prior_weight": 20,
+    "min_num": 5,
+    "max_num": 50
+}
+
+# Article archive
+# Writers roll to a new log file at log_max_bytes; background compaction runs
+# every compact_interval seconds and only touches other writers' logs once
+# they have been idle for settle_seconds
+ARCHIVE_CONFIG = {
+    "root": "output/archive",
+    "log_max_bytes": 4 * 1024 * 1024,
+    "compact_interval": 300,
+    "settle_seconds": 60
+}
+
+# Local full-text index (SQLite)
+INDEX_CONFIG = {
+    "path": "output/news_index.sqlite"
+}
+
+# Story clustering: items whose hashed unigram/bigram TF-IDF vectors have a
+# cosine similarity of at least threshold belong to the same story
+STORY_CONFIG = {
+    "threshold": 0.3,
+    "n_features": 2 ** 18,
+    "max_df": 0.2,
+    "chunk_size": 2000
+}
+
+# Streaming pipeline: worker threads per stage and capacity of each
+# inter-stage queue (bounds responses/results held in memory)
+PIPELINE_CONFIG = {
+    "fetch_workers": 8,
+    "parse_workers": 2,
+    "queue_size": 16
+}
+
+# Per-query result snapshots (for --diff)
+SNAPSHOT_CONFIG = {
+    "root": "output/snapshots",
+    "keep": 100
+}
+
 # Export field definitions (for data cleaning)
 EXPORT_FIELDS = ["title", "source", "date", "snippet", "link", "thumbnail"]
 
+# Thumbnail handling
+# "inline" keeps data URIs, "store" externalizes them, "drop" removes them
+THUMBNAIL_CONFIG = {
+    "mode": "inline",
+    "store_dir": "output/thumbnails"
+}
+
 # Supported device types
 SUPPORTED_DEVICES = ["desktop", "mobile", "tablet"]
 
@@ -0,0 +1,227 @@
+"""
+Multi-process sharded crawler
+Spreads large (query, country) lists over a process pool with a shared rate limit
+"""
+import os
+import glob
+import json
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.managers import BaseManager
+from typing import List, Dict, Optional, Any
+from .rate_limit import RateLimiter
+from .utils import merge_results
+from .jobs import BatchJob
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+class CrawlCoordinator(BaseManager):
+    """
+    Local manager process that owns the crawl-wide rate limiter.
+    Workers receive a proxy, so every process draws from the same bucket.
+    """
+
+CrawlCoordinator.register("RateLimiter", RateLimiter)
+
+def _crawl_shard(
+    shard_id: int,
+    specs: List[Dict[str, Any]],
+    output_dir: str,
+    default_num: int,
+    default_country: str,
+    rate_limiter,
+    scraper_kwargs: Dict[str, Any],
+    search_kwargs: Dict[str, Any],
+    job_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Worker entry point: run one shard and stream results to its partition.
+
+    With a job directory, every completed query is checkpointed there and
+    queries completed by an earlier run are read back instead of searched.
+
+    Returns:
+        Shard summary (queries, failed/empty queries, resumed queries,
+        items written, path)
+    """
+    from .scraper import GoogleNewsScraper
+
+    scraper = GoogleNewsScraper(rate_limiter=rate_limiter, **scraper_kwargs)
+    path = os.path.join(output_dir, f"part-{shard_id:05d}.jsonl")
+    items_written = 0
+    empty = 0
+    resumed = 0
+
+    # Checkpoints are keyed on the spec with defaults applied, so they survive re-sharding
+    requests = [
+        {
+            "query": spec["query"],
+            "num": spec.get("limit") or default_num,
+            "country": spec.get("country") or default_country,
+            "language": spec.get("language")
+        }
+        for spec in specs
+    ]
+
+    def search(request):
+        return scraper.search(**request, **search_kwargs)
+
+    if job_dir:
+        outcomes = BatchJob(job_dir, name="crawl").run(requests, search)
+    else:
+        outcomes = ((request, search(request), False) for request in requests)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for request, results, from_job in outcomes:
+            resumed += from_job
+            if not results:
+                empty += 1
+            for item in results:
+                record = dict(item, query=request["query"], country=request["country"], language=request["language"])
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            items_written += len(results)
+            f.flush()
+
+    return {"shard": shard_id, "queries": len(specs), "empty": empty, "resumed": resumed,
+            "items": items_written, "path": path}
+
+def merge_partitions(output_dir: str, merged_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Merge partition files into one JSONL file, deduplicated by canonical link.
+
+    The first occurrence of each article wins; later duplicates only add
+    their (query, country, language) to its ``found_by`` list.
+
+    Args:
+        output_dir: Directory containing ``part-*.jsonl`` files
+        merged_path: Output file (default: ``<output_dir>/merged.jsonl``)
+
+    Returns:
+        Summary with input records, unique records and merged path
+    """
+    merged_path = merged_path or os.path.join(output_dir, "merged.jsonl")
+    total = 0
+
+    def read_partitions():
+        nonlocal total
+        for path in sorted(glob.glob(os.path.join(output_dir, "part-*.jsonl"))):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        total += 1
+                        yield json.loads(line)
+
+    records = merge_results(read_partitions())
+    with open(merged_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    return {"records": total, "unique": len(records), "path": merged_path}
+
+class ShardedCrawler:
+    """
+    Crawl runner that shards query specs across worker processes
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        rate: Optional[float] = None,
+        output_dir: str = "output/crawl",
+        num: int = 20,
+        country: str = "us",
+        scraper_kwargs: Optional[Dict[str, Any]] = None,
+        search_kwargs: Optional[Dict[str, Any]] = None,
+        job_dir: Optional[str] = None
+    ):
+        """
+        Initialize crawler.
+
+        Args:
+            workers: Worker processes (default: CPU count)
+            rate: Global API request rate in requests/second shared by all
+                  workers (default: None, unlimited)
+            output_dir: Directory for partitions and the merged file
+            num: Results per query when the spec has no limit
+            country: Country when the spec has none
+            scraper_kwargs: Extra GoogleNewsScraper arguments for each worker
+                            (must be picklable, e.g. thumbnails="store")
+            search_kwargs: Extra ``search()`` arguments for every query
+                           (e.g. device="mobile", no_cache=True)
+            job_dir: Checkpoint completed queries in this BatchJob directory;
+                     re-running with the same directory only searches the
+                     queries an interrupted crawl did not complete
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.rate = rate
+        self.output_dir = output_dir
+        self.num = num
+        self.country = country
+        self.scraper_kwargs = scraper_kwargs or {}
+        self.search_kwargs = search_kwargs or {}
+        self.job_dir = job_dir
+
+    def run(self, specs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Crawl all specs, then merge and dedupe the partitions.
+
+        Partitions are rewritten on every run; with ``job_dir``, queries
+        completed before are rewritten from their checkpointed results.
+
+        Args:
+            specs: Query specs as returned by ``load_query_specs``
+
+        Returns:
+            Summary with per-shard results, merge statistics and elapsed time
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.job_dir:
+            # Create the manifest before workers open the job concurrently
+            BatchJob(self.job_dir, name="crawl", params={"num": self.num, "country": self.country})
+        for stale in glob.glob(os.path.join(self.output_dir, "part-*.jsonl")):
+            os.remove(stale)
+
+        workers = max(1, min(self.workers, len(specs)))
+        # Round-robin sharding keeps shards balanced for sorted keyword files
+        shards = [specs[i::workers] for i in range(workers)]
+        start = time.time()
+        context = multiprocessing.get_context("spawn")
+
+        coordinator = None
+        rate_limiter = None
+        if self.rate:
+            coordinator = CrawlCoordinator(ctx=context)
+            coordinator.start()
+            rate_limiter = coordinator.RateLimiter(self.rate)
+
+        logger.info(f"Crawling {len(specs)} queries with {workers} workers"
+                    + (f" at {self.rate} req/s" if self.rate else ""))
+        shard_results = []
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = [
+                    executor.submit(
+                        _crawl_shard, shard_id, shard, self.output_dir,
+                        self.num, self.country, rate_limiter, self.scraper_kwargs, self.search_kwargs,
+                        self.job_dir
+                    )
+                    for shard_id, shard in enumerate(shards)
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    shard_results.append(result)
+                    logger.info(f"Shard {result['shard']} done: {result['items']} items from {result['queries']} queries")
+        finally:
+            if coordinator is not None:
+                coordinator.shutdown()
+
+        merged = merge_partitions(self.output_dir)
+        return {
+            "queries": len(specs),
+            "workers": workers,
+            "shards": sorted(shard_results, key=lambda r: r["shard"]),
+            "merged": merged,
+            "elapsed": time.time() - start
+        }
@@ -0,0 +1,233 @@
+"""
+Pipeline hooks
+Start/end callbacks around each stage of the search pipeline, plus a built-in profiler
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Stages emitted by GoogleNewsScraper.search and the export helpers
+PIPELINE_STAGES = [
+    "search",
+    "cache_lookup",
+    "archive_lookup",
+    "fetch",
+    "parse",
+    "truncate",
+    "thumbnails",
+    "cache_store",
+    "archive",
+    "index",
+    "export",
+]
+
+class PipelineHook:
+    """
+    Base class for pipeline hooks. Override the callbacks you need.
+    """
+
+    def on_stage_start(self, stage: str, context: Dict[str, Any]):
+        """
+        Called when a stage starts.
+
+        Args:
+            stage: Stage name (see PIPELINE_STAGES)
+            context: Mutable context shared by the stage (query, country, ...)
+        """
+
+    def on_stage_end(
+        self,
+        stage: str,
+        context: Dict[str, Any],
+        elapsed: float,
+        error: Optional[BaseException] = None
+    ):
+        """
+        Called when a stage finishes.
+
+        Args:
+            stage: Stage name
+            context: Context passed to on_stage_start, possibly enriched by the stage
+            elapsed: Stage duration in seconds
+            error: Exception raised by the stage, if any
+        """
+
+class HookManager:
+    """
+    Registry of pipeline hooks
+    """
+
+    def __init__(self):
+        """Initialize an empty hook registry"""
+        self._hooks: List[PipelineHook] = []
+        self._lock = threading.Lock()
+
+    def register(self, hook: PipelineHook) -> PipelineHook:
+        """
+        Register a hook.
+
+        Args:
+            hook: Hook instance
+
+        Returns:
+            The registered hook (for chaining)
+        """
+        with self._lock:
+            self._hooks = self._hooks + [hook]
+        return hook
+
+    def unregister(self, hook: PipelineHook):
+        """Remove a previously registered hook"""
+        with self._lock:
+            self._hooks = [h for h in self._hooks if h is not hook]
+
+    def clear(self):
+        """Remove all hooks"""
+        with self._lock:
+            self._hooks = []
+
+    def begin(self, name: str, **context) -> "OpenStage":
+        """
+        Start a stage that is ended explicitly, possibly from another thread.
+
+        Use ``stage`` for a stage that fits in one block; ``begin``/``end``
+        are for stages spanning several steps, such as a search whose fetch
+        and parse run in different pipeline workers.
+
+        Args:
+            name: Stage name
+            **context: Initial context values
+
+        Returns:
+            Handle to pass to ``end``; its ``context`` may be enriched meanwhile
+        """
+        registered = self._hooks
+        open_stage = OpenStage(name, context, registered)
+        if registered:
+            for hook in registered:
+                _call_hook(hook.on_stage_start, name, context)
+            open_stage.start = time.perf_counter()
+        return open_stage
+
+    def end(self, open_stage: "OpenStage", error: Optional[BaseException] = None):
+        """
+        Finish a stage started with ``begin``.
+
+        Args:
+            open_stage: Handle returned by ``begin``
+            error: Exception that ended the stage, if any
+        """
+        if not open_stage.hooks:
+            return
+        elapsed = time.perf_counter() - open_stage.start
+        for hook in open_stage.hooks:
+            _call_hook(hook.on_stage_end, open_stage.name, open_stage.context, elapsed, error)
+
+    @contextmanager
+    def stage(self, name: str, **context) -> Iterator[Dict[str, Any]]:
+        """
+        Run a block as a named pipeline stage.
+
+        Usage:
+            with hooks.stage("parse", query=query) as ctx:
+                items = parse_serp_news(response)
+                ctx["items"] = len(items)
+
+        Args:
+            name: Stage name
+            **context: Initial context values
+
+        Yields:
+            The context dictionary, which the block may enrich
+        """
+        if not self._hooks:
+            # Fast path: no hooks, no timing overhead
+            yield context
+            return
+
+        open_stage = self.begin(name, **context)
+        try:
+            yield open_stage.context
+        except BaseException as e:
+            self.end(open_stage, e)
+            raise
+        self.end(open_stage)
+
+class OpenStage:
+    """A stage started with ``HookManager.begin`` and not yet ended"""
+
+    __slots__ = ("name", "context", "hooks", "start")
+
+    def __init__(self, name: str, context: Dict[str, Any], registered: List[PipelineHook]):
+        self.name = name
+        self.context = context
+        self.hooks = registered
+        self.start = 0.0
+
+def _call_hook(callback, *args):
+    """Invoke a hook callback, never letting it break the pipeline"""
+    try:
+        callback(*args)
+    except Exception as e:
+        logger.warning(f"Pipeline hook {callback.__qualname__} failed: {e}")
+
+# Global hook registry
+hooks = HookManager()
+
+class StageProfiler(PipelineHook):
+    """
+    Built-in hook that aggregates a per-stage time breakdown
+    """
+
+    def __init__(self):
+        """Initialize empty statistics"""
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def on_stage_end(self, stage, context, elapsed, error=None):
+        with self._lock:
+            stats = self._stats.setdefault(stage, {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0})
+            stats["calls"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+            if error is not None:
+                stats["errors"] += 1
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the per-stage breakdown.
+
+        Returns:
+            Dictionary keyed by stage with calls, errors, total, mean and max seconds
+        """
+        with self._lock:
+            return {
+                stage: dict(stats, mean=stats["total"] / stats["calls"] if stats["calls"] else 0.0)
+                for stage, stats in self._stats.items()
+            }
+
+    def format_report(self) -> str:
+        """Render the breakdown as a text table ordered by pipeline stage"""
+        report = self.report()
+        order = PIPELINE_STAGES + sorted(set(report) - set(PIPELINE_STAGES))
+        lines = [
+            f"{'Stage':<14}{'Calls':>7}{'Errors':>8}{'Total(s)':>11}{'Mean(s)':>10}{'Max(s)':>10}",
+            "-" * 60
+        ]
+        for stage in order:
+            if stage not in report:
+                continue
+            s = report[stage]
+            lines.append(
+                f"{stage:<14}{s['calls']:>7}{s['errors']:>8}{s['total']:>11.3f}{s['mean']:>10.3f}{s['max']:>10.3f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        """Discard collected statistics"""
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,188 @@
+"""
+Resumable batch jobs
+Checkpoints every completed request so an interrupted multi-query run can resume
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+class BatchJob:
+    """
+    Job directory with a manifest, an append-only checkpoint log and per-request results.
+
+    Layout:
+        <job_dir>/manifest.json     Job name, parameters and creation time
+        <job_dir>/checkpoint.log    One JSON line per completed request
+        <job_dir>/results/<key>.json  Results of each completed request
+
+    A request is identified by a hash of its spec (query, country, ...),
+    so re-running the same job skips every request already in the log.
+    """
+
+    def __init__(self, job_dir: str, name: str = "job", params: Optional[Dict[str, Any]] = None):
+        """
+        Open or create a job.
+
+        Args:
+            job_dir: Job directory
+            name: Job name recorded in the manifest
+            params: Job parameters recorded in the manifest
+        """
+        self.job_dir = job_dir
+        self.results_dir = os.path.join(job_dir, "results")
+        self.manifest_path = os.path.join(job_dir, "manifest.json")
+        self.checkpoint_path = os.path.join(job_dir, "checkpoint.log")
+        self._lock = threading.Lock()
+        os.makedirs(self.results_dir, exist_ok=True)
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+            if self.manifest.get("name") != name:
+                logger.warning(f"Job directory {job_dir} belongs to job '{self.manifest.get('name')}', not '{name}'")
+        else:
+            self.manifest = {"name": name, "params": params or {}, "created_at": time.time()}
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2, default=str)
+
+        self.checkpoints = self._load_checkpoints()
+        if self.checkpoints:
+            logger.info(f"Resuming job '{name}': {len(self.checkpoints)} requests already completed")
+
+    def _load_checkpoints(self) -> Dict[str, Dict[str, Any]]:
+        """Read the checkpoint log, ignoring a torn last line from a crash"""
+        checkpoints = {}
+        if not os.path.exists(self.checkpoint_path):
+            return checkpoints
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.debug("Skipping incomplete checkpoint line")
+                    continue
+                if os.path.exists(os.path.join(self.job_dir, entry["output"])):
+                    checkpoints[entry["key"]] = entry
+        return checkpoints
+
+    @staticmethod
+    def request_key(spec: Dict[str, Any]) -> str:
+        """
+        Stable key for a request spec.
+
+        Args:
+            spec: Request parameters (query, country, language, num, ...)
+
+        Returns:
+            Hex digest
+        """
+        key_data = json.dumps(spec, sort_keys=True, default=str)
+        return hashlib.sha1(key_data.encode()).hexdigest()
+
+    def is_done(self, spec: Dict[str, Any], retry_empty: bool = True) -> bool:
+        """
+        Check whether a request has already been completed.
+
+        Args:
+            spec: Request parameters
+            retry_empty: Treat requests that returned no items as not done,
+                         since search() also returns [] on failure
+        """
+        entry = self.checkpoints.get(self.request_key(spec))
+        if entry is None:
+            return False
+        return not (retry_empty and entry["count"] == 0)
+
+    def get(self, spec: Dict[str, Any], retry_empty: bool = True) -> Optional[List[Dict]]:
+        """
+        Get the stored results of a completed request.
+
+        Returns:
+            Stored results, or None if the request still has to run
+        """
+        if not self.is_done(spec, retry_empty):
+            return None
+        entry = self.checkpoints[self.request_key(spec)]
+        with open(os.path.join(self.job_dir, entry["output"]), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def complete(self, spec: Dict[str, Any], results: List[Dict]) -> str:
+        """
+        Store results and append the request to the checkpoint log.
+
+        Args:
+            spec: Request parameters
+            results: Items returned for the request
+
+        Returns:
+            Path of the stored results
+        """
+        key = self.request_key(spec)
+        output = os.path.join("results", f"{key}.json")
+        path = os.path.join(self.job_dir, output)
+        # Crawl workers in several processes may share one job directory
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        entry = {"key": key, "spec": spec, "output": output, "count": len(results), "completed_at": time.time()}
+        with self._lock:
+            with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.checkpoints[key] = entry
+        return path
+
+    def run(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        search_fn: Callable[[Dict[str, Any]], List[Dict]],
+        retry_empty: bool = True
+    ) -> Iterator[Tuple[Dict[str, Any], List[Dict], bool]]:
+        """
+        Run every spec that is not yet completed, checkpointing as it goes.
+
+        Results are yielded as each spec is done, so callers can stream
+        them (e.g. to a partition file) instead of holding the whole run.
+
+        Args:
+            specs: Request specs
+            search_fn: Function executing one spec and returning its items
+            retry_empty: Re-run requests that previously returned no items
+
+        Yields:
+            Tuples of (spec, results, resumed) in spec order, where resumed
+            is True for results read back from a previous run
+        """
+        skipped = 0
+        total = 0
+        for spec in specs:
+            total += 1
+            results = self.get(spec, retry_empty)
+            if results is None:
+                results = search_fn(spec)
+                self.complete(spec, results)
+                yield spec, results, False
+            else:
+                skipped += 1
+                yield spec, results, True
+        if skipped:
+            logger.info(f"Skipped {skipped}/{total} requests completed in a previous run")
+
+    def summary(self) -> Dict[str, int]:
+        """Get completed and empty request counts"""
+        with self._lock:
+            entries = list(self.checkpoints.values())
+        return {
+            "completed": len(entries),
+            "empty": sum(1 for e in entries if e["count"] == 0),
+            "items": sum(e["count"] for e in entries)
+        }
@@ -0,0 +1,370 @@
+"""
+In-process metrics registry
+Counters and latency histograms exportable as Prometheus text or JSON
+"""
+import os
+import json
+import math
+import bisect
+import logging
+import weakref
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Number of recent observations kept per label set for percentiles
+SAMPLE_WINDOW = 10000
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Normalize label keyword arguments into a hashable key"""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _escape_label_value(value: str) -> str:
+    """Escape backslash, double quote and newline as the exposition format requires"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Format a label key in Prometheus exposition syntax"""
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+
+    def __init__(self, name: str, help_text: str = ""):
+        """
+        Initialize counter.
+
+        Args:
+            name: Metric name
+            help_text: Description shown in Prometheus output
+        """
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._collectors: List[Callable[[], Optional[Callable]]] = []
+        self._lock = threading.Lock()
+
+    def add_collector(self, collect: Callable[[], Dict[LabelKey, float]]):
+        """
+        Register a source of counts kept outside the counter.
+
+        ``collect`` returns ``{label_key: value}`` (keys built like
+        ``_label_key``) and is added to the counter's own values whenever it
+        is read or exported. Hot paths can count under their own locks this
+        way instead of contending on the counter lock. A bound method is
+        held weakly, so registering does not keep its owner alive.
+
+        Args:
+            collect: Callable returning current counts
+        """
+        ref = weakref.WeakMethod(collect) if hasattr(collect, "__self__") else (lambda: collect)
+        with self._lock:
+            self._collectors.append(ref)
+
+    def _collected(self) -> Dict[LabelKey, float]:
+        """Own values plus those of live collectors"""
+        with self._lock:
+            collectors = list(self._collectors)
+        merged: Dict[LabelKey, float] = {}
+        dead = []
+        for ref in collectors:
+            collect = ref()
+            if collect is None:
+                dead.append(ref)
+                continue
+            for key, value in collect().items():
+                merged[key] = merged.get(key, 0) + value
+        with self._lock:
+            for ref in dead:
+                self._collectors.remove(ref)
+            for key, value in self._values.items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        Increment the counter.
+
+        Args:
+            amount: Increment (default: 1)
+            **labels: Label values
+        """
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Get the current value for a label set"""
+        return self._collected().get(_label_key(labels), 0)
+
+    def total(self) -> float:
+        """Get the sum across all label sets"""
+        return sum(self._collected().values())
+
+    def snapshot(self) -> List[Dict]:
+        """Get all label sets and values"""
+        return [{"labels": dict(key), "value": value} for key, value in self._collected().items()]
+
+    def to_prometheus(self) -> List[str]:
+        """Render Prometheus exposition lines"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._collected().items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+class Histogram:
+    """
+    Histogram with cumulative buckets plus a sliding sample window for percentiles
+    """
+
+    def __init__(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize histogram.
+
+        Args:
+            name: Metric name
+            help_text: Description shown in Prometheus output
+            buckets: Upper bounds of the buckets (ascending)
+        """
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _get_series(self, key: LabelKey) -> Dict[str, Any]:
+        """Get or create the state for a label set (caller holds the lock)"""
+        series = self._series.get(key)
+        if series is None:
+            series = {
+                "counts": [0] * (len(self.buckets) + 1),
+                "sum": 0.0,
+                "count": 0,
+                "samples": deque(maxlen=SAMPLE_WINDOW)
+            }
+            self._series[key] = series
+        return series
+
+    def observe(self, value: float, **labels):
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (seconds for latencies)
+            **labels: Label values
+        """
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._get_series(key)
+            series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["samples"].append(value)
+
+    def percentile(self, q: float, **labels) -> Optional[float]:
+        """
+        Get a percentile over the recent sample window.
+
+        Args:
+            q: Percentile between 0 and 100
+            **labels: Label values
+
+        Returns:
+            Percentile value, or None if nothing was observed
+        """
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            samples = sorted(series["samples"]) if series else []
+        return _percentile(samples, q)
+
+    def snapshot(self) -> List[Dict]:
+        """Get count, sum and p50/p95/p99 for every label set"""
+        with self._lock:
+            data = [(key, series["count"], series["sum"], sorted(series["samples"]))
+                    for key, series in self._series.items()]
+        return [
+            {
+                "labels": dict(key),
+                "count": count,
+                "sum": total,
+                "p50": _percentile(samples, 50),
+                "p95": _percentile(samples, 95),
+                "p99": _percentile(samples, 99)
+            }
+            for key, count, total, samples in data
+        ]
+
+    def to_prometheus(self) -> List[str]:
+        """Render Prometheus exposition lines"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["counts"]):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']:g}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+def _percentile(samples: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of a sorted list"""
+    if not samples:
+        return None
+    rank = max(0, min(len(samples) - 1, math.ceil(q / 100 * len(samples)) - 1))
+    return samples[rank]
+
+class MetricsRegistry:
+    """
+    Registry of named counters and histograms
+    """
+
+    def __init__(self, prefix: str = "gnews"):
+        """
+        Initialize registry.
+
+        Args:
+            prefix: Prefix added to every metric name
+        """
+        self.prefix = prefix
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kwargs):
+        """Return the named metric, creating it on first use"""
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = cls(full_name, help_text, **kwargs)
+                self._metrics[full_name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {full_name} already registered as {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        """Get or create a counter"""
+        return self._get_or_create(Counter, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a JSON-serializable snapshot of all metrics.
+
+        Returns:
+            Dictionary with "counters" and "histograms" keyed by metric name
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            "counters": {m.name: m.snapshot() for m in metrics if isinstance(m, Counter)},
+            "histograms": {m.name: m.snapshot() for m in metrics if isinstance(m, Histogram)}
+        }
+
+    def to_json(self) -> str:
+        """Render the snapshot as JSON"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.to_prometheus())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Reset all metric values (registered metrics stay valid; counts kept by collectors are not reset)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            with metric._lock:
+                if isinstance(metric, Counter):
+                    metric._values.clear()
+                else:
+                    metric._series.clear()
+
+# Global metrics registry
+metrics = MetricsRegistry()
+
+def save_metrics(filepath: str, registry: Optional[MetricsRegistry] = None):
+    """
+    Write a metrics dump to a file.
+
+    Args:
+        filepath: Target path; ``.prom``/``.txt`` writes Prometheus text, anything else JSON
+        registry: Registry to dump (default: global registry)
+    """
+    registry = registry or metrics
+    text = registry.to_prometheus() if filepath.endswith((".prom", ".txt")) else registry.to_json()
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def start_metrics_server(
+    port: int = 9108,
+    host: str = "127.0.0.1",
+    registry: Optional[MetricsRegistry] = None
+) -> ThreadingHTTPServer:
+    """
+    Serve metrics over HTTP in a background thread.
+
+    ``/metrics`` returns Prometheus text, ``/metrics.json`` a JSON snapshot.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+        registry: Registry to expose (default: global registry)
+
+    Returns:
+        The running server (call ``shutdown()`` to stop it)
+    """
+    registry = registry or metrics
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = registry.to_prometheus().encode("utf-8")
+                content_type = "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body = registry.to_json().encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"Metrics server: {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,192 @@
+"""
+Negative caching
+Remembers queries that returned nothing or failed, and backs them off exponentially
+"""
+import time
+import logging
+import threading
+from typing import Dict, Optional, Any
+from .config import NEGATIVE_CACHE_CONFIG
+from .metrics import metrics
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+NEGATIVE_HITS = metrics.counter("negative_cache_hits_total", "Searches skipped by the negative cache, by kind")
+
+# Failure classes (plus "empty" for searches that succeeded with no results)
+FAILURE_CLASSES = ["auth", "quota", "rate_limited", "bad_request", "server", "network", "other"]
+
+# Failures that retrying the same call cannot fix
+PERMANENT_FAILURES = {"auth", "quota", "bad_request"}
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """HTTP status carried by an exception, if any"""
+    for candidate in (getattr(exc, "status_code", None), getattr(exc, "status", None),
+                      getattr(getattr(exc, "response", None), "status_code", None)):
+        if isinstance(candidate, int):
+            return candidate
+    return None
+
+def classify_failure(exc: Exception) -> str:
+    """
+    Classify a failed API call.
+
+    Uses the exception's own ``failure_class`` attribute if it declares
+    one, then the HTTP status attached to it, otherwise the exception type
+    and message.
+
+    Returns:
+        One of FAILURE_CLASSES
+    """
+    declared = getattr(exc, "failure_class", None)
+    if declared in FAILURE_CLASSES:
+        return declared
+    status = _status_code(exc)
+    text = str(exc).lower()
+    if status in (401, 403) or any(s in text for s in ("unauthorized", "forbidden", "invalid token", "authentication")):
+        return "auth"
+    if status == 402 or any(s in text for s in ("quota", "insufficient balance", "credits exhausted")):
+        return "quota"
+    if status == 429 or any(s in text for s in ("rate limit", "too many requests")):
+        return "rate_limited"
+    if status in (400, 404, 422) or any(s in text for s in ("bad request", "invalid parameter")):
+        return "bad_request"
+    if status is not None and 500 <= status < 600:
+        return "server"
+    if isinstance(exc, (TimeoutError, ConnectionError)) or any(s in text for s in ("timed out", "timeout", "connection")):
+        return "network"
+    return "other"
+
+def is_permanent_failure(exc: Exception) -> bool:
+    """Whether retrying a call that raised this exception is pointless"""
+    return classify_failure(exc) in PERMANENT_FAILURES
+
+class NegativeCache:
+    """
+    Per-request memory of empty results and failures.
+
+    Each consecutive negative outcome of a request extends its entry: the
+    TTL starts at the kind's base TTL and is multiplied by
+    ``backoff_factor`` for every repeat, up to ``max_ttl``. A successful
+    search with results clears the entry. While an entry is live, searches
+    of that request are answered without calling the API.
+    """
+
+    def __init__(
+        self,
+        empty_ttl: float = NEGATIVE_CACHE_CONFIG["empty_ttl"],
+        failure_ttls: Optional[Dict[str, float]] = None,
+        backoff_factor: float = NEGATIVE_CACHE_CONFIG["backoff_factor"],
+        max_ttl: float = NEGATIVE_CACHE_CONFIG["max_ttl"]
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            empty_ttl: Base TTL in seconds for searches that returned no results
+            failure_ttls: Base TTL per failure class (default: NEGATIVE_CACHE_CONFIG)
+            backoff_factor: TTL multiplier per consecutive negative outcome
+            max_ttl: Upper bound for any TTL
+        """
+        self.ttls = dict(NEGATIVE_CACHE_CONFIG["failure_ttls"], **(failure_ttls or {}), empty=empty_ttl)
+        self.backoff_factor = backoff_factor
+        self.max_ttl = max_ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the live entry of a request.
+
+        Returns:
+            Dict with kind, reason, count (consecutive negatives), since
+            (first negative) and until (expiry), or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() >= entry["until"]:
+                return None
+            return dict(entry)
+
+    def hit(self, key: str, include_empty: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Look up a request before calling the API, counting hits in metrics.
+
+        Args:
+            key: Request fingerprint
+            include_empty: Whether empty-result entries count (they are
+                           skipped for no_cache searches)
+
+        Returns:
+            Live entry, or None if the API should be called
+        """
+        entry = self.get(key)
+        if entry is None or (entry["kind"] == "empty" and not include_empty):
+            return None
+        NEGATIVE_HITS.inc(kind=entry["kind"])
+        return entry
+
+    def _record(self, key: str, kind: str, reason: str) -> Dict[str, Any]:
+        """Add or extend an entry"""
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(key)
+            # Repeats within twice the last TTL count as consecutive
+            consecutive = previous is not None and now < previous["until"] + (previous["until"] - previous["at"])
+            count = previous["count"] + 1 if consecutive else 1
+            ttl = min(self.ttls.get(kind, self.ttls["other"]) * self.backoff_factor ** (count - 1), self.max_ttl)
+            entry = {
+                "kind": kind,
+                "reason": reason,
+                "count": count,
+                "since": previous["since"] if consecutive else now,
+                "at": now,
+                "until": now + ttl
+            }
+            self._entries[key] = entry
+            if len(self._entries) > NEGATIVE_CACHE_CONFIG["max_entries"]:
+                self._prune(now)
+        logger.debug(f"Negative-cached request ({kind}, #{count}) for {ttl:.0f}s")
+        return dict(entry)
+
+    def _prune(self, now: float):
+        """Drop entries past their consecutive-repeat window (caller holds the lock)"""
+        stale = [k for k, e in self._entries.items() if now >= e["until"] + (e["until"] - e["at"])]
+        for key in stale:
+            del self._entries[key]
+
+    def record_empty(self, key: str) -> Dict[str, Any]:
+        """Remember that a request returned no results"""
+        return self._record(key, "empty", "no results")
+
+    def record_failure(self, key: str, exc: Exception) -> Dict[str, Any]:
+        """
+        Remember that a request failed.
+
+        Returns:
+            The entry, whose kind is the failure class
+        """
+        return self._record(key, classify_failure(exc), str(exc))
+
+    def record_success(self, key: str):
+        """Clear a request's entry after it returned results"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Forget all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Count live entries by kind"""
+        now = time.time()
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for entry in self._entries.values():
+                if now < entry["until"]:
+                    counts[entry["kind"]] = counts.get(entry["kind"], 0) + 1
+        return counts
+
+# Process-wide negative cache used by every scraper unless one is passed in
+negative_cache = NegativeCache()
@@ -0,0 +1,331 @@
+"""
+Streaming search pipeline
+Overlaps API fetches, response parsing and export writes with bounded queues between the stages
+"""
+import csv
+import json
+import time
+import hashlib
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .config import EXPORT_FIELDS, PIPELINE_CONFIG
+from .compression import open_output
+from .utils import save_to_csv, save_to_json, SearchResult
+from .jobs import BatchJob
+from .cancellation import CancelToken, OperationCancelled
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Queue sentinel telling a worker its upstream stage is finished
+_DONE = object()
+
+class JsonlSink:
+    """Writes each item as one JSON line, tagged with its query/country/language"""
+
+    def __init__(self, path: str, compression: Optional[str] = None):
+        """
+        Open the output file.
+
+        Args:
+            path: Output path (including any compression suffix)
+            compression: None, "gz" or "zst"
+        """
+        self.path = path
+        self._file = open_output(path, compression, encoding="utf-8")
+
+    def write(self, spec: Dict[str, Any], items: List[Dict]):
+        """Append the items of one search"""
+        for item in items:
+            record = dict(item, query=spec["query"], country=spec["country"], language=spec["language"])
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        """Flush and close the file"""
+        self._file.close()
+
+class CsvSink:
+    """Writes items as CSV rows (EXPORT_FIELDS plus query, country and language)"""
+
+    def __init__(self, path: str, compression: Optional[str] = None, fields: Optional[List[str]] = None):
+        """
+        Open the output file and write the header.
+
+        Args:
+            path: Output path (including any compression suffix)
+            compression: None, "gz" or "zst"
+            fields: Item columns (default: EXPORT_FIELDS)
+        """
+        self.path = path
+        self._file = open_output(path, compression, encoding="utf-8-sig", newline="")
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=(fields or EXPORT_FIELDS) + ["query", "country", "language"], extrasaction="ignore"
+        )
+        self._writer.writeheader()
+
+    def write(self, spec: Dict[str, Any], items: List[Dict]):
+        """Append the items of one search"""
+        for item in items:
+            self._writer.writerow(dict(item, query=spec["query"], country=spec["country"], language=spec["language"]))
+
+    def close(self):
+        """Flush and close the file"""
+        self._file.close()
+
+class QueryFileSink:
+    """Writes the items of each search to its own JSON or CSV file in the output directory"""
+
+    def __init__(self, fmt: str = "json", compression: Optional[str] = None):
+        """
+        Initialize sink.
+
+        Args:
+            fmt: "json" or "csv"
+            compression: None, "gz" or "zst"
+        """
+        self.fmt = fmt
+        self.compression = compression
+        self.paths: List[str] = []
+
+    @staticmethod
+    def filename(spec: Dict[str, Any], fmt: str) -> str:
+        """
+        File name for one search: a readable label plus a short hash of the
+        full spec, so specs differing only in language, limit or characters
+        lost to sanitizing or truncation never share a file.
+        """
+        label = f"{spec['query']}_{spec['country']}_{spec.get('language') or 'auto'}"
+        safe_label = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in label).replace(' ', '_')
+        digest = hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()[:8]
+        return f"news_{safe_label[:50]}_{digest}.{fmt}"
+
+    def write(self, spec: Dict[str, Any], items: List[Dict]):
+        """Save the items of one search (nothing is written for empty results)"""
+        if not items:
+            return
+        save = save_to_csv if self.fmt == "csv" else save_to_json
+        path = save(items, self.filename(spec, self.fmt), compression=self.compression)
+        if path:
+            self.paths.append(path)
+
+    def close(self):
+        """Nothing to close: every file is written in full by ``write``"""
+
+class Pipeline:
+    """
+    Producer/consumer search pipeline.
+
+    Fetch workers pull query specs, look them up and call the API; parse
+    workers turn raw responses into results (parse, thumbnails,
+    cache/archive/index updates); one writer thread hands results to the
+    sinks. Each search goes through the scraper's ``begin_search``,
+    ``lookup``, ``fetch``, ``process`` and ``fail`` steps, so it emits the
+    same hook stages and metrics as ``search()``. Stages are connected by
+    bounded queues, so a slow stage blocks the ones before it and at most
+    ``queue_size`` responses and result lists are held between stages,
+    however many specs are processed. Specs are consumed lazily, so they
+    may come from a generator.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        sinks: List[Any],
+        fetch_workers: int = PIPELINE_CONFIG["fetch_workers"],
+        parse_workers: int = PIPELINE_CONFIG["parse_workers"],
+        queue_size: int = PIPELINE_CONFIG["queue_size"],
+        default_num: int = 20,
+        default_country: str = "us",
+        no_cache: bool = False,
+        cancel_token: Optional[CancelToken] = None,
+        max_age: Optional[float] = None,
+        on_result: Optional[Callable[[Dict[str, Any], Any, float], None]] = None,
+        job: Optional[BatchJob] = None
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            scraper: GoogleNewsScraper used for lookups, fetches and parsing
+            sinks: Objects with ``write(spec, items)`` and ``close()``
+                   (e.g. JsonlSink, CsvSink); closed when the run ends
+            fetch_workers: Threads calling the API
+            parse_workers: Threads parsing responses
+            queue_size: Capacity of each inter-stage queue
+            default_num: Results per query when a spec has no limit
+            default_country: Country when a spec has none
+            no_cache: Bypass the scraper's cache
+            cancel_token: Stop taking new specs once cancelled
+            max_age: Freshness tolerance passed to the scraper's lookup
+            on_result: Called from the writer thread after the sinks with
+                       (spec, SearchResult, seconds) for every finished
+                       search, including negative, refused and failed ones
+            job: Checkpoint every search with results in this BatchJob,
+                 keyed on the normalized spec; specs it already completed
+                 are answered from it (source "job") without searching
+        """
+        self.scraper = scraper
+        self.sinks = sinks
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.default_num = default_num
+        self.default_country = default_country
+        self.no_cache = no_cache
+        self.cancel_token = cancel_token or CancelToken()
+        self.max_age = max_age
+        self.on_result = on_result
+        self.job = job
+
+    def _normalize(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in defaults for a query spec"""
+        return {
+            "query": spec["query"],
+            "num": spec.get("limit") or spec.get("num") or self.default_num,
+            "country": spec.get("country") or self.default_country,
+            "language": spec.get("language"),
+            "device": spec.get("device")
+        }
+
+    def run(self, specs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Process query specs (dicts with query and optional limit/num,
+        country, language, device) and write every result to the sinks.
+
+        Returns:
+            Summary with queries (written), items, empty, failed
+            ([{query, country, error}], including refused calls), stored
+            (answered from cache/archive), negative (skipped by the negative
+            cache, not written), resumed (answered from the job), elapsed,
+            peak queue depths and whether the run was cancelled
+        """
+        start = time.time()
+        specs = iter(specs)
+        spec_lock = threading.Lock()
+        stats_lock = threading.Lock()
+        fetched = queue.Queue(maxsize=self.queue_size)
+        parsed = queue.Queue(maxsize=self.queue_size)
+        stats = {"queries": 0, "items": 0, "empty": 0, "stored": 0, "negative": 0, "resumed": 0, "failed": [], "peak_fetched": 0, "peak_parsed": 0}
+
+        def put(q: queue.Queue, value, peak_key: str):
+            q.put(value)
+            with stats_lock:
+                stats[peak_key] = max(stats[peak_key], q.qsize())
+
+        def fail(spec, error):
+            with stats_lock:
+                stats["failed"].append({"query": spec["query"], "country": spec["country"], "error": error})
+
+        def next_spec():
+            with spec_lock:
+                if self.cancel_token.cancelled:
+                    return None
+                return next(specs, None)
+
+        def fetch_worker():
+            scraper = self.scraper
+            with self.cancel_token.bind():
+                while True:
+                    raw = next_spec()
+                    if raw is None:
+                        return
+                    spec = self._normalize(raw)
+                    if self.job is not None:
+                        stored = self.job.get(spec)
+                        if stored is not None:
+                            put(parsed, (spec, None, SearchResult(stored, source="job")), "peak_parsed")
+                            continue
+                    pending = scraper.begin_search(
+                        spec["query"], spec["num"], spec["country"], spec["language"], spec["device"],
+                        self.no_cache, self.max_age
+                    )
+                    try:
+                        try:
+                            stored = scraper.lookup(pending)
+                            if stored is None:
+                                put(fetched, (spec, pending, scraper.fetch(pending)), "peak_fetched")
+                                continue
+                        except Exception as e:
+                            stored = scraper.fail(pending, e)
+                    except OperationCancelled:
+                        return
+                    put(parsed, (spec, pending, stored), "peak_parsed")
+
+        def parse_worker():
+            scraper = self.scraper
+            while True:
+                entry = fetched.get()
+                if entry is _DONE:
+                    return
+                spec, pending, response = entry
+                try:
+                    results = scraper.process(pending, response)
+                except Exception as e:
+                    results = scraper.fail(pending, e)
+                put(parsed, (spec, pending, results), "peak_parsed")
+
+        def sink_writer():
+            while True:
+                entry = parsed.get()
+                if entry is _DONE:
+                    return
+                spec, pending, results = entry
+                source = results.metadata["source"]
+                if source in ("error", "refused"):
+                    fail(spec, results.metadata.get("reason") or source)
+                elif source == "negative":
+                    with stats_lock:
+                        stats["negative"] += 1
+                else:
+                    for sink in self.sinks:
+                        try:
+                            sink.write(spec, results)
+                        except Exception as e:
+                            logger.error(f"Pipeline sink {type(sink).__name__} failed for '{spec['query']}': {e}")
+                            fail(spec, f"sink: {e}")
+                    with stats_lock:
+                        stats["queries"] += 1
+                        stats["items"] += len(results)
+                        stats["empty"] += 0 if results else 1
+                        stats["stored"] += 1 if source in ("cache", "archive") else 0
+                        stats["resumed"] += 1 if source == "job" else 0
+                    if self.job is not None and source != "job":
+                        try:
+                            self.job.complete(spec, results)
+                        except OSError as e:
+                            logger.error(f"Pipeline checkpoint failed for '{spec['query']}': {e}")
+                            fail(spec, f"checkpoint: {e}")
+                if self.on_result is not None:
+                    try:
+                        self.on_result(spec, results, pending.elapsed if pending is not None else 0.0)
+                    except Exception as e:
+                        logger.error(f"Pipeline result callback failed for '{spec['query']}': {e}")
+
+        fetchers = [threading.Thread(target=fetch_worker, name=f"pipeline-fetch-{i}", daemon=True)
+                    for i in range(self.fetch_workers)]
+        parsers = [threading.Thread(target=parse_worker, name=f"pipeline-parse-{i}", daemon=True)
+                   for i in range(self.parse_workers)]
+        writer = threading.Thread(target=sink_writer, name="pipeline-sink", daemon=True)
+        for thread in fetchers + parsers + [writer]:
+            thread.start()
+
+        try:
+            # Shut stages down in order: each sees end-of-input only after its producers finished
+            for thread in fetchers:
+                thread.join()
+            for _ in parsers:
+                fetched.put(_DONE)
+            for thread in parsers:
+                thread.join()
+            parsed.put(_DONE)
+            writer.join()
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+        stats["elapsed"] = time.time() - start
+        stats["cancelled"] = self.cancel_token.reason if self.cancel_token.cancelled else None
+        logger.info(f"Pipeline processed {stats['queries']} queries ({stats['items']} items, "
+                    f"{len(stats['failed'])} failed) in {stats['elapsed']:.2f}s")
+        return stats
@@ -0,0 +1,143 @@
+"""
+Keyword planner
+Orders and sizes multi-keyword searches by each keyword's historical unique yield
+"""
+import os
+import json
+import math
+import logging
+import threading
+from typing import List, Dict, Optional, Any
+from .config import PLANNER_CONFIG
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+class KeywordPlanner:
+    """
+    Budget-aware planner for briefings built from several overlapping keywords.
+
+    For each keyword it tracks how many results were requested and how many
+    of the returned articles were new to the briefing at that point (its
+    unique yield). Keywords are searched best-yield first, each asks for
+    just enough results to fill the remaining target at its expected yield,
+    and the caller stops as soon as the target is reached.
+
+    Statistics persist as JSON so every run plans with the history of the
+    previous ones.
+    """
+
+    def __init__(
+        self,
+        keywords: List[str],
+        stats_path: Optional[str] = PLANNER_CONFIG["stats_path"],
+        prior_yield: float = PLANNER_CONFIG["prior_yield"],
+        prior_weight: float = PLANNER_CONFIG["prior_weight"],
+        min_num: int = PLANNER_CONFIG["min_num"],
+        max_num: int = PLANNER_CONFIG["max_num"]
+    ):
+        """
+        Initialize planner.
+
+        Args:
+            keywords: Candidate keywords, in fallback order
+            stats_path: JSON file for persisted statistics (None keeps them in memory)
+            prior_yield: Expected unique yield of a keyword without history
+            prior_weight: Weight of the prior, in requested results
+            min_num: Smallest per-keyword result count
+            max_num: Largest per-keyword result count
+        """
+        self.keywords = list(keywords)
+        self.stats_path = stats_path
+        self.prior_yield = prior_yield
+        self.prior_weight = prior_weight
+        self.min_num = min_num
+        self.max_num = max_num
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, int]]:
+        """Read persisted statistics, starting empty if missing or unreadable"""
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring keyword stats in {self.stats_path}: {e}")
+            return {}
+
+    def save(self):
+        """Persist statistics (atomic replace)"""
+        if not self.stats_path:
+            return
+        directory = os.path.dirname(self.stats_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = json.dumps(self.stats, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp_path = f"{self.stats_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.stats_path)
+
+    def expected_yield(self, keyword: str) -> float:
+        """
+        Estimate new unique articles per requested result.
+
+        Args:
+            keyword: Keyword
+
+        Returns:
+            Smoothed yield between 0 and 1
+        """
+        with self._lock:
+            entry = self.stats.get(keyword, {})
+        requested = entry.get("requested", 0)
+        unique = entry.get("unique", 0)
+        return (unique + self.prior_yield * self.prior_weight) / (requested + self.prior_weight)
+
+    def order(self) -> List[str]:
+        """Get keywords sorted by expected yield (ties keep the fallback order)"""
+        return sorted(self.keywords, key=self.expected_yield, reverse=True)
+
+    def allocate(self, keyword: str, remaining: int) -> int:
+        """
+        Choose how many results to request for a keyword.
+
+        Args:
+            keyword: Keyword about to be searched
+            remaining: Unique articles still needed
+
+        Returns:
+            Result count, between min_num and max_num
+        """
+        expected = max(self.expected_yield(keyword), 0.05)
+        return max(self.min_num, min(self.max_num, math.ceil(remaining / expected)))
+
+    def record(self, keyword: str, requested: int, returned: int, unique: int):
+        """
+        Record the outcome of one keyword search.
+
+        Args:
+            keyword: Keyword searched
+            requested: Results requested
+            returned: Results returned
+            unique: Returned results not already in the briefing
+        """
+        with self._lock:
+            entry = self.stats.setdefault(keyword, {"calls": 0, "requested": 0, "returned": 0, "unique": 0})
+            entry["calls"] += 1
+            entry["requested"] += requested
+            entry["returned"] += returned
+            entry["unique"] += unique
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Get per-keyword statistics with expected yield, best first"""
+        rows = []
+        for keyword in self.order():
+            with self._lock:
+                entry = dict(self.stats.get(keyword, {"calls": 0, "requested": 0, "returned": 0, "unique": 0}))
+            entry["keyword"] = keyword
+            entry["expected_yield"] = round(self.expected_yield(keyword), 3)
+            rows.append(entry)
+        return rows
@@ -0,0 +1,74 @@
+"""
+Rate limiting
+Thread-safe token bucket shared by all searches of a process (or of a crawl via a coordinator)
+"""
+import time
+import threading
+from typing import Optional
+
+class RateLimiter:
+    """
+    Token bucket rate limiter
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize limiter.
+
+        Args:
+            rate: Sustained rate in requests per second
+            burst: Bucket capacity (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add tokens earned since the last update (caller holds the lock)"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take tokens without waiting.
+
+        Returns:
+            True if the tokens were available
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            tokens: Number of tokens (default: 1)
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if acquired, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
@@ -0,0 +1,161 @@
+"""
+Record/replay of raw SERP responses
+Capture live serp_search_advanced responses to disk and serve them back offline
+"""
+import os
+import json
+import glob
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional, Any
+from .cancellation import current_token
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# SerpRequest fields that identify a recording
+REQUEST_FIELDS = ["query", "engine", "num", "country", "language", "device"]
+
+class ReplayMissError(LookupError):
+    """Raised when no recording matches a request in strict replay mode"""
+
+    # Replaying the same request cannot succeed, so it is not retried
+    failure_class = "bad_request"
+
+def request_fields(req) -> Dict[str, Any]:
+    """Extract the identifying fields of a SerpRequest-like object"""
+    return {field: getattr(req, field, None) for field in REQUEST_FIELDS}
+
+def request_fingerprint(req) -> str:
+    """
+    Stable fingerprint of a SERP request, used as the recording file name.
+
+    Args:
+        req: SerpRequest-like object
+
+    Returns:
+        Hex digest
+    """
+    key_data = json.dumps(request_fields(req), sort_keys=True, default=str)
+    return hashlib.sha1(key_data.encode()).hexdigest()
+
+class RecordingClient:
+    """
+    Client wrapper that saves every successful response to a directory
+    """
+
+    def __init__(self, client, directory: str):
+        """
+        Initialize recording client.
+
+        Args:
+            client: Real client exposing ``serp_search_advanced``
+            directory: Directory for recordings (one JSON file per request)
+        """
+        self.client = client
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def serp_search_advanced(self, req) -> Dict:
+        """Call the wrapped client and record the response with its latency"""
+        start = time.time()
+        response = self.client.serp_search_advanced(req)
+        latency = time.time() - start
+
+        record = {
+            "request": request_fields(req),
+            "latency": latency,
+            "recorded_at": time.time(),
+            "response": response
+        }
+        filepath = os.path.join(self.directory, f"{request_fingerprint(req)}.json")
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, filepath)
+        logger.debug(f"Recorded response for '{record['request']['query']}' to {filepath}")
+        return response
+
+    def __getattr__(self, name):
+        # Delegate everything else (e.g. close) to the wrapped client
+        return getattr(self.client, name)
+
+class ReplayClient:
+    """
+    Offline client that serves recorded responses with their recorded latency
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        latency_scale: float = 1.0,
+        strict: bool = True,
+        seed: Optional[int] = None,
+        fallback_client=None
+    ):
+        """
+        Initialize replay client.
+
+        Args:
+            directory: Directory written by RecordingClient
+            latency_scale: Multiplier for recorded latencies (0 disables sleeping)
+            strict: Raise ReplayMissError for unrecorded requests; if False,
+                    serve a random recording instead (logging a warning for
+                    each substituted request), e.g. for load tests with
+                    arbitrary queries
+            seed: Random seed for picking fallback recordings
+            fallback_client: Live client exposing ``serp_search_advanced``
+                             that unrecorded requests are passed to (takes
+                             precedence over ``strict``)
+
+        Raises:
+            ValueError: If the directory contains no recordings
+        """
+        self.directory = directory
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.fallback_client = fallback_client
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.recordings: Dict[str, Dict] = {}
+
+        for filepath in glob.glob(os.path.join(directory, "*.json")):
+            with open(filepath, "r", encoding="utf-8") as f:
+                self.recordings[os.path.splitext(os.path.basename(filepath))[0]] = json.load(f)
+        if not self.recordings:
+            raise ValueError(f"No recordings found in {directory}")
+        self._keys = sorted(self.recordings)
+        logger.info(f"Loaded {len(self.recordings)} recorded responses from {directory}")
+
+    def serp_search_advanced(self, req) -> Dict:
+        """
+        Serve the recording for a request, sleeping for its recorded latency.
+
+        The sleep is cut short if the calling thread's operation is cancelled.
+
+        Raises:
+            ReplayMissError: If no recording matches in strict mode (without a fallback client)
+            OperationCancelled: If the operation is cancelled during the delay
+        """
+        record = self.recordings.get(request_fingerprint(req))
+        if record is None:
+            if self.fallback_client is not None:
+                logger.debug(f"No recording for {request_fields(req)}, calling the fallback client")
+                return self.fallback_client.serp_search_advanced(req)
+            if self.strict:
+                raise ReplayMissError(f"No recording for request: {request_fields(req)}")
+            with self._lock:
+                key = self._random.choice(self._keys)
+            record = self.recordings[key]
+            logger.warning(f"No recording for {request_fields(req)}, serving recording {key} instead")
+
+        delay = record.get("latency", 0) * self.latency_scale
+        if delay > 0:
+            token = current_token()
+            if token is not None:
+                token.sleep(delay)
+            else:
+                time.sleep(delay)
+        return record["response"]
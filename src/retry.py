@@ -6,6 +6,9 @@ import time
 import logging
 from typing import Callable, TypeVar, Optional
 from functools import wraps
+from .metrics import metrics
+from .cancellation import OperationCancelled, current_token
+from .budget import BudgetExceeded
 
 logger = logging.getLogger("GoogleNewsScraper")
 
@@ -16,7 +19,8 @@ def retry_with_backoff(
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
     max_delay: float = 60.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    give_up: Optional[Callable[[Exception], bool]] = None
 ):
     """
     Decorator for retrying functions with exponential backoff.
@@ -27,10 +31,15 @@ def retry_with_backoff(
         backoff_factor: Multiplier for delay between retries
         max_delay: Maximum delay in seconds
         exceptions: Tuple of exceptions to catch and retry on
+        give_up: Predicate for caught exceptions that must not be retried
+                 (e.g. authentication errors); they are re-raised at once
     
     Returns:
         Decorated function with retry logic
     """
+    retries = metrics.counter("retries_total", "Retries by attempt number that failed")
+    exhausted = metrics.counter("retries_exhausted_total", "Calls that failed after all attempts")
+    
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
@@ -40,17 +49,30 @@ def retry_with_backoff(
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
+                except (OperationCancelled, BudgetExceeded):
+                    raise
                 except exceptions as e:
                     last_exception = e
+                    if give_up is not None and give_up(e):
+                        exhausted.inc(func=func.__name__)
+                        logger.error(f"Attempt {attempt + 1} failed with a non-retryable error: {e}")
+                        raise
                     if attempt < max_retries:
+                        retries.inc(func=func.__name__, attempt=attempt + 1)
                         wait_time = min(delay, max_delay)
                         logger.warning(
                             f"Attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
                             f"Retrying in {wait_time:.1f}s..."
                         )
-                        time.sleep(wait_time)
+                        # Wake up early if the calling operation is cancelled
+                        token = current_token()
+                        if token is not None:
+                            token.sleep(wait_time)
+                        else:
+                            time.sleep(wait_time)
                         delay *= backoff_factor
                     else:
+                        exhausted.inc(func=func.__name__)
                         logger.error(f"All {max_retries + 1} attempts failed. Last error: {e}")
             
             # If we get here, all retries failed
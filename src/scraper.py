@@ -3,19 +3,71 @@ Google News Scraper
 Main scraper class for fetching Google News via SERP API
 """
 import os
+import json
+import hashlib
 import logging
 import time
-from typing import List, Dict, Optional
+import itertools
+from typing import List, Dict, Optional, Tuple
 from thordata import ThordataClient
 from thordata.types import SerpRequest
-from .config import ENGINE_CONFIG
-from .utils import parse_serp_news
+from .config import ENGINE_CONFIG, THUMBNAIL_CONFIG, CONCURRENCY_CONFIG
+from .utils import parse_serp_news, merge_results, canonicalize_link, SearchResult
+from .thumbnails import process_thumbnails, THUMBNAIL_MODES
 from .retry import retry_with_backoff
 from .cache import cached, clear_cache
+from .metrics import metrics
+from .hooks import hooks as default_hooks, HookManager, OpenStage
+from .replay import RecordingClient, ReplayClient
+from .client_pool import ClientPool, PooledClient, get_client_pool
+from .rate_limit import RateLimiter
+from .archive import ArticleArchive
+from .search_index import LocalIndex
+from .budget import CreditLedger, BudgetExceeded, credits as default_ledger
+from .cancellation import CancelToken, GatherResult, OperationCancelled, current_token, check_cancelled, gather
+from .token_pool import TokenPool
+from .negative_cache import NegativeCache, is_permanent_failure, negative_cache as default_negative_cache
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("GoogleNewsScraper")
 
+# Search pipeline metrics
+SEARCH_LATENCY = metrics.histogram("search_latency_seconds", "End-to-end latency of search() calls")
+API_LATENCY = metrics.histogram("api_request_latency_seconds", "Latency of SERP API calls including retries")
+SEARCHES = metrics.counter("searches_total", "search() calls by outcome")
+FAILURES = metrics.counter("search_failures_total", "Failed searches by exception type")
+ITEMS_PARSED = metrics.counter("items_parsed_total", "News items parsed from SERP responses")
+
+class PendingSearch:
+    """
+    A search started with ``GoogleNewsScraper.begin_search``.
+
+    Carries the search parameters, its open "search" hook stage and its
+    start time, so the lookup, fetch and processing steps can run in
+    different threads and still be reported as one search.
+    """
+
+    def __init__(
+        self,
+        stage: OpenStage,
+        query: str,
+        num: int,
+        country: str,
+        language: Optional[str],
+        device: Optional[str],
+        no_cache: bool,
+        max_age: Optional[float]
+    ):
+        self.stage = stage
+        self.context = stage.context
+        self.params = (query, num, country, language, device)
+        self.no_cache = no_cache
+        self.max_age = max_age
+        self.started = time.time()
+        self.fetched_at: Optional[float] = None
+        # End-to-end seconds, set when the search finishes
+        self.elapsed: Optional[float] = None
+
 class GoogleNewsScraper:
     """
     Google News Scraper using Thordata SERP API
@@ -25,21 +77,92 @@ class GoogleNewsScraper:
     device type, and cache control.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        thumbnails: Optional[str] = None,
+        hooks: Optional[HookManager] = None,
+        client: Optional[ThordataClient] = None,
+        record_dir: Optional[str] = None,
+        replay_dir: Optional[str] = None,
+        replay_latency_scale: float = 1.0,
+        replay_strict: bool = True,
+        pool: Optional[ClientPool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        ledger: Optional[CreditLedger] = None,
+        archive: Optional[ArticleArchive] = None,
+        index: Optional[LocalIndex] = None,
+        negative_cache: Optional[NegativeCache] = None,
+        token_pool: Optional[TokenPool] = None
+    ):
         """
         Initialize the scraper with API token from environment variables.
         
+        Args:
+            thumbnails: Thumbnail handling mode ("inline", "store", "drop").
+                        If None, uses default from config
+            hooks: Pipeline hook registry (default: the global ``src.hooks.hooks``)
+            client: Pre-built client exposing ``serp_search_advanced`` (e.g. a
+                    fake client for benchmarks). If given, no token is required
+            record_dir: Save every raw SERP response to this directory
+            replay_dir: Serve responses recorded in this directory instead of
+                        calling the API (no token required). If ``client`` is
+                        also given, unrecorded requests are passed to it
+            replay_latency_scale: Multiplier for recorded latencies in replay mode
+            replay_strict: Fail requests that have no recording; if False, serve
+                           a random recording (with a warning) instead
+            pool: Client pool to borrow ThordataClient instances from
+                  (default: the process-wide pool shared by all scrapers)
+            rate_limiter: Limiter consulted before every API attempt (including
+                          retries); share one instance to cap a whole process
+            ledger: Credit ledger billed for every API attempt (default: the
+                    process-wide ``src.budget.credits``); give it soft/hard
+                    limits to prefer cache or refuse calls past a budget
+            archive: Article archive that records every item fetched from the API
+            index: Local full-text index updated with every item fetched from
+                   the API and queried by ``local_search``
+            negative_cache: Memory of empty and failed requests, which are then
+                            skipped with exponential backoff (default: the
+                            process-wide ``src.negative_cache.negative_cache``)
+            token_pool: Spread calls over several scraper tokens (default: a
+                        pool built from THORDATA_SCRAPER_TOKENS, if set)
+        
         Raises:
-            ValueError: If THORDATA_SCRAPER_TOKEN is not set in .env file
+            ValueError: If neither THORDATA_SCRAPER_TOKEN nor THORDATA_SCRAPER_TOKENS
+                        is set in .env file (and no client is given), or the
+                        thumbnail mode is not supported
         """
+        self.hooks = hooks or default_hooks
+        self.rate_limiter = rate_limiter
+        self.ledger = ledger or default_ledger
+        self.archive = archive
+        self.index = index
+        self.negative_cache = negative_cache or default_negative_cache
+        self.thumbnails = thumbnails or THUMBNAIL_CONFIG["mode"]
+        if self.thumbnails not in THUMBNAIL_MODES:
+            raise ValueError(f"Unsupported thumbnail mode: {self.thumbnails}. Use one of {THUMBNAIL_MODES}")
+        
         self.api_key = os.getenv("THORDATA_SCRAPER_TOKEN")
-        if not self.api_key:
-            raise ValueError("THORDATA_SCRAPER_TOKEN is required in .env")
-            
-        # Only Scraper Token is needed, not Public Token (since we use SERP)
-        self.client = ThordataClient(scraper_token=self.api_key)
+        if replay_dir:
+            client = ReplayClient(replay_dir, latency_scale=replay_latency_scale, strict=replay_strict,
+                                  fallback_client=client)
+        if client is None:
+            token_pool = token_pool or TokenPool.from_env(pool=pool)
+            if token_pool is not None:
+                # Several tokens: each call goes to the least-loaded healthy one
+                client = token_pool
+                self.api_key = token_pool.tokens[0]
+            elif not self.api_key:
+                raise ValueError("THORDATA_SCRAPER_TOKEN (or THORDATA_SCRAPER_TOKENS) is required in .env")
+            else:
+                # Only Scraper Token is needed, not Public Token (since we use SERP).
+                # Clients (and their keep-alive connections) are shared via the pool
+                client = PooledClient(pool or get_client_pool(), self.api_key)
+        self.token_pool = client if isinstance(client, TokenPool) else None
+        if record_dir:
+            client = RecordingClient(client, record_dir)
+        self.client = client
 
-    @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
+    @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0, give_up=is_permanent_failure)
     def _perform_search(
         self,
         query: str,
@@ -77,8 +200,47 @@ class GoogleNewsScraper:
             no_cache=no_cache
         )
         
+        if self.rate_limiter is not None:
+            token = current_token()
+            if token is None:
+                self.rate_limiter.acquire()
+            else:
+                # Wait in slices so a cancelled operation stops queueing for tokens
+                while not self.rate_limiter.acquire(timeout=0.25):
+                    token.raise_if_cancelled()
+        check_cancelled()
+        self.ledger.charge()
         return self.client.serp_search_advanced(req)
     
+    def _canonical_request(
+        self,
+        query: str,
+        num: int,
+        country: str,
+        language: Optional[str],
+        device: Optional[str]
+    ) -> Tuple[Dict, str]:
+        """
+        Normalize request parameters (case, whitespace, default language).
+        
+        The fingerprint leaves out num, so stored results of a larger
+        request can answer a smaller one.
+        
+        Returns:
+            Tuple of (canonical request, its fingerprint)
+        """
+        request = {
+            "query": " ".join(query.lower().split()),
+            "num": num,
+            "country": (country or "").lower(),
+            "language": (language or ENGINE_CONFIG.get("default_lang") or "").lower() or None,
+            "device": device,
+            "thumbnails": self.thumbnails
+        }
+        identity = {k: v for k, v in request.items() if k != "num"}
+        key = hashlib.sha1(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+        return request, key
+    
     def search(
         self, 
         query: str, 
@@ -86,8 +248,9 @@ class GoogleNewsScraper:
         country: str = "us",
         language: Optional[str] = None,
         device: Optional[str] = None,
-        no_cache: bool = False
-    ) -> List[Dict]:
+        no_cache: bool = False,
+        max_age: Optional[float] = None
+    ) -> SearchResult:
         """
         Search Google News by keyword using advanced SERP API.
         
@@ -103,57 +266,453 @@ class GoogleNewsScraper:
             language: Language code (e.g., "en", "zh", "ja"). If None, uses default from config
             device: Device type ("desktop", "mobile", "tablet"). If None, uses default
             no_cache: Whether to bypass cache (default: False)
+            max_age: Freshness tolerance in seconds. Results fetched at most
+                     this long ago are served from the cache or the scraper's
+                     archive (even with no_cache=True); older ones are refetched
+        
+        Returns:
+            SearchResult (a list) of news items with title, source, date,
+            snippet, link, thumbnail. The thumbnail is inline, a store reference
+            or None depending on the scraper's thumbnail mode. ``.metadata``
+            reports the source ("api", "cache", "archive", ...), fetched_at and age.
+            A request that recently came back empty or failed is not sent
+            again until its negative-cache entry expires; the result is then
+            empty with source "negative" (see SearchResult).
+        
+        Raises:
+            OperationCancelled: If the CancelToken bound to the calling thread
+                                is cancelled before the API responds
+        
+        Past the ledger's soft limit, cached results are returned even when
+        no_cache=True; past its hard limit, searches that would call the API
+        return an empty list.
+        
+        The steps of a search are also available separately (``begin_search``,
+        ``lookup``, ``fetch``, ``process`` and ``fail``) for callers that run
+        them in different threads, such as ``src.pipeline.Pipeline``.
+        """
+        pending = self.begin_search(query, num, country, language, device, no_cache, max_age)
+        try:
+            stored = self.lookup(pending)
+            if stored is not None:
+                return stored
+            return self.process(pending, self.fetch(pending))
+        except Exception as e:
+            return self.fail(pending, e)
+    
+    def begin_search(
+        self,
+        query: str,
+        num: int = 20,
+        country: str = "us",
+        language: Optional[str] = None,
+        device: Optional[str] = None,
+        no_cache: bool = False,
+        max_age: Optional[float] = None
+    ) -> "PendingSearch":
+        """
+        Start a search: open its "search" hook stage and latency timer.
+        
+        Finish it with ``lookup`` (if that finds stored results), otherwise
+        ``fetch`` then ``process``, or ``fail`` if any step raises. Arguments
+        are those of ``search``.
         
         Returns:
-            List of news items with title, source, date, snippet, link, thumbnail
+            PendingSearch to pass to the other steps
         """
         logger.info(f"Searching Google News for: '{query}' (Country: {country}, Num: {num})")
+        context = {"query": query, "num": num, "country": country, "language": language, "device": device}
+        return PendingSearch(
+            self.hooks.begin("search", **context), query, num, country, language, device, no_cache, max_age
+        )
+    
+    def _finish(self, pending: "PendingSearch", source: str, outcome: str, error: Optional[BaseException] = None):
+        """Record a search's outcome in metrics and close its hook stage"""
+        pending.elapsed = time.time() - pending.started
+        pending.context["source"] = source
+        SEARCHES.inc(outcome=outcome)
+        SEARCH_LATENCY.observe(pending.elapsed, source=source)
+        self.hooks.end(pending.stage, error)
+    
+    def lookup(self, pending: "PendingSearch") -> Optional[SearchResult]:
+        """
+        Find stored results for a search in the cache, the archive, then
+        the negative cache. A hit finishes the search.
         
-        try:
-            # Check cache first (if caching is enabled)
-            if not no_cache:
-                from .cache import _cache
-                cache_key = _cache._make_key("search", query, num, country, language, device)
+        Returns:
+            SearchResult with source "cache", "archive" or "negative", or
+            None if the search needs the API
+        """
+        stored = self._find_stored(pending)
+        if stored is not None:
+            source = stored.metadata["source"]
+            self._finish(pending, source, f"{source}_hit")
+        return stored
+    
+    def _find_stored(self, pending: "PendingSearch") -> Optional[SearchResult]:
+        """Cache, archive and negative-cache lookups of ``lookup``"""
+        stage = self.hooks.stage
+        query, num, country, language, device = pending.params
+        no_cache, max_age, context = pending.no_cache, pending.max_age, pending.context
+        # Check cache first (if caching is enabled, or the soft budget is used up)
+        prefer_cache = no_cache and self.ledger.over_soft_limit()
+        from .cache import _cache
+        cache_key = _cache._make_key("search", query, num, country, language, device, self.thumbnails)
+        if not no_cache or prefer_cache or max_age is not None:
+            with stage("cache_lookup", **context) as ctx:
                 cached_result = _cache.get(cache_key)
-                if cached_result is not None:
+                fetched_at = getattr(cached_result, "metadata", {}).get("fetched_at")
+                if cached_result is not None and max_age is not None and fetched_at is not None \
+                        and time.time() - fetched_at > max_age:
+                    cached_result = None
+                ctx["hit"] = cached_result is not None
+            if cached_result is not None:
+                if prefer_cache:
+                    logger.info(f"Soft budget reached: returning cached results for '{query}'")
+                else:
                     logger.info(f"Returning cached results for '{query}' (cache hit)")
-                    return cached_result
-                logger.debug(f"Cache miss for '{query}'")
-            
-            # Perform search with retry logic
-            start_time = time.time()
+                self.ledger.record_cache_hit()
+                return SearchResult(cached_result, source="cache", fetched_at=fetched_at)
+            logger.debug(f"Cache miss for '{query}'")
+        
+        # Then stored results of the same canonical request, if fresh enough
+        request, request_key = self._canonical_request(query, num, country, language, device)
+        if max_age is not None and self.archive is not None:
+            with stage("archive_lookup", **context) as ctx:
+                stored = self.archive.get_results(request_key)
+                # A larger stored request (or one that returned fewer than it asked for) also answers this one
+                ctx["hit"] = (
+                    stored is not None
+                    and time.time() - stored["fetched_at"] <= max_age
+                    and (stored["request"]["num"] >= num or len(stored["items"]) < stored["request"]["num"])
+                )
+            if ctx["hit"]:
+                age = time.time() - stored["fetched_at"]
+                logger.info(f"Returning archived results for '{query}' (age {age:.0f}s <= {max_age:g}s)")
+                self.ledger.record_cache_hit()
+                return SearchResult(stored["items"][:num], source="archive", fetched_at=stored["fetched_at"])
+        
+        # Then remembered failures (always) and empty results (unless bypassing the cache)
+        entry = self.negative_cache.hit(request_key, include_empty=not no_cache)
+        if entry is not None:
+            logger.info(f"Skipping '{query}': negative-cached ({entry['kind']}, {entry['count']}x), "
+                        f"retry in {entry['until'] - time.time():.0f}s")
+            return SearchResult(source="negative", fetched_at=entry["at"], negative=entry["kind"],
+                                reason=entry["reason"], retry_at=entry["until"])
+        return None
+    
+    def fetch(self, pending: "PendingSearch") -> Dict:
+        """
+        Call the API for a search, without parsing or storing anything.
+        
+        Billed to the scraper's ledger and subject to its rate limiter and
+        retries, like ``search``.
+        
+        Returns:
+            Raw API response (pass it to ``process``)
+        
+        Raises:
+            BudgetExceeded: If the ledger refuses the call
+            OperationCancelled: If the bound CancelToken is cancelled
+            Exception: If the API call fails after retries
+        """
+        query, num, country, language, device = pending.params
+        self.ledger.record_request()
+        pending.fetched_at = time.time()
+        with self.hooks.stage("fetch", **pending.context):
             response = self._perform_search(
                 query=query,
                 num=num,
                 country=country,
                 language=language,
                 device=device,
-                no_cache=no_cache
+                no_cache=pending.no_cache
             )
-            elapsed = time.time() - start_time
-            
-            # Parse and clean the data
+        elapsed = time.time() - pending.fetched_at
+        API_LATENCY.observe(elapsed)
+        logger.debug(f"Fetched '{query}' in {elapsed:.2f}s")
+        return response
+    
+    def process(self, pending: "PendingSearch", response: Dict) -> SearchResult:
+        """
+        Turn a raw API response into results and finish the search: parse,
+        truncate to num, handle thumbnails, then update the cache, archive
+        and index.
+        
+        Args:
+            pending: The search, after ``fetch``
+            response: Raw response returned by ``fetch``
+        
+        Returns:
+            SearchResult with source "api"
+        """
+        stage = self.hooks.stage
+        query, num, country, language, device = pending.params
+        context = pending.context
+        
+        # Parse and clean the data
+        with stage("parse", **context) as ctx:
             news_items = parse_serp_news(response)
-            
-            # Limit returned results (API may return more than requested)
+            ctx["items"] = len(news_items)
+        ITEMS_PARSED.inc(len(news_items))
+        
+        # Limit returned results (API may return more than requested)
+        with stage("truncate", **context):
             if len(news_items) > num:
                 news_items = news_items[:num]
-                logger.info(f"Found {len(news_items)} news items (limited to {num} as requested) in {elapsed:.2f}s.")
+                logger.info(f"Found {len(news_items)} news items for '{query}' (limited to {num} as requested).")
             else:
-                logger.info(f"Found {len(news_items)} news items in {elapsed:.2f}s.")
-            
-            # Cache the results (if caching is enabled)
-            if not no_cache:
-                from .cache import _cache
-                cache_key = _cache._make_key("search", query, num, country, language, device)
-                _cache.set(cache_key, news_items, ttl=300)  # Cache for 5 minutes
-                logger.debug(f"Cached results for '{query}' (TTL: 300s)")
-            
-            return news_items
-
-        except Exception as e:
-            logger.error(f"Search Failed after retries: {e}", exc_info=True)
-            return []
+                logger.info(f"Found {len(news_items)} news items for '{query}'.")
+        
+        # Externalize or drop inline thumbnails before caching/exporting
+        with stage("thumbnails", mode=self.thumbnails, **context):
+            process_thumbnails(news_items, self.thumbnails)
+        
+        news_items = SearchResult(news_items, source="api", fetched_at=pending.fetched_at)
+        
+        # Empty results are negative-cached instead, with their own TTL and backoff
+        request, request_key = self._canonical_request(query, num, country, language, device)
+        if news_items:
+            self.negative_cache.record_success(request_key)
+        else:
+            self.negative_cache.record_empty(request_key)
+        
+        # Cache the results (if caching is enabled)
+        if not pending.no_cache and news_items:
+            from .cache import _cache
+            cache_key = _cache._make_key("search", query, num, country, language, device, self.thumbnails)
+            label = f"search {query!r} {country}/{language or '-'} num={num}"
+            with stage("cache_store", **context):
+                _cache.set(cache_key, news_items, ttl=300, label=label)  # Cache for 5 minutes
+            logger.debug(f"Cached results for '{query}' (TTL: 300s)")
+        
+        # Record fetched items in the archive (cache hits were already recorded)
+        if self.archive is not None and news_items:
+            with stage("archive", **context):
+                self.archive.append(news_items, query=query, country=country, language=language)
+                self.archive.put_results(request_key, request, news_items, fetched_at=news_items.metadata["fetched_at"])
+        if self.index is not None and news_items:
+            with stage("index", **context):
+                self.index.add(news_items, query=query, country=country, language=language)
+        
+        context["items"] = len(news_items)
+        self._finish(pending, "api", "success" if news_items else "empty")
+        return news_items
+    
+    def fail(self, pending: "PendingSearch", exc: Exception) -> SearchResult:
+        """
+        Finish a search whose lookup, fetch or processing raised.
+        
+        A refused call (BudgetExceeded) returns an empty result with source
+        "refused" and the reason; any other failure is negative-cached and returns an
+        empty result with source "error", its failure class, reason and
+        retry_at.
+        
+        Raises:
+            OperationCancelled: Re-raised after recording the cancellation
+        """
+        query = pending.params[0]
+        if isinstance(exc, BudgetExceeded):
+            logger.warning(f"Search for '{query}' refused: {exc}")
+            self._finish(pending, "refused", "refused", exc)
+            return SearchResult(source="refused", reason=str(exc))
+        if isinstance(exc, OperationCancelled):
+            logger.info(f"Search for '{query}' cancelled")
+            self._finish(pending, "cancelled", "cancelled", exc)
+            raise exc
+        logger.error(f"Search Failed after retries: {exc}", exc_info=exc)
+        FAILURES.inc(type=type(exc).__name__)
+        _, request_key = self._canonical_request(*pending.params)
+        entry = self.negative_cache.record_failure(request_key, exc)
+        logger.warning(f"Backing off '{query}' for {entry['until'] - entry['at']:.0f}s "
+                       f"after {entry['kind']} failure #{entry['count']}")
+        self._finish(pending, "error", "error", exc)
+        return SearchResult(source="error", failure=entry["kind"], reason=str(exc), retry_at=entry["until"])
+    
+    def search_matrix(
+        self,
+        queries: List[str],
+        countries: List[str],
+        languages: Optional[List[Optional[str]]] = None,
+        num: int = 20,
+        device: Optional[str] = None,
+        no_cache: bool = False,
+        max_workers: Optional[int] = None,
+        target: Optional[int] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancelToken] = None,
+        max_age: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Search every query x country x language combination concurrently.
+        
+        Each item is tagged with the query, country and language of the first
+        search that found it, and items are deduplicated across locales on
+        canonical link; ``found_by`` lists every locale that returned the item.
+        
+        Args:
+            queries: Search queries
+            countries: Country codes
+            languages: Language codes (default: [None], the config default)
+            num: Number of results per search (default: 20)
+            device: Device type
+            no_cache: Whether to bypass cache
+            max_workers: Concurrent searches (default: from CONCURRENCY_CONFIG)
+            target: Stop once this many unique items are collected
+            deadline: Stop after this many seconds
+            cancel_token: Token to cancel the remaining searches from outside
+            max_age: Freshness tolerance for stored results (see ``search``)
+        
+        Returns:
+            Merged, deduplicated list of tagged news items, in cross-product order
+        """
+        merged, _ = self.search_matrix_with_report(
+            queries, countries, languages, num=num, device=device, no_cache=no_cache,
+            max_workers=max_workers, target=target, deadline=deadline, cancel_token=cancel_token,
+            max_age=max_age
+        )
+        return merged
+    
+    def search_matrix_with_report(
+        self,
+        queries: List[str],
+        countries: List[str],
+        languages: Optional[List[Optional[str]]] = None,
+        num: int = 20,
+        device: Optional[str] = None,
+        no_cache: bool = False,
+        max_workers: Optional[int] = None,
+        target: Optional[int] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancelToken] = None,
+        max_age: Optional[float] = None
+    ) -> Tuple[List[Dict], GatherResult]:
+        """
+        Same as ``search_matrix``, also reporting searches skipped by an early stop.
+        
+        Returns:
+            Tuple of (merged items, GatherResult keyed by (query, country, language))
+        """
+        combos = list(itertools.product(queries, countries, languages or [None]))
+        if not combos:
+            return [], GatherResult()
+        workers = min(len(combos), max_workers or CONCURRENCY_CONFIG["max_workers"])
+        logger.info(f"Matrix search: {len(combos)} combinations with {workers} workers")
+        
+        def call(combo):
+            query, country, language = combo
+            return lambda: self.search(query=query, num=num, country=country, language=language,
+                                       device=device, no_cache=no_cache, max_age=max_age)
+        
+        seen_links = set()
+        
+        def accept(combo, results):
+            seen_links.update(canonicalize_link(item.get("link", "")) for item in results if item.get("link"))
+            return target is not None and len(seen_links) >= target
+        
+        outcome = gather(
+            [(combo, call(combo)) for combo in combos],
+            accept=accept,
+            deadline=deadline,
+            token=cancel_token,
+            max_workers=workers
+        )
+        
+        records = (
+            dict(item, query=query, country=country, language=language)
+            for (query, country, language), results in outcome.completed
+            for item in results
+        )
+        merged = merge_results(records)
+        if target is not None:
+            merged = merged[:target]
+        logger.info(f"Matrix search found {sum(len(r) for _, r in outcome.completed)} items, {len(merged)} unique")
+        return merged, outcome
+    
+    def warm_up(
+        self,
+        specs: List[Dict],
+        num: int = 20,
+        country: str = "us",
+        max_workers: Optional[int] = None
+    ) -> Dict:
+        """
+        Fill the response cache for a list of queries, concurrently.
+        
+        Queries already cached are not fetched again.
+        
+        Args:
+            specs: Query specs (dicts with query and optional country,
+                   language, limit), e.g. from ``load_query_specs``
+            num: Results per query when a spec has no limit
+            country: Country when a spec has none
+            max_workers: Concurrent searches (default: CONCURRENCY_CONFIG)
+        
+        Returns:
+            Summary with queries, fetched, cached (already present),
+            failed (queries that errored or were skipped) and elapsed
+        """
+        start = time.time()
+        summary = {"queries": len(specs), "fetched": 0, "cached": 0, "failed": [], "elapsed": 0.0}
+        if not specs:
+            return summary
+        
+        def call(spec):
+            return lambda: self.search(query=spec["query"], num=spec.get("limit") or num,
+                                       country=spec.get("country") or country, language=spec.get("language"))
+        
+        outcome = gather(
+            [(i, call(spec)) for i, spec in enumerate(specs)],
+            max_workers=min(len(specs), max_workers or CONCURRENCY_CONFIG["max_workers"])
+        )
+        for i, results in outcome.completed:
+            source = results.metadata["source"]
+            if source == "api":
+                summary["fetched"] += 1
+            elif source == "cache":
+                summary["cached"] += 1
+            else:
+                summary["failed"].append(specs[i]["query"])
+        summary["elapsed"] = time.time() - start
+        logger.info(f"Cache warm-up: {summary['fetched']} fetched, {summary['cached']} already cached, "
+                    f"{len(summary['failed'])} failed in {summary['elapsed']:.2f}s")
+        return summary
+    
+    def local_search(
+        self,
+        query: str,
+        num: int = 20,
+        source: Optional[str] = None,
+        country: Optional[str] = None,
+        language: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Search previously fetched articles in the local index (no API call).
+        
+        Args:
+            query: Search terms (all must match; "term*" matches prefixes)
+            num: Maximum results (default: 20)
+            source: Only articles whose source contains this text
+            country: Only articles first found in this country
+            language: Only articles first found in this language
+            since: Only articles first seen at or after this epoch time
+            until: Only articles first seen before this epoch time
+        
+        Returns:
+            Matching items, best match first
+        
+        Raises:
+            ValueError: If the scraper has no index
+        """
+        if self.index is None:
+            raise ValueError("local_search requires GoogleNewsScraper(index=LocalIndex(...))")
+        start = time.time()
+        results = self.index.search(query, limit=num, source=source, country=country,
+                                    language=language, since=since, until=until)
+        logger.info(f"Local search for '{query}': {len(results)} items in {(time.time() - start) * 1000:.1f}ms")
+        return results
     
     def clear_cache(self):
         """Clear the response cache"""
@@ -0,0 +1,243 @@
+"""
+Local full-text index
+SQLite FTS5 index over every parsed article, searchable offline in milliseconds
+"""
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Any
+from .config import INDEX_CONFIG
+from .utils import canonicalize_link
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Indexed item fields
+INDEX_FIELDS = ["title", "snippet", "source", "date", "link", "thumbnail"]
+
+# bm25 column weights for (title, snippet, source)
+RANK_WEIGHTS = (10.0, 4.0, 1.0)
+
+def fts5_available() -> bool:
+    """Check whether the SQLite library was built with FTS5"""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(a)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    title TEXT, snippet TEXT, source TEXT, date TEXT, link TEXT, thumbnail TEXT,
+    query TEXT, country TEXT, language TEXT,
+    first_seen REAL NOT NULL, last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_first_seen ON articles(first_seen);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, snippet, source, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, snippet, source) VALUES (new.id, new.title, new.snippet, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, snippet, source) VALUES ('delete', old.id, old.title, old.snippet, old.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, snippet, source) VALUES ('delete', old.id, old.title, old.snippet, old.source);
+    INSERT INTO articles_fts(rowid, title, snippet, source) VALUES (new.id, new.title, new.snippet, new.source);
+END;
+"""
+
+class LocalIndex:
+    """
+    Full-text index over parsed articles, keyed by canonical link.
+
+    Title, snippet and source are indexed with SQLite FTS5 and ranked by
+    bm25 (title matches weigh most). Without FTS5 the index falls back to
+    substring matching, which is slower but returns the same fields.
+    Safe to share between threads; several processes can use the same
+    file (WAL mode).
+    """
+
+    def __init__(self, path: str = INDEX_CONFIG["path"]):
+        """
+        Open or create an index.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway index)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self.fts = fts5_available()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            if self.fts:
+                self._conn.executescript(_FTS_SCHEMA)
+            else:
+                logger.warning("SQLite FTS5 is not available; local search falls back to substring matching")
+
+    def add(
+        self,
+        items: Iterable[Dict],
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        language: Optional[str] = None,
+        seen_at: Optional[float] = None
+    ) -> int:
+        """
+        Insert or update articles.
+
+        Args:
+            items: Parsed news items
+            query: Query that returned them
+            country: Country of the search
+            language: Language of the search
+            seen_at: Observation time in epoch seconds (default: now)
+
+        Returns:
+            Number of items indexed (items without a link are skipped)
+        """
+        seen_at = seen_at or time.time()
+        rows = []
+        for item in items:
+            key = canonicalize_link(item.get("link") or "")
+            if key:
+                rows.append([key] + [item.get(f) for f in INDEX_FIELDS] + [query, country, language, seen_at, seen_at])
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO articles (key, title, snippet, source, date, link, thumbnail,
+                                      query, country, language, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    title = excluded.title, snippet = excluded.snippet, source = excluded.source,
+                    date = excluded.date, link = excluded.link, thumbnail = excluded.thumbnail,
+                    first_seen = MIN(first_seen, excluded.first_seen),
+                    last_seen = MAX(last_seen, excluded.last_seen)
+                """,
+                rows
+            )
+        return len(rows)
+
+    def add_archive(self, archive) -> int:
+        """
+        Index every article of an ArticleArchive.
+
+        Args:
+            archive: Source archive
+
+        Returns:
+            Number of articles indexed
+        """
+        total = 0
+        for record in archive.iter_range():
+            origin = record["found_by"][0] if record["found_by"] else {}
+            total += self.add([record["item"]], seen_at=record["first_seen"], **origin)
+            if record["last_seen"] != record["first_seen"]:
+                self.add([record["item"]], seen_at=record["last_seen"], **origin)
+        return total
+
+    @staticmethod
+    def _match_expression(text: str) -> str:
+        """Turn free text into an FTS5 query (all terms required, trailing * = prefix)"""
+        terms = []
+        for term in re.findall(r"[\w*]+", text, flags=re.UNICODE):
+            prefix = term.endswith("*")
+            term = term.strip("*")
+            if term:
+                terms.append(f'"{term}"' + ("*" if prefix else ""))
+        return " ".join(terms)
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        source: Optional[str] = None,
+        country: Optional[str] = None,
+        language: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search indexed articles.
+
+        Args:
+            text: Search terms (all must match; "term*" matches prefixes)
+            limit: Maximum results
+            source: Only articles whose source contains this text (case-insensitive)
+            country: Only articles first found in this country
+            language: Only articles first found in this language
+            since: Only articles first seen at or after this epoch time
+            until: Only articles first seen before this epoch time
+
+        Returns:
+            Items (title, source, date, snippet, link, thumbnail) with
+            ``first_seen``/``last_seen``, best match first
+        """
+        filters, params = [], []
+        if source:
+            filters.append("a.source LIKE ?")
+            params.append(f"%{source}%")
+        if country:
+            filters.append("a.country = ?")
+            params.append(country)
+        if language:
+            filters.append("a.language = ?")
+            params.append(language)
+        if since is not None:
+            filters.append("a.first_seen >= ?")
+            params.append(since)
+        if until is not None:
+            filters.append("a.first_seen < ?")
+            params.append(until)
+        columns = "a.title, a.source, a.date, a.snippet, a.link, a.thumbnail, a.first_seen, a.last_seen"
+
+        if self.fts:
+            expression = self._match_expression(text)
+            if not expression:
+                return []
+            where = " AND ".join(["articles_fts MATCH ?"] + filters)
+            sql = (f"SELECT {columns} FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                   f"WHERE {where} ORDER BY bm25(articles_fts, ?, ?, ?), a.last_seen DESC LIMIT ?")
+            params = [expression] + params + list(RANK_WEIGHTS) + [limit]
+        else:
+            terms = re.findall(r"\w+", text.lower(), flags=re.UNICODE)
+            if not terms:
+                return []
+            haystack = "lower(coalesce(a.title, '') || ' ' || coalesce(a.snippet, '') || ' ' || coalesce(a.source, ''))"
+            where = " AND ".join([f"{haystack} LIKE ?" for _ in terms] + filters)
+            sql = f"SELECT {columns} FROM articles a WHERE {where} ORDER BY a.last_seen DESC LIMIT ?"
+            params = [f"%{t}%" for t in terms] + params + [limit]
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get article count and time span"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS articles, MIN(first_seen) AS oldest, MAX(last_seen) AS newest FROM articles"
+            ).fetchone()
+        return dict(row, fts=self.fts)
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,331 @@
+"""
+Local HTTP service mode
+asyncio-based JSON API sharing one scraper, cache, rate limiter and client pool across clients
+"""
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit, parse_qsl
+from .scraper import GoogleNewsScraper
+from .ai_news import AINewsBriefing
+from .rate_limit import RateLimiter
+from .metrics import metrics
+from .cache import _cache
+from .config import CONCURRENCY_CONFIG
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Maximum accepted request body in bytes
+MAX_BODY = 1024 * 1024
+
+# Maximum searches in one batch request
+MAX_BATCH = 100
+
+REQUESTS = metrics.counter("server_requests_total", "HTTP requests by route and status")
+COALESCED = metrics.counter("server_coalesced_total", "Searches served by joining an identical in-flight search")
+
+class HTTPError(Exception):
+    """Error mapped to an HTTP status code"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+class NewsServer:
+    """
+    HTTP/JSON server exposing search, batch search and the AI briefing.
+
+    Endpoints:
+        GET  /health
+        GET  /metrics                  Prometheus text
+        GET  /credits                  API credit ledger summary
+        GET  /cache?limit=...&sort=... Cache entries (hottest first; sort=hits|age|ttl)
+        GET  /search?query=...&num=...&max_age=... (or POST a JSON object)
+        POST /search/batch             {"requests": [{"query": ...}, ...]}
+        GET  /ai/brief?num=...&country=...
+        GET  /ai/breakthroughs?num=...&country=...
+
+    Blocking scraper calls run on a shared thread pool. Identical searches
+    that arrive while one is in flight are coalesced into a single call.
+    """
+
+    def __init__(
+        self,
+        scraper: Optional[GoogleNewsScraper] = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_workers: Optional[int] = None,
+        rate: Optional[float] = None
+    ):
+        """
+        Initialize server.
+
+        Args:
+            scraper: Shared scraper (default: a new GoogleNewsScraper)
+            host: Interface to bind
+            port: Port to listen on
+            max_workers: Threads for blocking scraper calls (default: from CONCURRENCY_CONFIG)
+            rate: Global API request rate limit in requests/second (default: unlimited)
+        """
+        self.scraper = scraper or GoogleNewsScraper()
+        if rate:
+            self.scraper.rate_limiter = RateLimiter(rate)
+        self.briefing = AINewsBriefing(scraper=self.scraper, request_delay=0, progress=False)
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or CONCURRENCY_CONFIG["max_workers"])
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking call on the shared thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+
+    async def search(self, params: Dict[str, Any]):
+        """Run (or join) a search for normalized parameters"""
+        key = tuple(sorted(params.items()))
+        future = self._inflight.get(key)
+        if future is not None:
+            COALESCED.inc()
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._call(self.scraper.search, **params)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so asyncio does not warn when nobody joined
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    @staticmethod
+    def _int_param(data: Dict[str, Any], name: str, default: int) -> int:
+        """Read an integer parameter, clamped to 1..100"""
+        try:
+            value = int(data.get(name, default))
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"{name} must be an integer")
+        return max(1, min(value, 100))
+
+    @staticmethod
+    def _float_param(data: Dict[str, Any], name: str) -> Optional[float]:
+        """Read an optional non-negative number"""
+        value = data.get(name)
+        if value is None or value == "":
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"{name} must be a number")
+
+    @staticmethod
+    def _bool_param(data: Dict[str, Any], name: str, default: bool) -> bool:
+        """Read a boolean parameter from JSON or a query string"""
+        value = data.get(name, default)
+        if isinstance(value, str):
+            return value.lower() in ("1", "true", "yes")
+        return bool(value)
+
+    def _search_params(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and normalize search parameters from a request"""
+        query = data.get("query") or data.get("q")
+        if not query or not isinstance(query, str):
+            raise HTTPError(400, "query is required")
+        return {
+            "query": query,
+            "num": self._int_param(data, "num", 20),
+            "country": data.get("country") or "us",
+            "language": data.get("language") or None,
+            "device": data.get("device") or None,
+            "no_cache": self._bool_param(data, "no_cache", False),
+            "max_age": self._float_param(data, "max_age")
+        }
+
+    async def route(self, method: str, path: str, data: Dict[str, Any]) -> Tuple[int, Any, str]:
+        """
+        Dispatch a request.
+
+        Returns:
+            Tuple of (status, body, content type)
+        """
+        if path == "/health":
+            return 200, {"status": "ok"}, "application/json"
+        if path == "/metrics":
+            return 200, metrics.to_prometheus(), "text/plain; version=0.0.4"
+        if path == "/credits":
+            return 200, self.scraper.ledger.summary(), "application/json"
+        if path == "/cache":
+            sort = data.get("sort") or "hits"
+            if sort not in ("hits", "age", "ttl"):
+                raise HTTPError(400, "sort must be hits, age or ttl")
+            entries = _cache.entries(limit=self._int_param(data, "limit", 20), sort=sort)
+            return 200, {"size": _cache.size(), "entries": entries}, "application/json"
+        if path == "/search":
+            results = await self.search(self._search_params(data))
+            return 200, {"count": len(results), "metadata": getattr(results, "metadata", {}),
+                         "results": results}, "application/json"
+        if path == "/search/batch":
+            if method != "POST":
+                raise HTTPError(405, "Use POST with {\"requests\": [...]}")
+            requests = data.get("requests")
+            if not isinstance(requests, list) or not requests:
+                raise HTTPError(400, "requests must be a non-empty list")
+            if len(requests) > MAX_BATCH:
+                raise HTTPError(400, f"At most {MAX_BATCH} requests per batch")
+            params = [self._search_params(r if isinstance(r, dict) else {}) for r in requests]
+            result_sets = await asyncio.gather(*(self.search(p) for p in params))
+            return 200, {"results": [
+                {"query": p["query"], "country": p["country"], "count": len(r), "results": r}
+                for p, r in zip(params, result_sets)
+            ]}, "application/json"
+        if path == "/ai/brief":
+            briefing = await self._call(
+                self.briefing.get_latest_ai_news,
+                num=self._int_param(data, "num", 20),
+                country=data.get("country") or "us",
+                language=data.get("language") or "en",
+                no_cache=self._bool_param(data, "no_cache", True),
+                max_age=self._float_param(data, "max_age")
+            )
+            return 200, briefing, "application/json"
+        if path == "/ai/breakthroughs":
+            results = await self._call(
+                self.briefing.get_ai_breakthroughs,
+                num=self._int_param(data, "num", 10),
+                country=data.get("country") or "us",
+                max_age=self._float_param(data, "max_age")
+            )
+            return 200, {"count": len(results), "results": results}, "application/json"
+        raise HTTPError(404, f"Unknown path: {path}")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection (with keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, "application/json", False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, body, content_type = await self._process(method, target, headers, reader)
+                if status in (400, 413):
+                    # The request body may not have been read, so the stream is out of sync
+                    keep_alive = False
+                await self._respond(writer, status, body, content_type, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _process(self, method: str, target: str, headers: Dict[str, str], reader) -> Tuple[int, Any, str]:
+        """Read the body, route the request and map errors to responses"""
+        url = urlsplit(target)
+        try:
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                raise HTTPError(400, "Invalid Content-Length")
+            if length < 0:
+                raise HTTPError(400, "Invalid Content-Length")
+            if length > MAX_BODY:
+                raise HTTPError(413, "Request body too large")
+            data: Dict[str, Any] = dict(parse_qsl(url.query))
+            if length:
+                body = await reader.readexactly(length)
+                try:
+                    payload = json.loads(body)
+                except json.JSONDecodeError:
+                    raise HTTPError(400, "Body must be JSON")
+                if not isinstance(payload, dict):
+                    raise HTTPError(400, "Body must be a JSON object")
+                data.update(payload)
+            status, response, content_type = await self.route(method, url.path, data)
+        except HTTPError as e:
+            status, response, content_type = e.status, {"error": e.message}, "application/json"
+        except Exception as e:
+            logger.error(f"Request {method} {url.path} failed: {e}", exc_info=True)
+            status, response, content_type = 500, {"error": "Internal server error"}, "application/json"
+        REQUESTS.inc(route=url.path, status=status)
+        return status, response, content_type
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: Any, content_type: str, keep_alive: bool):
+        """Write an HTTP response"""
+        payload = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False, default=str)
+        data = payload.encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def start(self):
+        """Start listening"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        logger.info(f"Serving on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        """Start listening and serve until cancelled"""
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening and release the thread pool"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+def run_server(
+    scraper: Optional[GoogleNewsScraper] = None,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    max_workers: Optional[int] = None,
+    rate: Optional[float] = None
+):
+    """
+    Run the HTTP service until interrupted.
+
+    Args:
+        scraper: Shared scraper (default: a new GoogleNewsScraper)
+        host: Interface to bind
+        port: Port to listen on
+        max_workers: Threads for blocking scraper calls
+        rate: Global API request rate limit in requests/second
+    """
+    server = NewsServer(scraper=scraper, host=host, port=port, max_workers=max_workers, rate=rate)
+    try:
+        asyncio.run(server.serve_forever())
+    finally:
+        server.executor.shutdown(wait=False)
@@ -0,0 +1,229 @@
+"""
+Result snapshots
+Compact per-query snapshots of ordered result identities, and diffs between polls
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Any
+from .config import SNAPSHOT_CONFIG
+from .utils import canonicalize_link
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Item fields kept so added/removed articles can be described
+DETAIL_FIELDS = ["title", "source", "link"]
+
+def item_id(item: Dict) -> Optional[str]:
+    """Short stable identity of an item (hash of its canonical link)"""
+    link = canonicalize_link(item.get("link") or "")
+    return hashlib.sha1(link.encode()).hexdigest()[:16] if link else None
+
+def diff_ids(previous: List[str], current: List[str]) -> Dict[str, List]:
+    """
+    Diff two ordered id lists in linear time.
+
+    Ranks are 1-based.
+
+    Returns:
+        Dict with added [(id, rank)], removed [(id, old_rank)],
+        moved [(id, old_rank, new_rank)] and unchanged (count)
+    """
+    old_rank = {id_: rank for rank, id_ in enumerate(previous, 1)}
+    new_rank = {id_: rank for rank, id_ in enumerate(current, 1)}
+    added, moved, unchanged = [], [], 0
+    for id_, rank in new_rank.items():
+        before = old_rank.get(id_)
+        if before is None:
+            added.append((id_, rank))
+        elif before != rank:
+            moved.append((id_, before, rank))
+        else:
+            unchanged += 1
+    removed = [(id_, rank) for id_, rank in old_rank.items() if id_ not in new_rank]
+    return {"added": added, "removed": removed, "moved": moved, "unchanged": unchanged}
+
+class SnapshotStore:
+    """
+    Per-query history of result lists.
+
+    Each query (identified by its request parameters) has an append-only
+    JSON-lines file under the store root. A snapshot stores the ordered ids
+    of its items plus the title/source/link of ids that are new since the
+    previous snapshot, so consecutive polls of a stable query cost a few
+    hundred bytes. Histories are trimmed to the last ``keep`` snapshots.
+    """
+
+    def __init__(self, root: str = SNAPSHOT_CONFIG["root"], keep: int = SNAPSHOT_CONFIG["keep"]):
+        """
+        Initialize store.
+
+        Args:
+            root: Snapshot directory
+            keep: Snapshots kept per query
+        """
+        self.root = root
+        self.keep = keep
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        """Stable key of a request (query is case- and whitespace-normalized)"""
+        normalized = dict(request, query=" ".join(str(request.get("query", "")).lower().split()))
+        return hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.jsonl")
+
+    def history(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get all stored snapshots of a request, oldest first.
+
+        Returns:
+            Snapshots with taken_at, request, ids and details (new ids only)
+        """
+        path = self._path(self.request_key(request))
+        if not os.path.exists(path):
+            return []
+        snapshots = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    snapshots.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.debug(f"Skipping incomplete snapshot line in {path}")
+        return snapshots
+
+    def record(
+        self,
+        request: Dict[str, Any],
+        items: List[Dict],
+        taken_at: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a snapshot and diff it against the previous one.
+
+        Args:
+            request: Request parameters (query, country, language, ...)
+            items: Current result list, in rank order
+            taken_at: Snapshot time (default: now)
+
+        Returns:
+            Diff (see ``describe``); ``first_snapshot`` is True when there was
+            nothing to compare against
+        """
+        key = self.request_key(request)
+        ids, details = [], {}
+        for item in items:
+            id_ = item_id(item)
+            if id_ and id_ not in details:
+                ids.append(id_)
+                details[id_] = {f: item.get(f) for f in DETAIL_FIELDS}
+
+        with self._lock:
+            history = self.history(request)
+            previous = history[-1] if history else None
+            known = set(previous["ids"]) if previous else set()
+            snapshot = {
+                "taken_at": taken_at or time.time(),
+                "request": request,
+                "ids": ids,
+                "details": {id_: d for id_, d in details.items() if id_ not in known}
+            }
+            history.append(snapshot)
+            if len(history) > self.keep:
+                self._rewrite(key, history)
+            else:
+                with open(self._path(key), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
+
+        if previous is None:
+            return self.describe(request, None, snapshot, details)
+        return self.describe(request, previous, snapshot, dict(self._details(history[:-1]), **details))
+
+    def _rewrite(self, key: str, history: List[Dict[str, Any]]):
+        """Trim a history to its last ``keep`` snapshots, carrying details of the ids they still reference"""
+        carried = self._details(history)
+        history = history[-self.keep:]
+        first = history[0]
+        first["details"] = {id_: carried[id_] for id_ in first["ids"] if id_ in carried}
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for snapshot in history:
+                f.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _details(history: List[Dict[str, Any]]) -> Dict[str, Dict]:
+        """Collect item details from a history (later snapshots win)"""
+        details = {}
+        for snapshot in history:
+            details.update(snapshot.get("details", {}))
+        return details
+
+    @staticmethod
+    def describe(
+        request: Dict[str, Any],
+        previous: Optional[Dict[str, Any]],
+        current: Dict[str, Any],
+        details: Dict[str, Dict]
+    ) -> Dict[str, Any]:
+        """
+        Build a diff report between two snapshots.
+
+        Returns:
+            Dict with request, previous_at, current_at, added/removed/moved
+            lists (with rank and title/source/link), unchanged count and
+            first_snapshot
+        """
+        changes = diff_ids(previous["ids"] if previous else [], current["ids"])
+
+        def entry(id_, **ranks):
+            return dict(details.get(id_, {}), id=id_, **ranks)
+
+        return {
+            "request": request,
+            "previous_at": previous["taken_at"] if previous else None,
+            "current_at": current["taken_at"],
+            "first_snapshot": previous is None,
+            "added": [entry(id_, rank=rank) for id_, rank in changes["added"]],
+            "removed": [entry(id_, rank=rank) for id_, rank in changes["removed"]],
+            "moved": [entry(id_, rank=new, previous_rank=old) for id_, old, new in changes["moved"]],
+            "unchanged": changes["unchanged"]
+        }
+
+    def diff_latest(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Diff the last two stored snapshots of a request.
+
+        Returns:
+            Diff report, or None if fewer than two snapshots exist
+        """
+        history = self.history(request)
+        if len(history) < 2:
+            return None
+        return self.describe(request, history[-2], history[-1], self._details(history))
+
+    def poll(self, scraper, query: str, **params) -> Optional[Dict[str, Any]]:
+        """
+        Fetch fresh results for a query, snapshot them and return the diff.
+
+        Args:
+            scraper: GoogleNewsScraper
+            query: Search query
+            **params: Other search parameters (num, country, language, device)
+
+        Returns:
+            Diff report, or None if the search failed (failed searches are
+            not recorded, so they never show up as "everything removed")
+        """
+        results = scraper.search(query=query, no_cache=True, **params)
+        if getattr(results, "metadata", {}).get("source") in ("error", "refused", "negative"):
+            logger.warning(f"Not snapshotting '{query}': search {results.metadata['source']}")
+            return None
+        return self.record(dict(params, query=query), results)
@@ -0,0 +1,180 @@
+"""
+Story clustering
+Groups news items that report the same event, using hashed n-gram TF-IDF vectors and sparse similarity
+"""
+import re
+import zlib
+import logging
+from typing import Dict, List, Any
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from .config import STORY_CONFIG
+from .utils import canonicalize_link
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Words too common in headlines to say anything about the event
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have how in is it its new news of on or says said than that the
+this to up was what when who why will with after over more about into just now out all can could
+""".split())
+
+_TOKEN_RE = re.compile(r"\w+", flags=re.UNICODE)
+
+# Inflection suffixes stripped so "launches"/"launched"/"launch" share features
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+def _stem(word: str) -> str:
+    """Strip one common English inflection from words longer than four letters"""
+    if len(word) > 4:
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix):
+                return word[:-len(suffix)]
+    return word
+
+def _tokens(text: str) -> List[str]:
+    """Lowercase, lightly stemmed word tokens without stop words and single characters"""
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOP_WORDS]
+
+def vectorize(
+    texts: List[str],
+    n_features: int = STORY_CONFIG["n_features"],
+    max_df: float = STORY_CONFIG["max_df"]
+) -> sparse.csr_matrix:
+    """
+    Build L2-normalized TF-IDF vectors of hashed word unigrams and bigrams.
+
+    Args:
+        texts: Documents
+        n_features: Hash space size (columns)
+        max_df: Drop features found in more than this fraction of documents
+                (only applied to 20 or more documents)
+
+    Returns:
+        Sparse matrix with one row per text
+    """
+    rows, cols = [], []
+    crc32 = zlib.crc32
+    for row, text in enumerate(texts):
+        words = _tokens(text)
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        rows.extend([row] * len(grams))
+        cols.extend(crc32(g.encode()) % n_features for g in grams)
+
+    n = len(texts)
+    counts = sparse.csr_matrix(
+        (np.ones(len(cols), dtype=np.float32), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=(n, n_features)
+    )
+    counts.sum_duplicates()
+
+    df = np.bincount(counts.indices, minlength=n_features)
+    if n >= 20:
+        counts.data[df[counts.indices] > max_df * n] = 0
+        counts.eliminate_zeros()
+    idf = np.log((1 + n) / (1 + df)).astype(np.float32) + 1
+    counts.data = (1 + np.log(counts.data)) * idf[counts.indices]
+
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ counts, dtype=np.float32)
+
+def similarity_graph(
+    vectors: sparse.csr_matrix,
+    threshold: float = STORY_CONFIG["threshold"],
+    chunk_size: int = STORY_CONFIG["chunk_size"]
+) -> sparse.csr_matrix:
+    """
+    Find pairs of rows with cosine similarity at or above a threshold.
+
+    Similarities are computed ``chunk_size`` rows at a time, so memory is
+    bounded by one chunk of the similarity matrix.
+
+    Returns:
+        Sparse n x n adjacency matrix (upper triangle)
+    """
+    n = vectors.shape[0]
+    rows, cols = [], []
+    for start in range(0, n, chunk_size):
+        # Only rows from start on can be upper-triangle partners of this chunk
+        block = (vectors[start:start + chunk_size] @ vectors[start:].T).tocoo()
+        keep = (block.data >= threshold) & (block.col > block.row)
+        rows.append(block.row[keep] + start)
+        cols.append(block.col[keep] + start)
+    rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.array([], dtype=np.int64)
+    return sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+
+def cluster_stories(
+    items: List[Dict],
+    threshold: float = STORY_CONFIG["threshold"],
+    min_size: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Group items into stories about the same event.
+
+    Items are vectorized from title and snippet, connected when their cosine
+    similarity reaches ``threshold`` (or they share a canonical link), and
+    each connected group becomes a story. The representative item is the
+    one closest to the story centroid.
+
+    Args:
+        items: News items (title, snippet, source, link, ...)
+        threshold: Cosine similarity that links two items (0-1)
+        min_size: Only return stories with at least this many items
+
+    Returns:
+        Stories, most widely covered first, each with headline, link, source,
+        size, source_count, sources and items
+    """
+    if not items:
+        return []
+    texts = [f"{item.get('title') or ''} {item.get('snippet') or ''}" for item in items]
+    vectors = vectorize(texts)
+    graph = similarity_graph(vectors, threshold)
+
+    # Same article found through different queries/countries
+    first_by_link, dup_rows, dup_cols = {}, [], []
+    for i, item in enumerate(items):
+        link = canonicalize_link(item.get("link") or "")
+        if link:
+            j = first_by_link.setdefault(link, i)
+            if j != i:
+                dup_rows.append(j)
+                dup_cols.append(i)
+    if dup_rows:
+        graph = graph + sparse.csr_matrix(
+            (np.ones(len(dup_rows), dtype=np.int8), (dup_rows, dup_cols)), shape=graph.shape
+        )
+
+    n_stories, labels = connected_components(graph, directed=False)
+
+    # Centroid of each story, then each item's closeness to its own centroid
+    membership = sparse.csr_matrix(
+        (np.ones(len(items), dtype=np.float32), (labels, np.arange(len(items)))),
+        shape=(n_stories, len(items))
+    )
+    centroids = membership @ vectors
+    closeness = np.asarray(vectors.multiply(centroids[labels]).sum(axis=1)).ravel()
+
+    order = np.lexsort((-closeness, labels))
+    stories = []
+    for members in np.split(order, np.flatnonzero(np.diff(labels[order])) + 1):
+        if len(members) < min_size:
+            continue
+        story_items = [items[i] for i in members]
+        lead = story_items[0]
+        sources = sorted({item.get("source") for item in story_items if item.get("source")})
+        stories.append({
+            "headline": lead.get("title"),
+            "link": lead.get("link"),
+            "source": lead.get("source"),
+            "size": len(story_items),
+            "source_count": len(sources),
+            "sources": sources,
+            "items": story_items
+        })
+    stories.sort(key=lambda s: (s["source_count"], s["size"]), reverse=True)
+    logger.debug(f"Clustered {len(items)} items into {len(stories)} stories")
+    return stories
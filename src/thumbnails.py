@@ -0,0 +1,166 @@
+"""
+Thumbnail externalization
+Moves inline base64 thumbnails out of news items into a content-addressed store
+"""
+import os
+import re
+import base64
+import binascii
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Optional, Tuple
+from .config import THUMBNAIL_CONFIG
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+# Supported thumbnail handling modes
+THUMBNAIL_MODES = ["inline", "store", "drop"]
+
+_DATA_URI_RE = re.compile(r"^data:image/([a-zA-Z0-9.+-]+);base64,(.*)$", re.DOTALL)
+
+# Map MIME subtypes to file extensions
+_EXTENSIONS = {
+    "jpeg": "jpg",
+    "svg+xml": "svg",
+    "x-icon": "ico",
+}
+
+def parse_data_uri(uri: str) -> Optional[Tuple[str, bytes]]:
+    """
+    Decode an inline ``data:image/...;base64,`` thumbnail.
+
+    Args:
+        uri: Thumbnail value from a news item
+
+    Returns:
+        Tuple of (file extension, decoded bytes) or None if not an inline image
+    """
+    if not isinstance(uri, str):
+        return None
+    match = _DATA_URI_RE.match(uri)
+    if not match:
+        return None
+    subtype = match.group(1).lower()
+    try:
+        data = base64.b64decode(match.group(2), validate=False)
+    except (binascii.Error, ValueError):
+        logger.debug("Skipping undecodable inline thumbnail")
+        return None
+    return _EXTENSIONS.get(subtype, subtype), data
+
+class ThumbnailStore:
+    """
+    Content-addressed on-disk store for thumbnail images.
+
+    Images are stored once per SHA-256 digest under
+    ``<root>/<digest[:2]>/<digest>.<ext>``, so identical thumbnails
+    shared by many articles occupy a single file.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory for stored images (default: from THUMBNAIL_CONFIG)
+        """
+        self.root = root or THUMBNAIL_CONFIG["store_dir"]
+        self._known: set = set()
+        self._lock = threading.Lock()
+
+    def _reference(self, digest: str, ext: str) -> str:
+        """Build the short reference that replaces the inline thumbnail"""
+        return "/".join([os.path.basename(os.path.normpath(self.root)), digest[:2], f"{digest}.{ext}"])
+
+    def put(self, data: bytes, ext: str) -> str:
+        """
+        Store image bytes (if not already present) and return their reference.
+
+        Args:
+            data: Decoded image bytes
+            ext: File extension
+
+        Returns:
+            Reference path relative to the store's parent directory
+            (e.g. ``thumbnails/ab/ab12....png``)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        name = f"{digest}.{ext}"
+
+        with self._lock:
+            if name in self._known:
+                return self._reference(digest, ext)
+
+        directory = os.path.join(self.root, digest[:2])
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._known.add(name)
+        return self._reference(digest, ext)
+
+    def path_for(self, reference: str) -> str:
+        """
+        Resolve a reference returned by ``put`` to a file path.
+
+        Args:
+            reference: Thumbnail reference
+
+        Returns:
+            Path of the stored image
+        """
+        return os.path.join(self.root, *reference.split("/")[1:])
+
+_default_store: Optional[ThumbnailStore] = None
+
+def get_thumbnail_store() -> ThumbnailStore:
+    """Get the process-wide default thumbnail store"""
+    global _default_store
+    if _default_store is None:
+        _default_store = ThumbnailStore()
+    return _default_store
+
+def process_thumbnails(
+    items: List[Dict],
+    mode: str = "inline",
+    store: Optional[ThumbnailStore] = None
+) -> List[Dict]:
+    """
+    Apply a thumbnail handling mode to parsed news items (in place).
+
+    Args:
+        items: Parsed news items
+        mode: "inline" (keep as is), "store" (externalize inline images
+              to the content-addressed store) or "drop" (remove thumbnails)
+        store: Store to use in "store" mode (default: process-wide store)
+
+    Returns:
+        The same list of items
+    """
+    if mode not in THUMBNAIL_MODES:
+        raise ValueError(f"Unsupported thumbnail mode: {mode}. Use one of {THUMBNAIL_MODES}")
+
+    if mode == "inline":
+        return items
+
+    if mode == "drop":
+        for item in items:
+            if "thumbnail" in item:
+                item["thumbnail"] = None
+        return items
+
+    store = store or get_thumbnail_store()
+    for item in items:
+        decoded = parse_data_uri(item.get("thumbnail"))
+        if decoded is None:
+            # Remote URLs and missing thumbnails are kept unchanged
+            continue
+        ext, data = decoded
+        item["thumbnail"] = store.put(data, ext)
+    return items
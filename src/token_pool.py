@@ -0,0 +1,282 @@
+"""
+Scraper token pool
+Spreads SERP calls over several scraper tokens, each with its own rate limit and concurrency
+"""
+import os
+import time
+import random
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Union
+from .config import TOKEN_POOL_CONFIG
+from .rate_limit import RateLimiter
+from .metrics import metrics
+from .negative_cache import classify_failure
+from .cancellation import current_token
+from .client_pool import get_client_pool
+
+logger = logging.getLogger("GoogleNewsScraper")
+
+TOKEN_CALLS = metrics.counter("token_pool_calls_total", "SERP calls per pooled token by outcome")
+QUARANTINES = metrics.counter("token_pool_quarantines_total", "Tokens taken out of rotation by failure class")
+
+DISPATCH_STRATEGIES = ["least_loaded", "weighted"]
+
+class NoTokenAvailable(Exception):
+    """
+    Raised when every token in the pool is quarantined.
+
+    ``failure_class`` is the quarantine reason that clears soonest in kind
+    ("rate_limited", then "quota", then "auth"), for classify_failure.
+    """
+
+    def __init__(self, message: str, failure_class: str):
+        super().__init__(message)
+        self.failure_class = failure_class
+
+def parse_tokens(value: str) -> List[Dict[str, Any]]:
+    """
+    Parse a token list such as ``THORDATA_SCRAPER_TOKENS``.
+
+    Entries are comma-separated; ``token:weight`` gives a token a dispatch
+    weight (default 1).
+
+    Returns:
+        List of dicts with token and weight
+    """
+    specs = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        token, _, weight = entry.partition(":")
+        try:
+            specs.append({"token": token.strip(), "weight": float(weight) if weight else 1.0})
+        except ValueError:
+            raise ValueError(f"Invalid token weight in {entry[:4]}...: {weight!r}")
+    return specs
+
+def _mask(token: str) -> str:
+    """Token prefix safe to show in logs and stats"""
+    return f"{token[:4]}..."
+
+class _TokenSlot:
+    """Dispatch state of one token"""
+
+    def __init__(self, token: str, weight: float, rate: Optional[float], concurrency: int):
+        self.token = token
+        self.name = _mask(token)
+        self.weight = weight
+        self.limiter = RateLimiter(rate) if rate else None
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.quarantined_until = 0.0
+        self.quarantine_reason: Optional[str] = None
+
+class TokenPool:
+    """
+    Client facade that dispatches each call to one of several scraper tokens.
+
+    Every token has its own rate limiter and a number of concurrency slots.
+    A call goes to an available token (not quarantined, with a free slot),
+    preferring tokens whose rate limit allows a call right away:
+
+    - ``least_loaded``: the token with the fewest calls in flight per unit
+      of weight
+    - ``weighted``: a random token, chosen proportionally to its weight
+
+    A token that fails with an authentication or quota error is quarantined
+    for a while and the call is retried on another token; rate-limit errors
+    cool a token down briefly. Aggregate throughput therefore scales with
+    the number of healthy tokens.
+    """
+
+    def __init__(
+        self,
+        tokens: List[Union[str, Dict[str, Any]]],
+        pool=None,
+        strategy: str = TOKEN_POOL_CONFIG["strategy"],
+        rate: Optional[float] = TOKEN_POOL_CONFIG["rate"],
+        concurrency: int = TOKEN_POOL_CONFIG["concurrency"],
+        quarantine: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            tokens: Scraper tokens, or dicts with token and optional weight,
+                    rate and concurrency overriding the pool defaults
+            pool: ClientPool to borrow clients from (default: the process-wide pool)
+            strategy: "least_loaded" or "weighted"
+            rate: Default requests per second per token (None: unlimited)
+            concurrency: Default concurrent calls per token
+            quarantine: Seconds a token is taken out of rotation per failure
+                        class (default: TOKEN_POOL_CONFIG["quarantine"])
+
+        Raises:
+            ValueError: If no tokens are given or the strategy is unknown
+        """
+        if strategy not in DISPATCH_STRATEGIES:
+            raise ValueError(f"Unknown dispatch strategy: {strategy}. Use one of {DISPATCH_STRATEGIES}")
+        specs = [{"token": t} if isinstance(t, str) else t for t in tokens]
+        if not specs:
+            raise ValueError("TokenPool needs at least one token")
+        self.pool = pool or get_client_pool()
+        self.strategy = strategy
+        self.quarantine = dict(TOKEN_POOL_CONFIG["quarantine"], **(quarantine or {}))
+        self.slots = [
+            _TokenSlot(
+                spec["token"],
+                spec.get("weight", 1.0),
+                spec.get("rate", rate),
+                spec.get("concurrency", concurrency)
+            )
+            for spec in specs
+        ]
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_env(cls, pool=None, **kwargs) -> Optional["TokenPool"]:
+        """
+        Build a pool from ``THORDATA_SCRAPER_TOKENS`` (comma-separated,
+        optional ``:weight`` per token).
+
+        Returns:
+            TokenPool, or None if the variable is not set
+        """
+        value = os.getenv("THORDATA_SCRAPER_TOKENS")
+        if not value or not value.strip():
+            return None
+        return cls(parse_tokens(value), pool=pool, **kwargs)
+
+    @property
+    def tokens(self) -> List[str]:
+        """All tokens, in configuration order"""
+        return [slot.token for slot in self.slots]
+
+    def _select(self, exclude: set) -> _TokenSlot:
+        """
+        Reserve a concurrency slot on a token, waiting for one to free up.
+
+        Raises:
+            NoTokenAvailable: If every token not yet tried is quarantined
+        """
+        token = current_token()
+        with self._condition:
+            while True:
+                now = time.time()
+                healthy = [s for s in self.slots if s.quarantined_until <= now and s.token not in exclude]
+                if not healthy:
+                    quarantined = [s for s in self.slots if s.quarantined_until > now]
+                    reasons = {s.quarantine_reason for s in quarantined}
+                    raise NoTokenAvailable(
+                        "All scraper tokens are quarantined: "
+                        + ", ".join(f"{s.name} ({s.quarantine_reason})" for s in quarantined),
+                        next((k for k in ("rate_limited", "quota", "auth") if k in reasons), "other")
+                    )
+                free = [s for s in healthy if s.in_flight < s.concurrency]
+                if free:
+                    if self.strategy == "weighted":
+                        # Weighted random order (each token first with probability proportional to its weight)
+                        free.sort(key=lambda s: random.random() ** (1 / s.weight), reverse=True)
+                    else:
+                        free.sort(key=lambda s: s.in_flight / s.weight)
+                    # Prefer a token that can call right away over one that must wait for its rate limit
+                    chosen = next((s for s in free if s.limiter is None or s.limiter.try_acquire()), None)
+                    rate_limited = chosen is None
+                    chosen = chosen or free[0]
+                    chosen.in_flight += 1
+                    break
+                self._condition.wait(0.25)
+                if token is not None:
+                    token.raise_if_cancelled()
+        if rate_limited:
+            if token is None:
+                chosen.limiter.acquire()
+            else:
+                while not chosen.limiter.acquire(timeout=0.25):
+                    if token.cancelled:
+                        self._release(chosen)
+                        token.raise_if_cancelled()
+        return chosen
+
+    def _release(self, slot: _TokenSlot):
+        """Free a reserved concurrency slot"""
+        with self._condition:
+            slot.in_flight -= 1
+            self._condition.notify()
+
+    def _quarantine(self, slot: _TokenSlot, kind: str, exc: Exception):
+        """Take a token out of rotation after an auth, quota or rate-limit failure"""
+        seconds = self.quarantine[kind]
+        with self._condition:
+            slot.quarantined_until = time.time() + seconds
+            slot.quarantine_reason = kind
+        QUARANTINES.inc(kind=kind)
+        logger.warning(f"Quarantining token {slot.name} for {seconds:.0f}s after {kind} error: {exc}")
+
+    def serp_search_advanced(self, req):
+        """
+        Run a SERP request on a pooled client of the selected token.
+
+        Auth and quota failures quarantine the token and move the request
+        to the next available token.
+
+        Raises:
+            NoTokenAvailable: If every token is quarantined
+            Exception: The API error of the last token tried
+        """
+        tried = set()
+        while True:
+            slot = self._select(tried)
+            try:
+                with self.pool.acquire(slot.token) as client:
+                    response = client.serp_search_advanced(req)
+            except Exception as e:
+                kind = classify_failure(e)
+                with self._condition:
+                    slot.calls += 1
+                    slot.errors += 1
+                TOKEN_CALLS.inc(token=slot.name, outcome=kind)
+                if kind not in self.quarantine:
+                    raise
+                self._quarantine(slot, kind, e)
+                tried.add(slot.token)
+                if len(tried) == len(self.slots):
+                    raise
+                continue
+            finally:
+                self._release(slot)
+            with self._condition:
+                slot.calls += 1
+            TOKEN_CALLS.inc(token=slot.name, outcome="success")
+            return response
+
+    def release_quarantine(self, token: Optional[str] = None):
+        """Put a quarantined token (or all of them) back into rotation"""
+        with self._condition:
+            for slot in self.slots:
+                if token is None or slot.token == token:
+                    slot.quarantined_until = 0.0
+                    slot.quarantine_reason = None
+            self._condition.notify_all()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Get per-token state (tokens are masked)"""
+        now = time.time()
+        with self._condition:
+            return [
+                {
+                    "token": slot.name,
+                    "weight": slot.weight,
+                    "in_flight": slot.in_flight,
+                    "concurrency": slot.concurrency,
+                    "calls": slot.calls,
+                    "errors": slot.errors,
+                    "quarantined_for": max(0.0, slot.quarantined_until - now),
+                    "quarantine_reason": slot.quarantine_reason if slot.quarantined_until > now else None
+                }
+                for slot in self.slots
+            ]
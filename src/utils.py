@@ -1,9 +1,13 @@
 # src/utils.py
 import os
 import json
+import time
 import pandas as pd
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from .compression import open_output, output_path
+from .hooks import hooks
 
 logger = logging.getLogger("GoogleNewsScraper")
 
@@ -97,26 +101,195 @@ def parse_serp_news(data: Dict) -> List[Dict]:
         
     return results
 
-def save_to_csv(data: List[Dict], filename: str):
-    """Save list of dicts to CSV"""
+# Query parameters that only track the click and do not identify the article
+TRACKING_PARAMS = {"gclid", "fbclid", "ocid", "cmpid", "mc_cid", "mc_eid", "ref", "ref_src", "guccounter"}
+
+class SearchResult(list):
+    """
+    List of news items returned by ``GoogleNewsScraper.search``.
+
+    ``metadata`` describes where the items came from:
+        source: "api", "cache", "archive", "negative", "error", "refused"
+                or "job" (read back from a BatchJob checkpoint)
+        fetched_at: Epoch time the items were fetched from the API
+        age: Seconds since fetched_at when the result was returned
+
+    An empty result with source "api" is a real empty response. Source
+    "negative" means the API was not called because the request recently
+    came back empty or failed; ``negative`` holds the kind ("empty" or a
+    failure class), plus ``reason`` and ``retry_at``. Results with source
+    "error" carry the ``failure`` class, ``reason`` and ``retry_at``, and
+    "refused" results (budget exhausted) the ``reason``.
+    """
+
+    def __init__(self, items: Iterable[Dict] = (), source: str = "api", fetched_at: Optional[float] = None, **extra):
+        super().__init__(items)
+        now = time.time()
+        fetched_at = now if fetched_at is None else fetched_at
+        self.metadata = dict(extra, source=source, fetched_at=fetched_at, age=max(0.0, now - fetched_at))
+
+def canonicalize_link(url: str) -> str:
+    """
+    Normalize an article URL so the same story found via different
+    queries or locales maps to the same key.
+    
+    Lowercases scheme and host, drops fragments, tracking parameters
+    (utm_* and common click IDs) and trailing slashes, and sorts the
+    remaining query parameters.
+    
+    Args:
+        url: Article link
+    
+    Returns:
+        Canonical link (the input unchanged if it cannot be parsed)
+    """
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+def merge_results(
+    records: Iterable[Dict],
+    origin_keys: Tuple[str, ...] = ("query", "country", "language")
+) -> List[Dict]:
+    """
+    Deduplicate tagged records on canonical link, keeping first-seen order.
+    
+    Records are news items carrying origin fields (e.g. the query and
+    country that found them). The first occurrence of each article is kept
+    and collects every distinct origin in a ``found_by`` list.
+    
+    Args:
+        records: Tagged news items
+        origin_keys: Fields that describe where a record came from
+    
+    Returns:
+        Unique records with ``found_by``
+    """
+    merged: Dict[str, Dict] = {}
+    for record in records:
+        key = canonicalize_link(record.get("link"))
+        origin = {k: record.get(k) for k in origin_keys}
+        existing = merged.get(key)
+        if existing is None:
+            record = dict(record, found_by=[origin])
+            merged[key] = record
+        elif origin not in existing["found_by"]:
+            existing["found_by"].append(origin)
+    return list(merged.values())
+
+def load_query_specs(source) -> List[Dict[str, Any]]:
+    """
+    Load query specs for batch operations.
+    
+    Each non-empty line is either a JSON object
+    (``{"query": "AI", "country": "uk", "language": "en", "limit": 20}``) or
+    tab-separated ``query[<TAB>country[<TAB>language[<TAB>limit]]]``.
+    Lines starting with ``#`` are ignored.
+    
+    Args:
+        source: File path, or an iterable of lines (e.g. sys.stdin)
+    
+    Returns:
+        List of dicts with query, country, language and limit (None if not given)
+    
+    Raises:
+        ValueError: If a line is malformed
+    """
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            return load_query_specs(f.readlines())
+    
+    specs = []
+    for line_no, line in enumerate(source, 1):
+        # Only drop the line ending: tabs delimit fields, even a leading empty one
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("{"):
+            try:
+                data = json.loads(stripped)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_no}: invalid JSON: {e}")
+        else:
+            fields = [field.strip() for field in line.split("\t")]
+            data = dict(zip(["query", "country", "language", "limit"], fields))
+        if not data.get("query"):
+            raise ValueError(f"Line {line_no}: query is required")
+        limit = data.get("limit")
+        try:
+            limit = int(limit) if limit not in (None, "") else None
+        except (TypeError, ValueError):
+            raise ValueError(f"Line {line_no}: limit must be an integer, got {limit!r}")
+        specs.append({
+            "query": data["query"],
+            "country": data.get("country") or None,
+            "language": data.get("language") or None,
+            "limit": limit
+        })
+    return specs
+
+def save_to_csv(data: List[Dict], filename: str, compression: Optional[str] = None) -> Optional[str]:
+    """
+    Save list of dicts to CSV.
+    
+    Args:
+        data: News items
+        filename: File name inside the output directory
+        compression: None, "gz" or "zst" (appended to the file name)
+    
+    Returns:
+        Path of the written file, or None if there was nothing to save
+    """
     if not data:
-        return
+        return None
     
     os.makedirs("output", exist_ok=True)
-    filepath = os.path.join("output", filename)
+    filepath = output_path(os.path.join("output", filename), compression)
     
-    df = pd.DataFrame(data)
-    df.to_csv(filepath, index=False, encoding="utf-8-sig")
+    with hooks.stage("export", format="csv", path=filepath, items=len(data)):
+        df = pd.DataFrame(data)
+        with open_output(filepath, compression, encoding="utf-8-sig", newline="") as f:
+            df.to_csv(f, index=False)
     _safe_print(f"[SAVED] Saved {len(data)} items to: {filepath}")
+    return filepath
 
-def save_to_json(data: List[Dict], filename: str):
+def save_to_json(data: List[Dict], filename: str, compression: Optional[str] = None) -> Optional[str]:
+    """
+    Save list of dicts to JSON.
+    
+    Compressed files are written without indentation, since they are
+    meant for storage rather than reading.
+    
+    Args:
+        data: News items
+        filename: File name inside the output directory
+        compression: None, "gz" or "zst" (appended to the file name)
+    
+    Returns:
+        Path of the written file, or None if there was nothing to save
+    """
     if not data:
-        return
+        return None
     os.makedirs("output", exist_ok=True)
-    filepath = os.path.join("output", filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    filepath = output_path(os.path.join("output", filename), compression)
+    with hooks.stage("export", format="json", path=filepath, items=len(data)):
+        with open_output(filepath, compression, encoding="utf-8") as f:
+            if compression:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            else:
+                json.dump(data, f, ensure_ascii=False, indent=2)
     _safe_print(f"[SAVED] Saved {len(data)} items to: {filepath}")
+    return filepath
 
 def _safe_print(message: str):
     """Print message safely, handling encoding issues on Windows"""
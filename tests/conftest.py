@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the offline unit tests
+Every scraper is built on benchmarks/fake_client.py, so no token or network is needed
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fake_client import FakeThordataClient  # noqa: E402
+from src.budget import CreditLedger  # noqa: E402
+from src.cache import clear_cache  # noqa: E402
+from src.hooks import HookManager  # noqa: E402
+from src.negative_cache import NegativeCache  # noqa: E402
+from src.scraper import GoogleNewsScraper  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Start every test with an empty global cache, inside its own working directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("THORDATA_SCRAPER_TOKENS", raising=False)
+    clear_cache()
+    yield
+    clear_cache()
+
+@pytest.fixture
+def fake_client():
+    """Fake SERP client returning synthetic results instantly"""
+    return FakeThordataClient(seed=1)
+
+@pytest.fixture
+def make_scraper():
+    """
+    Build a scraper on a fake client with its own ledger, hooks and negative cache
+    (with ``replay_dir`` and no client, the scraper replays without a live fallback)
+    """
+    def make(client=None, **kwargs):
+        kwargs.setdefault("thumbnails", "drop")
+        kwargs.setdefault("ledger", CreditLedger("test"))
+        kwargs.setdefault("hooks", HookManager())
+        kwargs.setdefault("negative_cache", NegativeCache())
+        if client is None and not kwargs.get("replay_dir"):
+            client = FakeThordataClient(seed=1)
+        return GoogleNewsScraper(client=client, **kwargs)
+    return make
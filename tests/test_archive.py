@@ -0,0 +1,70 @@
+"""Tests for the append-only article archive and its compaction"""
+from src.archive import ArticleArchive
+
+DAY = 86400
+T0 = 1_700_000_000.0
+
+def item(n, title=None):
+    return {"title": title or f"Story {n}", "source": "Example", "link": f"https://news.example.com/{n}?utm_source=x"}
+
+def test_compaction_merges_repeat_observations(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "archive"))
+    archive.append([item(1), item(2)], query="ai", country="us", language="en", seen_at=T0)
+    archive.append([item(1, "Story 1 (updated)")], query="ml", country="uk", language="en", seen_at=T0 + 60)
+
+    summary = archive.compact()
+    assert summary == {"logs": 1, "observations": 3, "segments": 1}
+    assert archive.stats() == {"articles": 2, "segments": 1, "pending_logs": 0}
+
+    record = archive.get("https://news.example.com/1")
+    assert record["seen_count"] == 2
+    assert record["first_seen"] == T0 and record["last_seen"] == T0 + 60
+    assert record["item"]["title"] == "Story 1 (updated)"
+    assert [origin["query"] for origin in record["found_by"]] == ["ai", "ml"]
+
+def test_compaction_is_incremental(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "archive"))
+    archive.append([item(1)], query="ai", seen_at=T0)
+    archive.compact()
+    archive.append([item(1)], query="ai", seen_at=T0 + DAY)
+    archive.append([item(2)], query="ai", seen_at=T0 + DAY)
+
+    # Pending observations are visible before compaction
+    assert archive.get("https://news.example.com/1")["seen_count"] == 2
+    assert archive.compact()["observations"] == 2
+    assert archive.compact()["logs"] == 0
+
+    record = archive.get("https://news.example.com/1")
+    assert record["seen_count"] == 2
+    assert record["first_seen"] == T0
+    assert archive.stats()["segments"] == 2
+
+def test_iter_range_filters_by_first_seen(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "archive"))
+    for n in range(3):
+        archive.append([item(n)], query="ai", seen_at=T0 + n * DAY)
+    archive.compact()
+    archive.append([item(3)], query="ai", seen_at=T0 + 3 * DAY)
+
+    titles = [r["item"]["title"] for r in archive.iter_range(T0 + DAY, T0 + 3 * DAY)]
+    assert titles == ["Story 1", "Story 2"]
+    assert len(archive.items()) == 4
+    assert len(list(archive.iter_range(include_pending=False))) == 3
+
+def test_items_without_link_are_skipped(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "archive"))
+    assert archive.append([{"title": "no link"}]) == 0
+
+def test_results_round_trip(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "archive"))
+    assert archive.get_results("abcdef") is None
+    archive.put_results("abcdef", {"query": "ai"}, [item(1)], fetched_at=T0)
+    stored = archive.get_results("abcdef")
+    assert stored["fetched_at"] == T0
+    assert stored["items"] == [item(1)]
+
+def test_close_compacts(tmp_path):
+    root = str(tmp_path / "archive")
+    with ArticleArchive(root) as archive:
+        archive.append([item(1)], query="ai", seen_at=T0)
+    assert ArticleArchive(root).stats()["articles"] == 1
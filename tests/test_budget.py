@@ -0,0 +1,56 @@
+"""Tests for credit ledgers and budget limits"""
+import pytest
+
+from src.budget import BudgetExceeded, CreditLedger
+
+def test_hard_limit_refuses_further_calls():
+    ledger = CreditLedger("job", hard_limit=2)
+    ledger.record_request()
+    ledger.charge()
+    ledger.charge()
+    with pytest.raises(BudgetExceeded):
+        ledger.charge()
+    summary = ledger.summary()
+    assert summary["api_calls"] == 2
+    assert summary["retries"] == 1
+    assert summary["refused"] == 1
+    assert ledger.remaining() == 0
+
+def test_parent_limit_applies_to_child():
+    parent = CreditLedger("process", hard_limit=1)
+    child = CreditLedger("job", parent=parent)
+    child.record_request()
+    child.charge()
+    assert parent.summary()["api_calls"] == 1
+    with pytest.raises(BudgetExceeded, match="process"):
+        child.charge()
+    assert child.remaining() == 0
+
+def test_soft_limit():
+    ledger = CreditLedger(soft_limit=1)
+    assert not ledger.over_soft_limit()
+    ledger.record_request()
+    ledger.charge()
+    assert ledger.over_soft_limit()
+
+def test_counts_persist_across_instances(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    ledger = CreditLedger("job", hard_limit=3, path=path)
+    ledger.record_request()
+    ledger.charge()
+    ledger.record_cache_hit()
+    ledger.save()
+
+    resumed = CreditLedger("job", hard_limit=3, path=path)
+    assert resumed.summary()["api_calls"] == 1
+    assert resumed.summary()["cache_avoided"] == 1
+    assert resumed.remaining() == 2
+
+def test_scraper_refuses_search_past_budget(make_scraper, fake_client):
+    ledger = CreditLedger("job", hard_limit=1)
+    scraper = make_scraper(fake_client, ledger=ledger)
+    assert len(scraper.search("first", num=5)) == 5
+    refused = scraper.search("second", num=5)
+    assert refused == []
+    assert refused.metadata["source"] == "refused"
+    assert fake_client.calls == 1
@@ -0,0 +1,102 @@
+"""Tests for the sharded in-memory cache and its snapshots"""
+import gzip
+import pickle
+import threading
+import time
+
+import pytest
+
+from src.cache import SimpleCache, SNAPSHOT_VERSION
+from src.metrics import metrics
+
+def test_keys_spread_over_shards():
+    cache = SimpleCache(shards=8)
+    for i in range(200):
+        cache.set(f"key-{i}", i)
+    assert cache.size() == 200
+    assert sum(1 for shard in cache._shards if shard) > 1
+    assert all(cache.get(f"key-{i}") == i for i in range(200))
+
+def test_rejects_zero_shards():
+    with pytest.raises(ValueError):
+        SimpleCache(shards=0)
+
+def test_concurrent_hits_and_misses_are_all_counted():
+    cache = SimpleCache(name="test-striping", shards=4)
+    for i in range(50):
+        cache.set(f"key-{i}", i)
+
+    def worker():
+        for i in range(100):
+            cache.get(f"key-{i}")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.counter("cache_hits_total").value(cache="test-striping") == 8 * 50
+    assert metrics.counter("cache_misses_total").value(cache="test-striping") == 8 * 50
+
+def test_expired_entries_are_misses():
+    cache = SimpleCache()
+    cache.set("key", "value", ttl=-1)
+    assert cache.get("key") is None
+    assert cache.size() == 0
+
+def test_compressed_values_are_copies():
+    cache = SimpleCache(compress_threshold=64, codec="zlib")
+    small, large = {"a": [1]}, {"a": list(range(500))}
+    cache.set("small", small)
+    cache.set("large", large)
+    assert cache.get("small") == small and cache.get("small") is not small
+    assert cache.get("large") == large and cache.get("large") is not large
+
+def test_snapshot_round_trip_keeps_ttl_hits_and_label(tmp_path):
+    path = str(tmp_path / "cache.pkl.gz")
+    source = SimpleCache()
+    source.set("fresh", {"items": [1, 2]}, ttl=300, label="search")
+    source.set("stale", "gone", ttl=-1)
+    source.get("fresh")
+    assert source.save_snapshot(path) == 1
+
+    target = SimpleCache(shards=3)
+    assert target.load_snapshot(path) == 1
+    assert target.get("fresh") == {"items": [1, 2]}
+    entry = target.entries()[0]
+    assert entry["label"] == "search"
+    assert entry["hits"] == 2
+    assert 0 < entry["ttl"] <= 300
+
+def test_snapshot_does_not_overwrite_by_default(tmp_path):
+    path = str(tmp_path / "cache.pkl.gz")
+    source = SimpleCache()
+    source.set("key", "old")
+    source.save_snapshot(path)
+
+    target = SimpleCache()
+    target.set("key", "new")
+    assert target.load_snapshot(path) == 0
+    assert target.get("key") == "new"
+    assert target.load_snapshot(path, overwrite=True) == 1
+    assert target.get("key") == "old"
+
+def test_snapshot_with_unknown_version_is_rejected(tmp_path):
+    path = str(tmp_path / "cache.pkl.gz")
+    with gzip.open(path, "wb") as f:
+        pickle.dump({"version": SNAPSHOT_VERSION + 1, "saved_at": 0, "entries": []}, f)
+    with pytest.raises(ValueError):
+        SimpleCache().load_snapshot(path)
+
+def test_snapshot_skips_unreadable_records(tmp_path):
+    path = str(tmp_path / "cache.pkl.gz")
+    good = {"key": "good", "value": pickle.dumps("ok"), "ttl": 60, "age": 0, "hits": 0, "label": None}
+    bad = dict(good, key="bad", value=b"not a pickle")
+    with gzip.open(path, "wb") as f:
+        pickle.dump({"version": SNAPSHOT_VERSION, "saved_at": time.time(), "entries": [bad, {"key": "x"}, good]}, f)
+
+    cache = SimpleCache()
+    assert cache.load_snapshot(path) == 1
+    assert cache.get("good") == "ok"
+    assert cache.get("bad") is None
@@ -0,0 +1,75 @@
+"""Tests for cancel tokens and gather"""
+import threading
+import time
+
+import pytest
+
+from src.cancellation import CancelToken, OperationCancelled, check_cancelled, gather
+
+def test_gather_returns_results_in_submission_order():
+    delays = {"a": 0.05, "b": 0.0, "c": 0.02}
+    calls = [(key, lambda d=d, k=key: (time.sleep(d), k)[1]) for key, d in delays.items()]
+    outcome = gather(calls, max_workers=3)
+    assert outcome.completed == [("a", "a"), ("b", "b"), ("c", "c")]
+    assert outcome.reason is None
+    assert outcome.skipped == [] and outcome.abandoned == []
+
+def test_gather_with_no_calls():
+    outcome = gather([])
+    assert outcome.completed == [] and outcome.reason is None
+
+def test_gather_stops_once_target_is_reached():
+    calls = [(i, lambda i=i: (time.sleep(0.05), i)[1]) for i in range(10)]
+    seen = []
+
+    def accept(key, result):
+        seen.append(key)
+        return len(seen) == 3
+
+    outcome = gather(calls, accept=accept, max_workers=1)
+    assert outcome.reason == "target"
+    assert [key for key, _ in outcome.completed] == [0, 1, 2]
+    assert sorted(outcome.skipped + outcome.abandoned) == list(range(3, 10))
+    assert len(outcome.skipped) >= 5
+
+def test_gather_abandons_calls_past_the_deadline():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        check_cancelled()
+        return "late"
+
+    try:
+        start = time.time()
+        outcome = gather([("fast", lambda: "ok"), ("slow", slow)], deadline=0.2, max_workers=2)
+        assert time.time() - start < 2
+    finally:
+        release.set()
+    assert outcome.reason == "deadline"
+    assert outcome.completed == [("fast", "ok")]
+    assert outcome.abandoned == ["slow"]
+
+def test_gather_cancelled_from_outside():
+    token = CancelToken()
+    started = threading.Event()
+
+    def wait_for_cancel():
+        started.set()
+        token.sleep(5)
+
+    timer = threading.Timer(0.1, token.cancel)
+    timer.start()
+    outcome = gather([("wait", wait_for_cancel)], token=token)
+    timer.join()
+    assert started.is_set()
+    assert outcome.completed == []
+    assert outcome.abandoned == ["wait"]
+
+def test_bound_token_cancels_check():
+    token = CancelToken()
+    token.cancel("stop")
+    with token.bind():
+        with pytest.raises(OperationCancelled):
+            check_cancelled()
+    check_cancelled()
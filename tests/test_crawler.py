@@ -0,0 +1,70 @@
+"""Tests for crawl shards and partition merging"""
+import json
+
+from fake_client import FakeThordataClient
+from src.budget import CreditLedger
+from src.cache import clear_cache
+from src.crawler import _crawl_shard, merge_partitions
+from src.negative_cache import NegativeCache
+
+SPECS = [
+    {"query": "ai", "country": "us", "language": "en", "limit": 2},
+    {"query": "ml", "country": None, "language": None, "limit": None},
+]
+
+def write_jsonl(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_merge_partitions_dedups_on_canonical_link(tmp_path):
+    write_jsonl(tmp_path / "part-00000.jsonl", [
+        {"title": "A", "link": "https://example.com/a", "query": "ai", "country": "us", "language": "en"},
+        {"title": "B", "link": "https://example.com/b", "query": "ai", "country": "us", "language": "en"},
+    ])
+    write_jsonl(tmp_path / "part-00001.jsonl", [
+        {"title": "A again", "link": "https://EXAMPLE.com/a/?utm_source=rss", "query": "ai", "country": "us", "language": "de"},
+        {"title": "A", "link": "https://example.com/a", "query": "ai", "country": "us", "language": "en"},
+        {"title": "C", "link": "https://example.com/c", "query": "ml", "country": "uk", "language": None},
+    ])
+    write_jsonl(tmp_path / "other.jsonl", [{"title": "ignored", "link": "https://example.com/x"}])
+
+    summary = merge_partitions(str(tmp_path))
+    assert summary["records"] == 5 and summary["unique"] == 3
+    merged = read_jsonl(summary["path"])
+    assert [r["title"] for r in merged] == ["A", "B", "C"]
+    assert merged[0]["found_by"] == [
+        {"query": "ai", "country": "us", "language": "en"},
+        {"query": "ai", "country": "us", "language": "de"},
+    ]
+    assert merged[2]["found_by"] == [{"query": "ml", "country": "uk", "language": None}]
+
+def run_shard(tmp_path, client, job_dir=None):
+    scraper_kwargs = {"client": client, "thumbnails": "drop", "ledger": CreditLedger("test"),
+                      "negative_cache": NegativeCache()}
+    return _crawl_shard(0, SPECS, str(tmp_path), 3, "uk", None, scraper_kwargs, {}, job_dir)
+
+def test_crawl_shard_writes_tagged_partition(tmp_path):
+    client = FakeThordataClient()
+    summary = run_shard(tmp_path, client)
+    assert summary == {"shard": 0, "queries": 2, "empty": 0, "resumed": 0, "items": 5, "path": summary["path"]}
+    records = read_jsonl(summary["path"])
+    assert [(r["query"], r["country"], r["language"]) for r in records] == [("ai", "us", "en")] * 2 + [("ml", "uk", None)] * 3
+    assert client.calls == 2
+
+def test_crawl_shard_resumes_from_job(tmp_path):
+    job_dir = str(tmp_path / "job")
+    first = run_shard(tmp_path, FakeThordataClient(), job_dir)
+    assert first["resumed"] == 0
+    records = read_jsonl(first["path"])
+
+    clear_cache()
+    client = FakeThordataClient()
+    second = run_shard(tmp_path, client, job_dir)
+    assert second["resumed"] == 2 and second["items"] == 5
+    assert client.calls == 0
+    assert read_jsonl(second["path"]) == records
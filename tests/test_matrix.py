@@ -0,0 +1,46 @@
+"""Tests for query x country x language matrix search"""
+from fake_client import FakeThordataClient, LatencyModel
+
+def test_matrix_expands_every_combination(make_scraper, fake_client):
+    scraper = make_scraper(fake_client)
+    merged, outcome = scraper.search_matrix_with_report(["ai", "ml"], ["us", "uk"], ["en", "de"], num=3, max_workers=4)
+
+    assert fake_client.calls == 8
+    assert [key for key, _ in outcome.completed] == [
+        (query, country, language)
+        for query in ("ai", "ml") for country in ("us", "uk") for language in ("en", "de")
+    ]
+    assert outcome.reason is None
+
+def test_matrix_merges_duplicates_into_found_by(make_scraper, fake_client):
+    scraper = make_scraper(fake_client)
+    merged, _ = scraper.search_matrix_with_report(["ai", "ml"], ["us", "uk"], ["en", "de"], num=3)
+
+    # The fake client returns the same links for a query in every locale
+    assert len(merged) == 6
+    assert [item["link"] for item in merged[:3]] == [f"https://news.example.com/ai/{i}" for i in range(3)]
+    assert merged[0]["found_by"] == [
+        {"query": "ai", "country": "us", "language": "en"},
+        {"query": "ai", "country": "us", "language": "de"},
+        {"query": "ai", "country": "uk", "language": "en"},
+        {"query": "ai", "country": "uk", "language": "de"},
+    ]
+    assert (merged[0]["query"], merged[0]["country"], merged[0]["language"]) == ("ai", "us", "en")
+
+def test_matrix_without_languages_uses_default(make_scraper, fake_client):
+    merged = make_scraper(fake_client).search_matrix(["ai"], ["us", "uk"], num=2)
+    assert len(merged) == 2
+    assert [origin["language"] for origin in merged[0]["found_by"]] == [None, None]
+    assert make_scraper(fake_client).search_matrix([], ["us"]) == []
+
+def test_matrix_stops_and_truncates_at_target(make_scraper):
+    client = FakeThordataClient(latency=LatencyModel(kind="fixed", median=0.02))
+    scraper = make_scraper(client)
+    queries = [f"topic {i}" for i in range(8)]
+    merged, outcome = scraper.search_matrix_with_report(queries, ["us"], num=3, target=4, max_workers=1)
+
+    assert len(merged) == 4
+    assert outcome.reason == "target"
+    assert [key for key, _ in outcome.completed] == [("topic 0", "us", None), ("topic 1", "us", None)]
+    assert outcome.skipped
+    assert client.calls < len(queries)
@@ -0,0 +1,55 @@
+"""Tests for the metrics registry and its exports"""
+import json
+
+from src.metrics import MetricsRegistry
+
+def test_histogram_exposition():
+    registry = MetricsRegistry(prefix="test")
+    latency = registry.histogram("latency_seconds", "Request latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, endpoint="search")
+
+    lines = registry.to_prometheus().splitlines()
+    assert lines[:2] == ["# HELP test_latency_seconds Request latency", "# TYPE test_latency_seconds histogram"]
+    assert lines[2:] == [
+        'test_latency_seconds_bucket{endpoint="search",le="0.1"} 2',
+        'test_latency_seconds_bucket{endpoint="search",le="1"} 3',
+        'test_latency_seconds_bucket{endpoint="search",le="+Inf"} 4',
+        'test_latency_seconds_sum{endpoint="search"} 3.65',
+        'test_latency_seconds_count{endpoint="search"} 4',
+    ]
+    assert latency.percentile(50, endpoint="search") == 0.1
+    assert latency.percentile(50, endpoint="other") is None
+
+def test_counter_exposition_escapes_label_values():
+    registry = MetricsRegistry(prefix="test")
+    failures = registry.counter("failures_total", "Failures by reason")
+    failures.inc(reason='bad "quote"')
+    failures.inc(2, reason="back\\slash\nnext line")
+    failures.inc()
+
+    assert registry.to_prometheus().splitlines() == [
+        "# HELP test_failures_total Failures by reason",
+        "# TYPE test_failures_total counter",
+        "test_failures_total 1",
+        'test_failures_total{reason="back\\\\slash\\nnext line"} 2',
+        'test_failures_total{reason="bad \\"quote\\""} 1',
+    ]
+
+def test_collectors_add_to_counter_values():
+    registry = MetricsRegistry(prefix="test")
+    hits = registry.counter("hits_total")
+    hits.inc(cache="a")
+
+    def collect():
+        return {(("cache", "a"),): 2, (("cache", "b"),): 5}
+
+    hits.add_collector(collect)
+    assert hits.value(cache="a") == 3
+    assert hits.total() == 8
+    snapshot = json.loads(registry.to_json())
+    assert {"labels": {"cache": "b"}, "value": 5} in snapshot["counters"]["test_hits_total"]
+
+def test_same_name_returns_same_metric():
+    registry = MetricsRegistry(prefix="test")
+    assert registry.counter("calls_total") is registry.counter("calls_total")
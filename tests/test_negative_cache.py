@@ -0,0 +1,60 @@
+"""Tests for negative caching and failure classification"""
+from fake_client import FakeThordataClient
+from src.negative_cache import NegativeCache, classify_failure
+
+class StatusError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+def test_classify_failure():
+    assert classify_failure(StatusError("nope", 401)) == "auth"
+    assert classify_failure(StatusError("pay", 402)) == "quota"
+    assert classify_failure(StatusError("slow down", 429)) == "rate_limited"
+    assert classify_failure(StatusError("oops", 503)) == "server"
+    assert classify_failure(TimeoutError("read")) == "network"
+    assert classify_failure(RuntimeError("Simulated API failure")) == "other"
+
+def test_consecutive_negatives_back_off_exponentially():
+    cache = NegativeCache(empty_ttl=10, backoff_factor=2, max_ttl=25)
+    first = cache.record_empty("key")
+    second = cache.record_empty("key")
+    third = cache.record_empty("key")
+    assert first["until"] - first["at"] == 10
+    assert second["count"] == 2 and second["until"] - second["at"] == 20
+    assert third["count"] == 3 and third["until"] - third["at"] == 25
+    assert third["since"] == first["since"]
+
+def test_failure_uses_its_class_ttl():
+    cache = NegativeCache(failure_ttls={"auth": 100})
+    entry = cache.record_failure("key", StatusError("forbidden", 403))
+    assert entry["kind"] == "auth"
+    assert entry["until"] - entry["at"] == 100
+    assert cache.stats() == {"auth": 1}
+
+def test_success_clears_entry():
+    cache = NegativeCache()
+    cache.record_empty("key")
+    assert cache.hit("key")["kind"] == "empty"
+    cache.record_success("key")
+    assert cache.hit("key") is None
+
+def test_empty_entries_can_be_ignored():
+    cache = NegativeCache()
+    cache.record_empty("key")
+    assert cache.hit("key", include_empty=False) is None
+
+def test_expired_entry_is_not_served():
+    cache = NegativeCache(empty_ttl=-1)
+    cache.record_empty("key")
+    assert cache.get("key") is None
+
+def test_scraper_skips_recently_empty_request(make_scraper):
+    fake_client = FakeThordataClient(responses=[{"search_metadata": {"status": "Success"}, "news_results": []}])
+    scraper = make_scraper(fake_client)
+    first = scraper.search("nothing", num=5)
+    assert first == [] and first.metadata["source"] == "api"
+    second = scraper.search("nothing", num=5)
+    assert second.metadata["source"] == "negative"
+    assert second.metadata["negative"] == "empty"
+    assert fake_client.calls == 1
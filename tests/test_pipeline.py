@@ -0,0 +1,148 @@
+"""Tests for the streaming search pipeline"""
+import json
+import os
+import threading
+
+from fake_client import FakeThordataClient, LatencyModel
+from src.budget import CreditLedger
+from src.cancellation import CancelToken
+from src.hooks import HookManager, PipelineHook
+from src.jobs import BatchJob
+from src.pipeline import JsonlSink, Pipeline, QueryFileSink
+
+SPECS = [{"query": f"topic {i}", "limit": 3} for i in range(12)]
+
+class ListSink:
+    """Collects written searches in memory"""
+
+    def __init__(self):
+        self.written = {}
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def write(self, spec, items):
+        with self._lock:
+            self.written[spec["query"]] = list(items)
+
+    def close(self):
+        self.closed = True
+
+class AuthError(Exception):
+    failure_class = "auth"
+
+class FailingClient:
+    """Refuses queries containing "bad" and answers the rest"""
+
+    def __init__(self):
+        self.fake = FakeThordataClient()
+        self.calls = 0
+
+    def serp_search_advanced(self, req):
+        self.calls += 1
+        if "bad" in req.query:
+            raise AuthError("invalid token")
+        return self.fake.serp_search_advanced(req)
+
+class StageCounter(PipelineHook):
+    def __init__(self):
+        self.ended = {}
+        self._lock = threading.Lock()
+
+    def on_stage_end(self, stage, context, elapsed, error=None):
+        with self._lock:
+            self.ended[stage] = self.ended.get(stage, 0) + 1
+
+def test_every_spec_is_written_once(make_scraper):
+    client = FakeThordataClient(latency=LatencyModel(kind="uniform", median=0.005, seed=1))
+    sink = ListSink()
+    stats = Pipeline(make_scraper(client), [sink], fetch_workers=4, parse_workers=2, queue_size=2).run(SPECS)
+
+    assert stats["queries"] == len(SPECS)
+    assert stats["items"] == 3 * len(SPECS)
+    assert stats["failed"] == [] and stats["cancelled"] is None
+    assert stats["peak_fetched"] <= 2 and stats["peak_parsed"] <= 2
+    assert sorted(sink.written) == sorted(s["query"] for s in SPECS)
+    assert all(len(items) == 3 for items in sink.written.values())
+    assert sink.closed
+    assert client.calls == len(SPECS)
+
+def test_specs_may_come_from_a_generator(make_scraper, fake_client):
+    sink = ListSink()
+    stats = Pipeline(make_scraper(fake_client), [sink]).run(dict(s) for s in SPECS[:3])
+    assert stats["queries"] == 3
+
+def test_second_run_is_served_from_cache(make_scraper, fake_client):
+    scraper = make_scraper(fake_client)
+    Pipeline(scraper, [ListSink()]).run(SPECS)
+    stats = Pipeline(scraper, [ListSink()]).run(SPECS)
+    assert stats["stored"] == len(SPECS)
+    assert fake_client.calls == len(SPECS)
+
+def test_searches_emit_hook_stages(make_scraper, fake_client):
+    hooks = HookManager()
+    counter = hooks.register(StageCounter())
+    Pipeline(make_scraper(fake_client, hooks=hooks), [ListSink()], fetch_workers=3).run(SPECS)
+    assert counter.ended["search"] == len(SPECS)
+    assert counter.ended["fetch"] == len(SPECS)
+    assert counter.ended["parse"] == len(SPECS)
+
+def test_failures_are_reported_and_negative_cached(make_scraper):
+    client = FailingClient()
+    scraper = make_scraper(client)
+    specs = [{"query": "good news"}, {"query": "bad news"}]
+    results = []
+    stats = Pipeline(scraper, [ListSink()], on_result=lambda spec, r, seconds: results.append(r)).run(specs)
+    assert stats["queries"] == 1
+    assert stats["failed"] == [{"query": "bad news", "country": "us", "error": "invalid token"}]
+    assert sorted(r.metadata["source"] for r in results) == ["api", "error"]
+
+    stats = Pipeline(scraper, [ListSink()]).run(specs)
+    assert stats["negative"] == 1 and stats["failed"] == []
+    assert client.calls == 2
+
+def test_refused_searches_count_as_failed(make_scraper, fake_client):
+    scraper = make_scraper(fake_client, ledger=CreditLedger("job", hard_limit=2))
+    stats = Pipeline(scraper, [ListSink()], fetch_workers=1).run(SPECS[:4])
+    assert stats["queries"] == 2
+    assert len(stats["failed"]) == 2
+    assert all("exhausted" in f["error"] for f in stats["failed"])
+    assert fake_client.calls == 2
+
+def test_cancelled_pipeline_takes_no_specs(make_scraper, fake_client):
+    token = CancelToken()
+    token.cancel("stop")
+    sink = ListSink()
+    stats = Pipeline(make_scraper(fake_client), [sink], cancel_token=token).run(SPECS)
+    assert stats["queries"] == 0 and stats["cancelled"] == "stop"
+    assert sink.closed and fake_client.calls == 0
+
+def test_job_checkpoints_and_resumes(make_scraper, fake_client, tmp_path):
+    job_dir = str(tmp_path / "job")
+    scraper = make_scraper(fake_client)
+    Pipeline(scraper, [ListSink()], job=BatchJob(job_dir, "batch")).run(SPECS[:4])
+    assert BatchJob(job_dir, "batch").summary() == {"completed": 4, "empty": 0, "items": 12}
+
+    stats = Pipeline(make_scraper(FakeThordataClient()), [ListSink()], job=BatchJob(job_dir, "batch")).run(SPECS[:6])
+    assert stats["resumed"] == 4
+    assert stats["queries"] == 6
+    assert fake_client.calls == 4
+
+def test_jsonl_sink_tags_items(make_scraper, fake_client, tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    Pipeline(make_scraper(fake_client), [JsonlSink(path)]).run([{"query": "ai", "country": "uk", "limit": 2}])
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2
+    assert {(r["query"], r["country"], r["language"]) for r in records} == {("ai", "uk", None)}
+
+def test_query_file_sink_names_are_unique(make_scraper, fake_client):
+    specs = [
+        {"query": "AI", "country": "us", "language": "en", "limit": 2},
+        {"query": "AI", "country": "us", "language": "en", "limit": 3},
+        {"query": "AI?", "country": "us", "language": "en", "limit": 2},
+    ]
+    sink = QueryFileSink("json")
+    Pipeline(make_scraper(fake_client), [sink]).run(specs)
+    assert len(sink.paths) == 3
+    assert len({os.path.basename(p) for p in sink.paths}) == 3
+    assert all(os.path.exists(p) for p in sink.paths)
@@ -0,0 +1,48 @@
+"""Tests for the keyword planner and planned briefings"""
+import math
+
+from src.ai_news import AINewsBriefing
+from src.planner import KeywordPlanner
+
+KEYWORDS = ["alpha", "beta", "gamma", "delta", "epsilon"]
+
+def make_planner(**kwargs):
+    kwargs.setdefault("stats_path", None)
+    return KeywordPlanner(KEYWORDS, **kwargs)
+
+def test_allocate_without_history_uses_prior_yield():
+    planner = make_planner(prior_yield=0.4, min_num=5, max_num=50)
+    assert planner.expected_yield("alpha") == 0.4
+    assert planner.allocate("alpha", 10) == math.ceil(10 / 0.4)
+    assert planner.allocate("alpha", 1) == 5
+    assert planner.allocate("alpha", 100) == 50
+
+def test_record_reorders_keywords_by_observed_yield():
+    planner = make_planner(prior_yield=0.5, prior_weight=10)
+    assert planner.order() == KEYWORDS
+
+    planner.record("alpha", requested=20, returned=20, unique=1)
+    planner.record("delta", requested=20, returned=20, unique=20)
+    assert planner.order() == ["delta", "beta", "gamma", "epsilon", "alpha"]
+    assert planner.expected_yield("delta") == (20 + 0.5 * 10) / (20 + 10)
+    # A low yield asks for more results to fill the same gap
+    assert planner.allocate("alpha", 10) > planner.allocate("delta", 10)
+
+def test_stats_persist(tmp_path):
+    path = str(tmp_path / "stats.json")
+    planner = make_planner(stats_path=path)
+    planner.record("gamma", requested=10, returned=10, unique=10)
+    planner.save()
+    assert make_planner(stats_path=path).order()[0] == "gamma"
+
+def test_briefing_stops_once_target_is_collected(make_scraper, fake_client):
+    planner = make_planner(prior_yield=1.0, min_num=1, max_num=4)
+    briefing = AINewsBriefing(scraper=make_scraper(fake_client), request_delay=0, progress=False, planner=planner)
+    result = briefing.get_latest_ai_news(num=10)
+
+    # Each keyword asks for at most 4 results, all new, so three searches fill 10
+    assert fake_client.calls == 3
+    assert len(result["latest_news"]) >= 10
+    assert result["summary"]["stopped"] == "target"
+    assert [row["keyword"] for row in planner.report() if row["calls"]] == ["alpha", "beta", "gamma"]
+    assert planner.stats["alpha"] == {"calls": 1, "requested": 4, "returned": 4, "unique": 4}
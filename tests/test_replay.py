@@ -0,0 +1,89 @@
+"""Tests for recording and replaying SERP responses"""
+import time
+
+import pytest
+
+from fake_client import FakeThordataClient
+from src.cache import clear_cache
+from src.cancellation import CancelToken, OperationCancelled
+from src.replay import RecordingClient, ReplayClient, ReplayMissError
+
+class Request:
+    engine = "google_news"
+    device = None
+
+    def __init__(self, query, num=3, country="us", language="en"):
+        self.query = query
+        self.num = num
+        self.country = country
+        self.language = language
+
+@pytest.fixture
+def recordings(tmp_path):
+    """Directory with recordings of "ai" and "ml" (3 results each)"""
+    directory = str(tmp_path / "recordings")
+    recorder = RecordingClient(FakeThordataClient(), directory)
+    recorder.serp_search_advanced(Request("ai"))
+    recorder.serp_search_advanced(Request("ml"))
+    return directory
+
+def test_scraper_round_trip(make_scraper, tmp_path):
+    directory = str(tmp_path / "recordings")
+    live = FakeThordataClient()
+    recorded = make_scraper(live, record_dir=directory).search("bitcoin", num=4)
+    clear_cache()
+
+    replay = make_scraper(replay_dir=directory, replay_latency_scale=0)
+    replayed = replay.search("bitcoin", num=4)
+    assert replayed == recorded
+    assert replayed.metadata["source"] == "api"
+    assert isinstance(replay.client, ReplayClient)
+    assert live.calls == 1
+
+def test_strict_replay_raises_on_unrecorded_request(recordings):
+    client = ReplayClient(recordings, latency_scale=0)
+    assert len(client.serp_search_advanced(Request("ai"))["news_results"]) == 3
+    with pytest.raises(ReplayMissError):
+        client.serp_search_advanced(Request("ai", country="uk"))
+
+def test_strict_miss_fails_search_without_retrying(make_scraper, recordings):
+    scraper = make_scraper(replay_dir=recordings, replay_latency_scale=0)
+    start = time.time()
+    results = scraper.search("unrecorded", num=3)
+    assert time.time() - start < 1
+    assert results.metadata["source"] == "error"
+    assert results.metadata["failure"] == "bad_request"
+
+def test_fallback_client_serves_unrecorded_requests(recordings):
+    live = FakeThordataClient()
+    client = ReplayClient(recordings, latency_scale=0, fallback_client=live)
+    client.serp_search_advanced(Request("ai"))
+    assert live.calls == 0
+    response = client.serp_search_advanced(Request("quantum"))
+    assert live.calls == 1
+    assert response["news_results"][0]["link"].startswith("https://news.example.com/quantum/")
+
+def test_scraper_with_client_and_replay_dir_falls_back_to_client(make_scraper, recordings):
+    live = FakeThordataClient()
+    scraper = make_scraper(live, replay_dir=recordings, replay_latency_scale=0)
+    assert len(scraper.search("ai", num=3)) == 3
+    assert len(scraper.search("quantum", num=2)) == 2
+    assert live.calls == 1
+
+def test_non_strict_replay_substitutes_a_recording(recordings):
+    client = ReplayClient(recordings, latency_scale=0, strict=False, seed=1)
+    response = client.serp_search_advanced(Request("unrecorded"))
+    assert response in [r["response"] for r in client.recordings.values()]
+
+def test_replay_delay_is_cancellable(recordings):
+    client = ReplayClient(recordings, latency_scale=1e6)
+    token = CancelToken(deadline=0.1)
+    start = time.time()
+    with token.bind():
+        with pytest.raises(OperationCancelled):
+            client.serp_search_advanced(Request("ai"))
+    assert time.time() - start < 2
+
+def test_empty_directory_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ReplayClient(str(tmp_path))
@@ -0,0 +1,57 @@
+"""Tests for the local full-text index"""
+from src.archive import ArticleArchive
+from src.search_index import LocalIndex
+
+ITEMS = [
+    {"title": "Chip makers race to build AI accelerators", "snippet": "Semiconductor demand", "source": "Tech Daily",
+     "link": "https://example.com/chips"},
+    {"title": "Central bank holds rates", "snippet": "Inflation and AI productivity", "source": "Finance Wire",
+     "link": "https://example.com/rates"},
+    {"title": "Football final preview", "snippet": "Teams prepare", "source": "Sports Now",
+     "link": "https://example.com/football"},
+]
+
+def test_search_ranks_title_matches_first():
+    index = LocalIndex(":memory:")
+    assert index.add(ITEMS, query="news", country="us", language="en", seen_at=100.0) == 3
+    results = index.search("AI")
+    assert [r["link"] for r in results] == ["https://example.com/chips", "https://example.com/rates"]
+    assert results[0]["first_seen"] == 100.0
+
+def test_search_prefix_and_filters():
+    index = LocalIndex(":memory:")
+    index.add(ITEMS[:2], country="us", seen_at=100.0)
+    index.add(ITEMS[2:], country="uk", seen_at=200.0)
+    assert [r["link"] for r in index.search("foot*")] == ["https://example.com/football"]
+    assert index.search("AI", source="finance")[0]["link"] == "https://example.com/rates"
+    assert index.search("football", country="us") == []
+    assert index.search("football", since=150.0)[0]["source"] == "Sports Now"
+    assert index.search("football", until=150.0) == []
+    assert index.search("!!!") == []
+
+def test_readding_updates_instead_of_duplicating():
+    index = LocalIndex(":memory:")
+    index.add(ITEMS[:1], seen_at=100.0)
+    updated = dict(ITEMS[0], title="Chip makers race to build AI accelerators (update)",
+                   link="https://example.com/chips?utm_campaign=feed")
+    index.add([updated], seen_at=300.0)
+    results = index.search("chip")
+    assert len(results) == 1
+    assert results[0]["title"].endswith("(update)")
+    assert (results[0]["first_seen"], results[0]["last_seen"]) == (100.0, 300.0)
+    assert index.stats()["articles"] == 1
+
+def test_add_archive(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "archive"))
+    archive.append(ITEMS, query="news", country="us", language="en", seen_at=100.0)
+    archive.compact()
+    index = LocalIndex(str(tmp_path / "index.db"))
+    assert index.add_archive(archive) == 3
+    assert index.search("rates", country="us")[0]["link"] == "https://example.com/rates"
+    index.close()
+
+def test_scraper_indexes_fetched_items(make_scraper, fake_client):
+    index = LocalIndex(":memory:")
+    scraper = make_scraper(fake_client, index=index)
+    scraper.search("quantum computing", num=4)
+    assert len(index.search("quantum")) == 4
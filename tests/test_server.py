@@ -0,0 +1,106 @@
+"""Tests for the HTTP service request handling"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.server import COALESCED, MAX_BODY, NewsServer
+from src.utils import SearchResult
+
+class FakeScraper:
+    """Scraper stand-in whose searches take a little while, counting calls"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = []
+        self.ledger = None
+        self.rate_limiter = None
+        self._lock = threading.Lock()
+
+    def search(self, **params):
+        with self._lock:
+            self.calls.append(params)
+        time.sleep(self.delay)
+        return SearchResult([{"title": f"{params['query']} story", "link": "https://example.com/1"}])
+
+@pytest.fixture
+def server():
+    server = NewsServer(scraper=FakeScraper(), max_workers=4)
+    yield server
+    server.executor.shutdown(wait=False)
+
+def process(server, method, target, headers=None, body=b""):
+    """Run _process on a request whose body is already buffered"""
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(body)
+        reader.feed_eof()
+        return await server._process(method, target, headers or {}, reader)
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("length", ["abc", "-1", "1.5"])
+def test_invalid_content_length_is_rejected(server, length):
+    status, body, _ = process(server, "POST", "/search", {"content-length": length}, b'{"query": "ai"}')
+    assert status == 400
+    assert body == {"error": "Invalid Content-Length"}
+    assert server.scraper.calls == []
+
+def test_oversized_body_is_rejected_unread(server):
+    status, body, _ = process(server, "POST", "/search", {"content-length": str(MAX_BODY + 1)})
+    assert status == 413
+    assert server.scraper.calls == []
+
+def test_body_must_be_a_json_object(server):
+    payload = b'["ai"]'
+    status, body, _ = process(server, "POST", "/search", {"content-length": str(len(payload))}, payload)
+    assert (status, body) == (400, {"error": "Body must be a JSON object"})
+
+def test_batch_requires_post(server):
+    status, body, _ = process(server, "GET", "/search/batch?query=ai")
+    assert status == 405
+    assert server.scraper.calls == []
+
+def test_search_from_query_string_and_json_body(server):
+    status, body, content_type = process(server, "GET", "/search?query=ai&num=500&no_cache=true")
+    assert status == 200 and content_type == "application/json"
+    assert body["count"] == 1
+    assert server.scraper.calls[-1] == {"query": "ai", "num": 100, "country": "us", "language": None,
+                                        "device": None, "no_cache": True, "max_age": None}
+
+    payload = json.dumps({"requests": [{"query": "ai"}, {"query": "ml", "country": "uk"}]}).encode()
+    status, body, _ = process(server, "POST", "/search/batch", {"content-length": str(len(payload))}, payload)
+    assert status == 200
+    assert [(r["query"], r["country"], r["count"]) for r in body["results"]] == [("ai", "us", 1), ("ml", "uk", 1)]
+
+def test_unknown_path_and_missing_query(server):
+    assert process(server, "GET", "/nope")[0] == 404
+    assert process(server, "GET", "/search")[:2] == (400, {"error": "query is required"})
+    assert process(server, "GET", "/search?query=ai&num=many")[0] == 400
+
+def test_identical_inflight_searches_are_coalesced(server):
+    before = COALESCED.total()
+
+    async def run():
+        params = server._search_params({"query": "ai"})
+        return await asyncio.gather(server.search(params), server.search(dict(params)))
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert len(server.scraper.calls) == 1
+    assert COALESCED.total() - before == 1
+    assert server._inflight == {}
+
+def test_different_searches_are_not_coalesced(server):
+    before = COALESCED.total()
+
+    async def run():
+        return await asyncio.gather(
+            server.route("GET", "/search", {"query": "ai"}),
+            server.route("GET", "/search", {"query": "ai", "country": "uk"})
+        )
+
+    asyncio.run(run())
+    assert len(server.scraper.calls) == 2
+    assert COALESCED.total() == before
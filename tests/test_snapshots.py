@@ -0,0 +1,66 @@
+"""Tests for per-query snapshot histories and diffs"""
+from src.snapshots import SnapshotStore, diff_ids, item_id
+
+REQUEST = {"query": "AI", "country": "us", "language": "en"}
+
+def item(n):
+    return {"title": f"Story {n}", "source": f"Source {n}", "link": f"https://example.com/{n}"}
+
+def test_diff_ids():
+    changes = diff_ids(["a", "b", "c"], ["b", "a", "c", "d"])
+    assert changes == {
+        "added": [("d", 4)],
+        "removed": [],
+        "moved": [("b", 2, 1), ("a", 1, 2)],
+        "unchanged": 1
+    }
+    assert diff_ids(["a", "b"], ["b"]) == {"added": [], "removed": [("a", 1)], "moved": [("b", 2, 1)], "unchanged": 0}
+
+def test_item_id_ignores_tracking_parameters():
+    assert item_id({"link": "https://example.com/1?utm_source=feed"}) == item_id(item(1))
+    assert item_id({"title": "no link"}) is None
+
+def test_record_reports_changes_with_details(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    first = store.record(REQUEST, [item(1), item(2), item(3)], taken_at=100.0)
+    assert first["first_snapshot"]
+    assert [a["rank"] for a in first["added"]] == [1, 2, 3]
+
+    diff = store.record(REQUEST, [item(2), item(1), item(4)], taken_at=200.0)
+    assert not diff["first_snapshot"]
+    assert diff["previous_at"] == 100.0 and diff["current_at"] == 200.0
+    assert [(a["title"], a["rank"]) for a in diff["added"]] == [("Story 4", 3)]
+    assert [(r["title"], r["rank"]) for r in diff["removed"]] == [("Story 3", 3)]
+    assert [(m["title"], m["previous_rank"], m["rank"]) for m in diff["moved"]] == [("Story 2", 2, 1), ("Story 1", 1, 2)]
+    assert diff["unchanged"] == 0
+    assert store.diff_latest(REQUEST) == diff
+
+def test_only_new_ids_store_details(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    store.record(REQUEST, [item(1), item(2)], taken_at=100.0)
+    store.record(REQUEST, [item(1), item(2), item(3)], taken_at=200.0)
+    history = store.history(REQUEST)
+    assert len(history[0]["details"]) == 2
+    assert list(history[1]["details"]) == [item_id(item(3))]
+
+def test_request_key_normalizes_query(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    store.record(REQUEST, [item(1)], taken_at=100.0)
+    assert len(store.history(dict(REQUEST, query="  ai "))) == 1
+
+def test_trimmed_history_keeps_details_of_kept_ids(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"), keep=2)
+    store.record(REQUEST, [item(1)], taken_at=100.0)
+    store.record(REQUEST, [item(1), item(2)], taken_at=200.0)
+    store.record(REQUEST, [item(2), item(3)], taken_at=300.0)
+    history = store.history(REQUEST)
+    assert [s["taken_at"] for s in history] == [200.0, 300.0]
+    assert set(history[0]["details"]) == {item_id(item(1)), item_id(item(2))}
+    diff = store.diff_latest(REQUEST)
+    assert [r["title"] for r in diff["removed"]] == ["Story 1"]
+
+def test_diff_latest_needs_two_snapshots(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    assert store.diff_latest(REQUEST) is None
+    store.record(REQUEST, [item(1)])
+    assert store.diff_latest(REQUEST) is None
@@ -0,0 +1,34 @@
+"""Tests for story clustering"""
+from src.stories import cluster_stories
+
+ITEMS = [
+    {"title": "Apple unveils new iPhone with satellite messaging", "snippet": "The new iPhone adds satellite messaging",
+     "source": "Tech Daily", "link": "https://a.example.com/iphone"},
+    {"title": "New iPhone unveiled by Apple adds satellite messaging", "snippet": "Apple iPhone satellite messaging",
+     "source": "Gadget News", "link": "https://b.example.com/apple-iphone"},
+    {"title": "Storm floods coastal towns", "snippet": "Heavy rain floods coastal towns overnight",
+     "source": "Weather Wire", "link": "https://c.example.com/storm"},
+    {"title": "Different headline, same article", "snippet": "Syndicated copy",
+     "source": "Aggregator", "link": "https://c.example.com/storm?utm_source=rss"},
+]
+
+def test_similar_items_form_one_story():
+    stories = cluster_stories(ITEMS[:3], threshold=0.3)
+    assert [s["size"] for s in stories] == [2, 1]
+    assert stories[0]["sources"] == ["Gadget News", "Tech Daily"]
+    assert stories[0]["source_count"] == 2
+    assert stories[0]["headline"] in {ITEMS[0]["title"], ITEMS[1]["title"]}
+
+def test_same_link_joins_story_regardless_of_text():
+    stories = cluster_stories(ITEMS[2:], threshold=0.99)
+    assert len(stories) == 1
+    assert stories[0]["sources"] == ["Aggregator", "Weather Wire"]
+
+def test_min_size_and_empty_input():
+    assert cluster_stories([]) == []
+    stories = cluster_stories(ITEMS[:3], threshold=0.3, min_size=2)
+    assert len(stories) == 1 and stories[0]["size"] == 2
+
+def test_every_item_is_in_exactly_one_story():
+    stories = cluster_stories(ITEMS, threshold=0.3)
+    assert sorted(i["link"] for s in stories for i in s["items"]) == sorted(i["link"] for i in ITEMS)
@@ -0,0 +1,59 @@
+"""Tests for thumbnail externalization"""
+import base64
+import hashlib
+import os
+import re
+
+import pytest
+
+from src.thumbnails import ThumbnailStore, parse_data_uri, process_thumbnails
+
+PNG = b"\x89PNG\r\n\x1a\nfake image bytes"
+OTHER = b"\xff\xd8\xffother image bytes"
+
+def data_uri(data, subtype="png"):
+    return f"data:image/{subtype};base64," + base64.b64encode(data).decode("ascii")
+
+def test_parse_data_uri():
+    assert parse_data_uri(data_uri(PNG)) == ("png", PNG)
+    assert parse_data_uri(data_uri(OTHER, "jpeg")) == ("jpg", OTHER)
+    assert parse_data_uri("https://example.com/a.png") is None
+    assert parse_data_uri(None) is None
+
+def test_store_deduplicates_identical_images(tmp_path):
+    store = ThumbnailStore(str(tmp_path / "thumbnails"))
+    items = [{"thumbnail": data_uri(PNG)}, {"thumbnail": data_uri(PNG)}, {"thumbnail": data_uri(OTHER, "jpeg")}]
+    process_thumbnails(items, mode="store", store=store)
+
+    assert items[0]["thumbnail"] == items[1]["thumbnail"]
+    assert items[0]["thumbnail"] != items[2]["thumbnail"]
+    blobs = [os.path.join(d, f) for d, _, files in os.walk(store.root) for f in files]
+    assert len(blobs) == 2
+    with open(store.path_for(items[0]["thumbnail"]), "rb") as f:
+        assert f.read() == PNG
+
+def test_store_reference_format(tmp_path):
+    store = ThumbnailStore(str(tmp_path / "thumbnails"))
+    items = process_thumbnails([{"thumbnail": data_uri(PNG)}], mode="store", store=store)
+    digest = hashlib.sha256(PNG).hexdigest()
+    assert items[0]["thumbnail"] == f"thumbnails/{digest[:2]}/{digest}.png"
+    assert re.fullmatch(r"thumbnails/[0-9a-f]{2}/[0-9a-f]{64}\.png", items[0]["thumbnail"])
+    assert store.path_for(items[0]["thumbnail"]) == os.path.join(store.root, digest[:2], f"{digest}.png")
+
+def test_store_keeps_non_inline_thumbnails(tmp_path):
+    store = ThumbnailStore(str(tmp_path / "thumbnails"))
+    items = [{"thumbnail": "https://example.com/a.png"}, {"thumbnail": None}, {"title": "no thumbnail"}]
+    process_thumbnails(items, mode="store", store=store)
+    assert items == [{"thumbnail": "https://example.com/a.png"}, {"thumbnail": None}, {"title": "no thumbnail"}]
+    assert not os.path.exists(store.root)
+
+def test_drop_mode():
+    items = [{"thumbnail": data_uri(PNG)}, {"thumbnail": "https://example.com/a.png"}, {"title": "no thumbnail"}]
+    process_thumbnails(items, mode="drop")
+    assert items == [{"thumbnail": None}, {"thumbnail": None}, {"title": "no thumbnail"}]
+
+def test_inline_mode_and_unknown_mode():
+    items = [{"thumbnail": data_uri(PNG)}]
+    assert process_thumbnails(items, mode="inline") == [{"thumbnail": data_uri(PNG)}]
+    with pytest.raises(ValueError):
+        process_thumbnails(items, mode="resize")
@@ -0,0 +1,79 @@
+"""Tests for multi-token dispatch, quarantine and failover"""
+import pytest
+
+from fake_client import FakeThordataClient
+from src.client_pool import ClientPool
+from src.token_pool import NoTokenAvailable, TokenPool, parse_tokens
+
+class Request:
+    query = "ai"
+    num = 3
+
+class RejectingClient:
+    """Client whose token is always refused with the given HTTP status"""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.calls = 0
+
+    def serp_search_advanced(self, req):
+        self.calls += 1
+        error = RuntimeError(f"HTTP {self.status_code}")
+        error.status_code = self.status_code
+        raise error
+
+def make_pool(clients, **kwargs):
+    pool = ClientPool(client_factory=lambda token: clients[token])
+    return TokenPool(list(clients), pool=pool, **kwargs)
+
+def test_parse_tokens():
+    assert parse_tokens("aaaa, bbbb:2 ,") == [{"token": "aaaa", "weight": 1.0}, {"token": "bbbb", "weight": 2.0}]
+    with pytest.raises(ValueError):
+        parse_tokens("aaaa:heavy")
+
+def test_auth_failure_quarantines_token_and_fails_over():
+    clients = {"bad-token": RejectingClient(401), "good-token": FakeThordataClient()}
+    pool = make_pool(clients)
+
+    for _ in range(3):
+        response = pool.serp_search_advanced(Request())
+        assert len(response["news_results"]) == 3
+
+    assert clients["bad-token"].calls == 1
+    assert clients["good-token"].calls == 3
+    stats = {s["token"]: s for s in pool.stats()}
+    assert stats["bad-..."]["quarantine_reason"] == "auth"
+    assert stats["bad-..."]["quarantined_for"] > 0
+    assert stats["good..."]["quarantine_reason"] is None
+
+def test_all_tokens_quarantined():
+    clients = {"aaaa": RejectingClient(402), "bbbb": RejectingClient(402)}
+    pool = make_pool(clients)
+    with pytest.raises(RuntimeError):
+        pool.serp_search_advanced(Request())
+    with pytest.raises(NoTokenAvailable) as excinfo:
+        pool.serp_search_advanced(Request())
+    assert excinfo.value.failure_class == "quota"
+
+    pool.release_quarantine("aaaa")
+    assert [s["quarantine_reason"] for s in pool.stats()] == [None, "quota"]
+
+def test_non_quarantine_failures_are_raised_without_failover():
+    clients = {"aaaa": RejectingClient(500), "bbbb": FakeThordataClient()}
+    pool = make_pool(clients)
+    with pytest.raises(RuntimeError):
+        pool.serp_search_advanced(Request())
+    assert clients["bbbb"].calls == 0
+    assert all(s["quarantine_reason"] is None for s in pool.stats())
+
+def test_least_loaded_spreads_calls():
+    clients = {"aaaa": FakeThordataClient(), "bbbb": FakeThordataClient()}
+    pool = make_pool(clients)
+    for _ in range(4):
+        pool.serp_search_advanced(Request())
+    assert clients["aaaa"].calls + clients["bbbb"].calls == 4
+    assert all(s["in_flight"] == 0 for s in pool.stats())
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        TokenPool(["aaaa"], pool=ClientPool(client_factory=lambda token: None), strategy="random")
@@ -0,0 +1,40 @@
+"""Tests for query spec loading"""
+import pytest
+
+from src.utils import load_query_specs
+
+def test_tab_separated_and_json_lines():
+    specs = load_query_specs([
+        "# comment\n",
+        "AI\tuk\ten\t20\n",
+        "\n",
+        "   \n",
+        '{"query": "Tesla", "country": "us", "limit": "5"}\r\n',
+        "just a query\n",
+    ])
+    assert specs == [
+        {"query": "AI", "country": "uk", "language": "en", "limit": 20},
+        {"query": "Tesla", "country": "us", "language": None, "limit": 5},
+        {"query": "just a query", "country": None, "language": None, "limit": None},
+    ]
+
+def test_trailing_empty_fields_are_kept_positional():
+    specs = load_query_specs(["AI\t\tde\t\n", "Bitcoin\tus\t\t10\n"])
+    assert specs == [
+        {"query": "AI", "country": None, "language": "de", "limit": None},
+        {"query": "Bitcoin", "country": "us", "language": None, "limit": 10},
+    ]
+
+def test_load_from_file(tmp_path):
+    path = tmp_path / "queries.txt"
+    path.write_text("AI\tus\nML\n", encoding="utf-8")
+    assert [s["query"] for s in load_query_specs(str(path))] == ["AI", "ML"]
+
+@pytest.mark.parametrize("line, message", [
+    ("\tus\n", "query is required"),
+    ('{"query": "AI"\n', "invalid JSON"),
+    ("AI\tus\ten\tmany\n", "limit must be an integer"),
+])
+def test_malformed_lines(line, message):
+    with pytest.raises(ValueError, match=message):
+        load_query_specs(["ok\n", line])